@@ -1,28 +1,62 @@
 # Flask Server - Serves as the backend for the application
 
-from flask import Flask, send_from_directory, request, jsonify, session, abort
+from flask import Flask, Response, stream_with_context, send_from_directory, request, jsonify, session, abort, g
 from flask_cors import CORS
 from datetime import datetime
-from pdfminer.high_level import extract_text
 import os
-import re
+import io
+import csv
+import json
+import hmac
+import mimetypes
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager
 from backend.db.db_config import SessionLocal, engine, Base
+from backend.db import query_stats
 from backend.db.models import (
-    Job_Query,
     Scrape_Session,
     Job,
+    Posting,
     ScrapeStatus,
     JobStatus,
     User,
+    Filter_Rule,
+    FilterRuleType,
+    Saved_Search,
 )
-from backend.services.scrape import run_scraper
+from backend.services.dedup import user_indexes
+from backend.services.filters import filter_cache
+from backend.services.scheduler import normalize_query_key, first_run_at, MIN_INTERVAL_MINUTES
 from backend.services.utils import sanitize_filename
+from backend.services.salary import parse_salary, annualize
+from backend.services import analytics
+from backend.services import search as job_search
+from backend.services import assets
+from backend.services.source_guard import source_health
+from backend.services.driver_watchdog import watchdog
+from backend.services import driver_mode
+from backend.services.scoring import resume_parse
+from backend.services.scrape import SCRAPE_DEADLINE_GRACE
+from backend.services.pipeline import (
+    stream_scrape_for_user,
+    create_job_query,
+    create_scrape_session,
+    extract_scrape_params,
+    fail_scrape_session,
+)
 from werkzeug.security import generate_password_hash, check_password_hash
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 ALLOWED_EXTENSIONS = {"pdf", "docx"}
 MAX_FILE_SIZE_MB = 5
+SCRAPE_QUEUE = os.getenv("SCRAPE_QUEUE", "0") == "1" # queue scrapes for standalone workers
+# An in-request scrape must answer before gunicorn kills the worker (entrypoint.sh --timeout):
+# its deadline leaves the abandon grace plus REQUEST_SCRAPE_MARGIN for the last insert and the
+# response. Queued scrapes (scrape_worker, scheduler) keep the longer SCRAPE_DEADLINE.
+GUNICORN_TIMEOUT = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+REQUEST_SCRAPE_MARGIN = 10
+REQUEST_SCRAPE_DEADLINE = max(10, GUNICORN_TIMEOUT - SCRAPE_DEADLINE_GRACE - REQUEST_SCRAPE_MARGIN)
+EXPORT_CHUNK_ROWS = 1000 # rows fetched from the server-side cursor per chunk of the export
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") # lets a monitor read /metrics with "Authorization: Bearer <token>"
 
 app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY", "dev-secret")
@@ -34,18 +68,69 @@ app.config.update(
 )
 CORS(app, supports_credentials=True)
 
+# Per-request SQL accounting (backend/db/query_stats.py)
+@app.before_request
+def start_query_stats():
+    g.query_stats_token = query_stats.begin()
+
+@app.after_request
+def report_query_stats(response):
+    token = g.pop("query_stats_token", None)
+    if token is not None:
+        stats = query_stats.finish(token, request.endpoint or "unmatched")
+        if stats is not None:
+            response.headers["Server-Timing"] = (
+                f'db;dur={stats.seconds * 1e3:.1f};desc="{stats.queries} queries, {stats.rows} rows"'
+            )
+    return response
+
+@app.teardown_request
+def finish_query_stats(exc):
+    # after_request is skipped when the view raised
+    token = g.pop("query_stats_token", None)
+    if token is not None:
+        query_stats.finish(token, request.endpoint or "unmatched")
+
 # Dynamically resolve the frontend folder path
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FRONTEND_DIR = os.path.join(BASE_DIR, "frontend")
 
+# Fingerprinted build from backend/services/assets.py: served path -> precompressed encodings.
+# Development serves the (bind-mounted) sources, so an old build can't shadow edits.
+BUILT_ASSETS = {} if os.getenv("FLASK_ENV") == "development" else assets.load_manifest()
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+def send_precompressed(directory, path, encodings):
+    # Send the .br/.gz copy the build wrote, if the client accepts one
+    for encoding in encodings:
+        if request.accept_encodings[encoding]:
+            suffix = ".br" if encoding == "br" else ".gz"
+            response = send_from_directory(directory, path + suffix, mimetype=mimetypes.guess_type(path)[0])
+            response.headers["Content-Encoding"] = encoding
+            break
+    else:
+        response = send_from_directory(directory, path)
+    response.vary.add("Accept-Encoding")
+    return response
+
 # Serve index.html
 @app.route("/")
 def serve_index():
-    return send_from_directory(FRONTEND_DIR, "index.html")
+    # The shell always revalidates (ETag); what it references is fingerprinted
+    if BUILT_ASSETS:
+        response = send_precompressed(assets.DIST_DIR, "index.html", BUILT_ASSETS["index.html"])
+    else:
+        response = send_from_directory(FRONTEND_DIR, "index.html")
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 # Serve static assets (JS, CSS, etc.)
 @app.route("/<path:path>")
 def serve_static_files(path):
+    if path != "index.html" and path in BUILT_ASSETS:
+        response = send_precompressed(assets.DIST_DIR, path, BUILT_ASSETS[path])
+        response.headers["Cache-Control"] = IMMUTABLE
+        return response
     if not path.endswith((".js", ".css", ".html", ".png", ".jpg", ".ico")):
         abort(404)
     return send_from_directory(FRONTEND_DIR, path)
@@ -54,130 +139,70 @@ def serve_static_files(path):
 @app.route("/add_job_request", methods=["POST"])
 def add_job_request():
     db = SessionLocal() # create a new session
+    session_entry = None
     try: 
         job_data = request.get_json() # get the job data from the request
         user_email = session.get("user") # get the logged-in user's email
         if not user_email:
             return jsonify({"error": "User not logged in"}), 401
 
-        # get and parse user's resume
-        parsed_resume = get_user_parsed_resume(db, user_email)
-        scrape_params = extract_scrape_params(job_data)
-        scraped_jobs = run_scraper(**scrape_params)
+        if SCRAPE_QUEUE:
+            # Hand the scrape to a worker (backend/services/scrape_worker.py); the client polls /scrape_status
+            query = create_job_query(db, job_data)
+            db.flush()
+            session_entry = create_scrape_session(
+                db, query.query_id, query.job_title, user_email, status=ScrapeStatus.Pending
+            )
+            db.commit()
+            return jsonify({"status": "queued", "scrapeSessionId": session_entry.scrape_session_id}), 202
 
         query = create_job_query(db, job_data)
         db.flush()  # ensure query_id exists before use
+        session_entry = create_scrape_session(db, query.query_id, query.job_title, user_email)
+        db.commit()  # visible (with its running counters) while the scrape streams in
 
-        session_entry = create_scrape_session(
-            db, query.query_id, job_data.get("jobTitle"), user_email
-        )
-        db.flush()
-
-        insert_scraped_jobs(
-            db, scraped_jobs, session_entry.scrape_session_id, user_email, parsed_resume
+        stream_scrape_for_user(
+            db, query, user_email, extract_scrape_params(job_data), session_entry,
+            deadline=REQUEST_SCRAPE_DEADLINE,
         )
 
-        finalize_scrape_session(
-            db, session_entry, ScrapeStatus.Complete, len(scraped_jobs)
-        )
-
-        db.commit()  # commit
-
         jobs_saved = get_new_jobs(db, user_email) # get newly saved jobs
         return jsonify({"status": "success", "jobs": jobs_saved}), 200
 
     except Exception as e:
         db.rollback()
+        user_indexes.invalidate(session.get("user")) # drop index entries for rolled-back inserts
+        if session_entry is not None:
+            fail_scrape_session(db, session_entry, e)
         print("Error in add_job_request:", e)
         return jsonify({"status": "error", "message": str(e)}), 500
     finally:
         db.close()
 
-def get_user_parsed_resume(db, email):
-    # Retrieve and parse the user's resume file.
-    user = db.query(User).filter_by(email=email).first()
+@app.route("/scrape_status", methods=["GET"])
+def scrape_status():
+    user_email = session.get("user")
+    if not user_email:
+        return jsonify({"error": "User not logged in"}), 401
 
-    if not user or not user.resume_path: 
-        return None
-    
+    db = SessionLocal()
     try:
-        return resume_parse(user.resume_path, user.resume_name)
-    except Exception as e:
-        print(f"Error parsing resume for {email}: {e}")
-        return None
-
-def create_job_query(db, data):
-    # Create and store a Job_Query entry.
-    query = Job_Query(
-        date_posted=data.get("datePosted"),
-        experience_level=data.get("experienceLevel"),
-        job_title=data.get("jobTitle"),
-        location=data.get("location"),
-    )
-    db.add(query)
-    return query
-
-def create_scrape_session(db, query_id, keywords, email):
-    # Start a new scrape session entry.
-    session_entry = Scrape_Session(
-        query_id=query_id,
-        keywords=keywords,
-        timestamp=datetime.now(),
-        status=ScrapeStatus.Running,
-        log="Scrape started.",
-        user_email=email,
-    )
-    db.add(session_entry) 
-    return session_entry
-
-def extract_scrape_params(data):
-    # Extract scraper parameters from request data.
-    return {
-        "date_posted": data.get("datePosted"),
-        "experience_level": data.get("experienceLevel"),
-        "job_title": data.get("jobTitle"),
-        "location": data.get("location"),
-    }
-
-def insert_scraped_jobs(db, scraped_jobs, session_id, user_email, parsed_resume):
-    # Insert all scraped jobs into the database with calculated job scores.
-    
-    has_resume = parsed_resume is not None
-    
-    for job in scraped_jobs:
-        # Skip duplicates
-        existing = (
-            db.query(Job)
-            .filter_by(URL=job["URL"], user_email=user_email)
+        entry = (
+            db.query(Scrape_Session)
+            .filter_by(scrape_session_id=request.args.get("id", type=int), user_email=user_email)
             .first()
         )
-        if existing:
-            continue
-
-        # Compute resume-based score
-        if has_resume:
-            job_score = calculate_job_score(parsed_resume, job)
-        else:
-            job_score = None
-
-        new_job = Job(
-            JobTitle=job["JobTitle"],
-            Company=job["Company"],
-            Location=job["Location"],
-            Salary=job["Salary"],
-            URL=job["URL"],
-            Status=JobStatus.New,
-            DateFound=datetime.now().date(),
-            scrape_session_id=session_id,
-            user_email=user_email,
-            job_score=job_score,
-        )
-        db.add(new_job)
-
-def finalize_scrape_session(db, session_entry, status, total):
-    # Finalize the scrape session with status and job count.
-    session_entry.status = status
-    session_entry.log = f"Scrape completed. Found {total} job listings."
+        if not entry:
+            return jsonify({"error": "Scrape session not found"}), 404
+        return jsonify({
+            "status": entry.status.value,
+            "log": entry.log,
+            "jobsFound": entry.jobs_found,
+            "jobsInserted": entry.jobs_inserted,
+            "jobsDuplicates": entry.jobs_duplicates,
+        }), 200
+    finally:
+        db.close()
 
 # Get New Jobs for API response
 def get_new_jobs(db, user_email):
@@ -188,19 +213,23 @@ def get_new_jobs(db, user_email):
         .order_by(Job.DateFound.desc())
         .all()
     )
-    return [
-        {
-            "JobTitle": job.JobTitle,
-            "Company": job.Company,
-            "Location": job.Location,
-            "Salary": job.Salary,
-            "URL": job.URL,
-            "Status": job.Status,
-            "DateFound": str(job.DateFound),
-            "JobScore": job.job_score if job.job_score is not None else "N/A",
-        }
-        for job in jobs
-    ]
+    return [serialize_job(job) for job in jobs]
+
+def serialize_job(job):
+    # Job row (with its shared posting) -> API dict
+    posting = job.posting
+    return {
+        "JobTitle": posting.JobTitle,
+        "Company": posting.Company,
+        "Location": posting.Location,
+        "Salary": posting.Salary,
+        "SalaryMin": posting.salary_min,
+        "SalaryMax": posting.salary_max,
+        "URL": posting.URL,
+        "Status": job.Status,
+        "DateFound": str(job.DateFound),
+        "JobScore": job.job_score if job.job_score is not None else "N/A",
+    }
 
 # Require Login
 def require_login():
@@ -219,12 +248,14 @@ def remove_jobs():
         for job_url in jobs_to_remove:
             job = (
                 db.query(Job)
-                .filter(Job.URL == job_url, Job.user_email == session["user"])
+                .join(Job.posting)
+                .options(contains_eager(Job.posting))
+                .filter(Posting.URL == job_url, Job.user_email == session["user"])
                 .first()
             )
             if job:
                 job.Status = JobStatus.Ignored
-                print(f"Marked job as Ignored: {job.JobTitle} at {job.Company}")
+                print(f"Marked job as Ignored: {job.posting.JobTitle} at {job.posting.Company}")
         db.commit()
         return jsonify({"status": "success"}), 200
     except Exception as e:
@@ -245,12 +276,14 @@ def apply_jobs():
         for job_url in jobs_to_apply:
             job = (
                 db.query(Job)
-                .filter(Job.URL == job_url, Job.user_email == session["user"])
+                .join(Job.posting)
+                .options(contains_eager(Job.posting))
+                .filter(Posting.URL == job_url, Job.user_email == session["user"])
                 .first()
             )
             if job:
                 job.Status = JobStatus.Applied
-                print(f"Marked job as Applied: {job.JobTitle} at {job.Company}")
+                print(f"Marked job as Applied: {job.posting.JobTitle} at {job.posting.Company}")
         db.commit()
         return jsonify({"status": "success"}), 200
     except Exception as e:
@@ -268,21 +301,26 @@ def refresh_jobs():
     try:
         user_email = session.get("user")
         db = SessionLocal()
-        jobs_in_db = db.query(Job).filter(Job.user_email == user_email).all()
-        jobs_list = []
-        for job in jobs_in_db:
-            jobs_list.append(
-                {
-                    "JobTitle": job.JobTitle,
-                    "Company": job.Company,
-                    "Location": job.Location,
-                    "Salary": job.Salary,
-                    "URL": job.URL,
-                    "Status": job.Status,
-                    "DateFound": str(job.DateFound),
-                    "JobScore": job.job_score if job.job_score is not None else "N/A",
-                }
-            )
+        query = (
+            db.query(Job)
+            .join(Job.posting)
+            .options(contains_eager(Job.posting))
+            .filter(Job.user_email == user_email)
+        )
+
+        # Optional salary filter/sort on the precomputed yearly figures
+        min_salary = request.args.get("minSalary", type=float)
+        if min_salary:
+            query = query.filter(Posting.salary_max >= min_salary)
+        sort = request.args.get("sort")
+        if sort == "salary":
+            column = Posting.salary_max
+            if request.args.get("order", "desc") == "asc":
+                query = query.order_by(column.is_(None), column.asc())
+            else:
+                query = query.order_by(column.is_(None), column.desc())
+
+        jobs_list = [serialize_job(job) for job in query.all()]
         return jsonify({"status": "success", "jobs": jobs_list}), 200
     except Exception as e:
         print("Error in refresh_jobs:", e)
@@ -290,6 +328,335 @@ def refresh_jobs():
     finally:
         db.close()
 
+# Keyword search API route
+@app.route("/search_jobs", methods=["GET"])
+def search_jobs():
+    if (resp := require_login()):
+        return resp
+    try:
+        status = request.args.get("status") or None
+        if status is not None:
+            status = JobStatus(status)
+    except ValueError:
+        return jsonify({"status": "error", "message": "Unknown status"}), 400
+
+    db = SessionLocal()
+    try:
+        jobs, has_more = job_search.search_jobs(
+            db,
+            session["user"],
+            request.args.get("q", ""),
+            status=status,
+            min_score=request.args.get("minScore", type=float),
+            limit=request.args.get("limit", 50, type=int),
+            offset=request.args.get("offset", 0, type=int),
+        )
+        return jsonify({"status": "success", "jobs": [serialize_job(job) for job in jobs], "hasMore": has_more}), 200
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        print("Error in search_jobs:", e)
+        return jsonify({"status": "error", "message": "Internal server error"}), 500
+    finally:
+        db.close()
+
+# Export columns: header -> selected column
+EXPORT_COLUMNS = {
+    "JobTitle": Posting.JobTitle,
+    "Company": Posting.Company,
+    "Location": Posting.Location,
+    "Salary": Posting.Salary,
+    "SalaryMin": Posting.salary_min,
+    "SalaryMax": Posting.salary_max,
+    "Skills": Posting.Skills,
+    "URL": Posting.URL,
+    "Status": Job.Status,
+    "DateFound": Job.DateFound,
+    "JobScore": Job.job_score,
+}
+
+def export_rows(db, stmt):
+    # Plain tuples off a server-side cursor, EXPORT_CHUNK_ROWS at a time; no ORM
+    # objects, so nothing accumulates in the session however many rows there are
+    result = db.execute(stmt.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+    for chunk in result.partitions():
+        yield [
+            [value.value if isinstance(value, JobStatus) else value for value in row]
+            for row in chunk
+        ]
+
+def format_csv(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()  # just the header when there were no rows
+
+def format_jsonl(chunks):
+    keys = list(EXPORT_COLUMNS)
+    for chunk in chunks:
+        yield "".join(json.dumps(dict(zip(keys, row)), default=str) + "\n" for row in chunk)
+
+# Export Jobs API route
+@app.route("/export_jobs", methods=["GET"])
+def export_jobs():
+    if (resp := require_login()):
+        return resp
+    fmt = request.args.get("format", "csv")
+    if fmt not in ("csv", "jsonl"):
+        return jsonify({"status": "error", "message": "format must be csv or jsonl"}), 400
+    try:
+        status = request.args.get("status") or None
+        if status is not None:
+            status = JobStatus(status)
+    except ValueError:
+        return jsonify({"status": "error", "message": "Unknown status"}), 400
+
+    stmt = (
+        select(*EXPORT_COLUMNS.values())
+        .join_from(Job, Posting, Job.posting_id == Posting.posting_id)
+        .where(Job.user_email == session["user"])
+        .order_by(Job.job_id)
+    )
+    if status is not None:
+        stmt = stmt.where(Job.Status == status)
+    min_score = request.args.get("minScore", type=float)
+    if min_score is not None:
+        stmt = stmt.where(Job.job_score >= min_score)
+
+    def generate():
+        # The session lives as long as the response streams
+        db = SessionLocal()
+        try:
+            chunks = export_rows(db, stmt)
+            yield from (format_csv(chunks) if fmt == "csv" else format_jsonl(chunks))
+        except Exception as e:
+            print("Error in export_jobs:", e)  # headers are already sent; the download ends short
+        finally:
+            db.close()
+
+    filename = f"jobs-{datetime.now():%Y%m%d}.{fmt}"
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/csv" if fmt == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+# Operational metrics API route
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    # Breaker state and driver details aren't public: a logged-in user or the metrics token
+    token = request.headers.get("Authorization", "")
+    if not (METRICS_TOKEN and hmac.compare_digest(token.encode(), f"Bearer {METRICS_TOKEN}".encode())):
+        if (resp := require_login()):
+            return resp
+    return jsonify({
+        "sources": source_health(),
+        "drivers": watchdog.snapshot(),
+        "driver_modes": driver_mode.stats.snapshot(),
+        "queries": query_stats.totals.snapshot(),
+    }), 200
+
+# Analytics API route
+@app.route("/analytics", methods=["GET"])
+def get_analytics():
+    if (resp := require_login()):
+        return resp
+    db = SessionLocal()
+    try: # ?report=queries|sources|titles&days=30
+        report = request.args.get("report", "queries")
+        days = min(max(request.args.get("days", 30, type=int), 1), 365)
+        if report == "queries":
+            data = analytics.query_report(db, session["user"], days)
+        elif report == "sources":
+            data = analytics.source_report(db, days)
+        elif report == "titles":
+            data = analytics.title_report(db, session["user"])
+        else:
+            return jsonify({"status": "error", "message": f"Unknown report: {report}"}), 400
+        return jsonify({"status": "success", "report": report, "rows": data}), 200
+    except Exception as e:
+        print("Error in get_analytics:", e)
+        return jsonify({"status": "error", "message": "Internal server error"}), 500
+    finally:
+        db.close()
+
+# Filter rule API routes
+@app.route("/filter_rules", methods=["GET"])
+def get_filter_rules():
+    if (resp := require_login()):
+        return resp
+    db = SessionLocal()
+    try:
+        rules = db.query(Filter_Rule).filter(Filter_Rule.user_email == session["user"]).all()
+        return jsonify({
+            "status": "success",
+            "rules": [
+                {"RuleId": rule.rule_id, "Type": rule.rule_type.value, "Value": rule.value}
+                for rule in rules
+            ],
+        }), 200
+    except Exception as e:
+        print("Error in get_filter_rules:", e)
+        return jsonify({"status": "error", "message": "Internal server error"}), 500
+    finally:
+        db.close()
+
+@app.route("/add_filter_rules", methods=["POST"])
+def add_filter_rules():
+    if (resp := require_login()):
+        return resp
+    db = SessionLocal()
+    try: # expects {"rules": [{"Type": "Block Company", "Value": "Acme"}, ...]}
+        user_email = session["user"]
+        for rule in request.get_json().get("rules", []):
+            try:
+                rule_type = FilterRuleType(rule.get("Type"))
+            except ValueError:
+                return jsonify({"status": "error", "message": f"Unknown rule type: {rule.get('Type')}"}), 400
+            value = str(rule.get("Value", "")).strip()
+            if not value:
+                continue
+            if rule_type == FilterRuleType.SalaryFloor:
+                # Stored as a yearly amount; "120k" and "$60/hr" are accepted, anything unparseable isn't
+                floor = parse_salary(value)
+                if not floor or floor["min"] <= 0:
+                    return jsonify({"status": "error", "message": f"Invalid salary floor: {value}"}), 400
+                value = f"{annualize(floor['min'], floor['period']):.0f}"
+            exists = (
+                db.query(Filter_Rule)
+                .filter_by(user_email=user_email, rule_type=rule_type, value=value)
+                .first()
+            )
+            if not exists:
+                db.add(Filter_Rule(user_email=user_email, rule_type=rule_type, value=value))
+        db.commit()
+        filter_cache.invalidate(user_email)
+        return jsonify({"status": "success"}), 200
+    except Exception as e:
+        db.rollback()
+        print("Error in add_filter_rules:", e)
+        return jsonify({"status": "error", "message": "Internal server error"}), 500
+    finally:
+        db.close()
+
+@app.route("/remove_filter_rules", methods=["POST"])
+def remove_filter_rules():
+    if (resp := require_login()):
+        return resp
+    db = SessionLocal()
+    try:
+        user_email = session["user"]
+        rule_ids = request.get_json().get("ruleIds", [])
+        (
+            db.query(Filter_Rule)
+            .filter(Filter_Rule.user_email == user_email, Filter_Rule.rule_id.in_(rule_ids))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        filter_cache.invalidate(user_email)
+        return jsonify({"status": "success"}), 200
+    except Exception as e:
+        db.rollback()
+        print("Error in remove_filter_rules:", e)
+        return jsonify({"status": "error", "message": "Internal server error"}), 500
+    finally:
+        db.close()
+
+# Saved search API routes
+@app.route("/saved_searches", methods=["GET"])
+def get_saved_searches():
+    if (resp := require_login()):
+        return resp
+    db = SessionLocal()
+    try:
+        searches = (
+            db.query(Saved_Search)
+            .filter(Saved_Search.user_email == session["user"])
+            .order_by(Saved_Search.next_run_at)
+            .all()
+        )
+        return jsonify({
+            "status": "success",
+            "searches": [
+                {
+                    "SearchId": s.search_id,
+                    "JobTitle": s.query.job_title,
+                    "Location": s.query.location,
+                    "DatePosted": s.query.date_posted,
+                    "ExperienceLevel": s.query.experience_level,
+                    "IntervalMinutes": s.interval_minutes,
+                    "NextRun": s.next_run_at.isoformat() if s.next_run_at else None,
+                    "LastRun": s.last_run_at.isoformat() if s.last_run_at else None,
+                    "Active": s.active,
+                }
+                for s in searches
+            ],
+        }), 200
+    except Exception as e:
+        print("Error in get_saved_searches:", e)
+        return jsonify({"status": "error", "message": "Internal server error"}), 500
+    finally:
+        db.close()
+
+@app.route("/add_saved_search", methods=["POST"])
+def add_saved_search():
+    if (resp := require_login()):
+        return resp
+    db = SessionLocal()
+    try: # same payload as /add_job_request, plus "intervalMinutes"
+        job_data = request.get_json()
+        if not job_data.get("jobTitle"):
+            return jsonify({"status": "error", "message": "jobTitle is required"}), 400
+        interval = max(int(job_data.get("intervalMinutes") or 1440), MIN_INTERVAL_MINUTES)
+
+        query = create_job_query(db, job_data) # reused by every scheduled run
+        db.flush()
+
+        params = extract_scrape_params(job_data)
+        search = Saved_Search(
+            user_email=session["user"],
+            query_id=query.query_id,
+            query_key=normalize_query_key(**params),
+            interval_minutes=interval,
+            next_run_at=first_run_at(interval),
+            active=True,
+        )
+        db.add(search)
+        db.commit()
+        return jsonify({"status": "success", "searchId": search.search_id}), 200
+    except Exception as e:
+        db.rollback()
+        print("Error in add_saved_search:", e)
+        return jsonify({"status": "error", "message": "Internal server error"}), 500
+    finally:
+        db.close()
+
+@app.route("/remove_saved_searches", methods=["POST"])
+def remove_saved_searches():
+    if (resp := require_login()):
+        return resp
+    db = SessionLocal()
+    try:
+        search_ids = request.get_json().get("searchIds", [])
+        (
+            db.query(Saved_Search)
+            .filter(Saved_Search.user_email == session["user"], Saved_Search.search_id.in_(search_ids))
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return jsonify({"status": "success"}), 200
+    except Exception as e:
+        db.rollback()
+        print("Error in remove_saved_searches:", e)
+        return jsonify({"status": "error", "message": "Internal server error"}), 500
+    finally:
+        db.close()
+
 # Resume upload handling
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS # check extension
@@ -344,96 +711,6 @@ def resume_handler():
     finally:
         db.close()
 
-# Resume parsing function
-def resume_parse(file_path, filename):
-    """Extract and structure key resume sections."""
-    text = extract_text(file_path)
-
-    # Split sections by flexible headings (case-insensitive)
-    sections = re.split(
-        r"(?i)(?:Professional Summary:?|Summary:?|Technical Skills:?|Skills:?|Experience:?|"
-        r"Academic & Independent Projects:?|Projects:?|Education:?)",
-        text,
-    )
-
-    # Pad for safety
-    while len(sections) < 6:
-        sections.append("")
-
-    data = {
-        "summary": sections[1].strip(),
-        "skills": sections[2].strip(),
-        "experience": sections[3].strip(),
-        "projects": sections[4].strip(),
-        "education": sections[5].strip(),
-    }
-
-    # Parse "Technical Skills" section into dict
-    skills = {}
-    for line in data["skills"].splitlines():
-        if ":" in line:
-            key, value = line.split(":", 1)
-            skills[key.strip()] = [s.strip() for s in value.split(",") if s.strip()]
-
-    return {
-        "status": "ok",
-        "filename": filename,
-        "summary": data["summary"],
-        "skills": skills,
-        "experience": data["experience"],
-        "projects": data["projects"],
-        "education": data["education"],
-    }
-
-# Job score calculation function, using TF-IDF and keyword overlap
-def calculate_job_score(parsed_resume, job):
-    """Compute job fit score using TF-IDF + keyword overlap."""
-    
-    if not parsed_resume:
-        return 0.0
-
-    skills_dict = parsed_resume.get("skills") or {}
-    job_title = job.get("JobTitle", "")
-    job_text_raw = f"{job.get('Skills', '')} {job.get('Description', '')}"
-
-    # Combine resume text sections for stronger context, lowercased
-    resume_text = (
-        " ".join(
-            f"{category} {' '.join(skills)}"
-            for category, skills in skills_dict.items()
-        )
-        + " "
-        + parsed_resume.get("summary", "")
-        + " "
-        + parsed_resume.get("experience", "")
-        + " "
-        + parsed_resume.get("projects", "")
-    ).lower()
-
-    job_text = f"{job_title} {job_text_raw}".lower() # combined job text
-
-    def clean(s): # remove non-letters
-        return re.sub(r"[^a-z\s]", " ", s)
-
-    resume_text, job_text = clean(resume_text), clean(job_text) # clean texts
-
-    if not resume_text.strip() or not job_text.strip(): # empty check
-        return 0.0
-
-    # TF-IDF cosine similarity
-    vectorizer = TfidfVectorizer(stop_words="english") # init vectorizer
-    tfidf = vectorizer.fit_transform([resume_text, job_text]) # fit + transform
-    cosine_score = float(cosine_similarity(tfidf)[0, 1]) # get cosine sim
-
-    # Keyword overlap
-    resume_words = set(resume_text.split()) # unique words in resume
-    job_words = set(job_text.split()) # unique words in job
-    overlap_ratio = len(resume_words & job_words) / (len(job_words) or 1) # overlap ratio
-
-    # Blend + scale
-    blended = (cosine_score * 0.7) + (overlap_ratio * 0.3) # weighted blend
-    return round(min(blended * 200, 100), 2) # scale to 0-100
-
 @app.route("/login", methods=["POST"])
 def login():
     data = request.get_json(force=True)
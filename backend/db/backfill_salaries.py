@@ -0,0 +1,52 @@
+# backend/db/backfill_salaries.py
+# One-off backfill of the numeric salary columns for rows inserted before
+# migration 003 (on postings since migration 006). Works in small committed
+# batches keyed on posting_id, so it can be stopped and re-run safely.
+#
+# Usage: python -m backend.db.backfill_salaries
+from backend.db.db_config import SessionLocal
+from backend.db.models import Posting
+from backend.services.salary import normalize_salary
+
+BATCH_SIZE = 1000
+
+
+def backfill(batch_size=BATCH_SIZE):
+    db = SessionLocal()
+    last_id = 0
+    updated = 0
+    try:
+        while True:
+            rows = (
+                db.query(Posting.posting_id, Posting.Salary)
+                .filter(
+                    Posting.posting_id > last_id,
+                    Posting.Salary.isnot(None),
+                    Posting.salary_period.is_(None),
+                )
+                .order_by(Posting.posting_id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            mappings = []
+            for posting_id, salary in rows:
+                values = normalize_salary(salary)
+                if values["salary_period"] is not None:
+                    mappings.append({"posting_id": posting_id, **values})
+            if mappings:
+                db.bulk_update_mappings(Posting, mappings)
+            db.commit()
+
+            updated += len(mappings)
+            last_id = rows[-1][0]
+            print(f"Backfilled {updated} salaries (through posting_id {last_id})")
+    finally:
+        db.close()
+    return updated
+
+
+if __name__ == "__main__":
+    backfill()
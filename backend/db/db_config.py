@@ -1,29 +1,40 @@
 # Expected env vars: SQL_USER, SQL_PASSWORD (loaded via utils.load_env_variables)
+# DATABASE_URL, if set, overrides the MySQL URL (e.g. sqlite:///load_test.db for local runs)
+import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from ..services.utils import load_env_variables
+from . import query_stats
 
 env_vars = load_env_variables()
 USERNAME = env_vars["SQL_USER"]
 PASSWORD = env_vars["SQL_PASSWORD"]
-HOST = "db"
-PORT = 3306
-DATABASE = "jobs"
+HOST = os.getenv("DB_HOST", "db")
+PORT = int(os.getenv("DB_PORT", "3306"))
+DATABASE = os.getenv("DB_NAME", "jobs")
 
 # SQLAlchemy connection URL
-DB_URL = (
+DB_URL = os.getenv("DATABASE_URL") or (
     f"mysql+pymysql://{USERNAME}:{PASSWORD}@{HOST}:{PORT}/{DATABASE}?charset=utf8mb4"
 )
 
 # Create engine and session
 # Change "echo" to false if you dont want to see raw SQL queries in the console
-engine = create_engine(
-    DB_URL,
-    echo=False,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=5
-)
+if DB_URL.startswith("sqlite"):
+    engine = create_engine(
+        DB_URL,
+        echo=False,
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+else:
+    engine = create_engine(
+        DB_URL,
+        echo=False,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=5
+    )
+query_stats.install(engine)  # per-request statement counts, see query_stats.py
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base class for models
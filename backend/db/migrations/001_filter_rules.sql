@@ -0,0 +1,12 @@
+-- Per-user scrape filter rules (see backend/services/filters.py)
+CREATE TABLE IF NOT EXISTS filter_rules (
+    rule_id INT NOT NULL AUTO_INCREMENT,
+    user_email VARCHAR(255) NOT NULL,
+    rule_type VARCHAR(13) NOT NULL,
+    value VARCHAR(255) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (rule_id),
+    UNIQUE KEY uq_filter_rule (user_email, rule_type, value),
+    KEY ix_filter_rules_user_email (user_email),
+    CONSTRAINT fk_filter_rules_user FOREIGN KEY (user_email) REFERENCES users (email) ON DELETE CASCADE
+);
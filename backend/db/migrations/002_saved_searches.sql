@@ -0,0 +1,18 @@
+-- Saved searches re-run on a schedule (see backend/services/scheduler.py)
+CREATE TABLE IF NOT EXISTS saved_searches (
+    search_id INT NOT NULL AUTO_INCREMENT,
+    user_email VARCHAR(255) NOT NULL,
+    query_id INT NOT NULL,
+    query_key VARCHAR(600) NOT NULL,
+    interval_minutes INT NOT NULL DEFAULT 1440,
+    next_run_at DATETIME NOT NULL,
+    last_run_at DATETIME NULL,
+    active BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (search_id),
+    KEY ix_saved_searches_user_email (user_email),
+    KEY ix_saved_searches_query_key (query_key),
+    KEY idx_saved_searches_due (active, next_run_at),
+    CONSTRAINT fk_saved_searches_user FOREIGN KEY (user_email) REFERENCES users (email) ON DELETE CASCADE,
+    CONSTRAINT fk_saved_searches_query FOREIGN KEY (query_id) REFERENCES job_query (query_id) ON DELETE CASCADE
+);
@@ -0,0 +1,8 @@
+-- Numeric salary columns parsed from jobs.Salary (see backend/services/salary.py).
+-- Existing rows are filled by: python -m backend.db.backfill_salaries
+ALTER TABLE jobs
+    ADD COLUMN salary_min FLOAT NULL,
+    ADD COLUMN salary_max FLOAT NULL,
+    ADD COLUMN salary_period VARCHAR(10) NULL,
+    ADD COLUMN salary_currency VARCHAR(3) NULL,
+    ADD INDEX idx_jobs_user_salary (user_email, salary_max);
@@ -0,0 +1,36 @@
+-- Structured scrape counters and analytics rollups (see backend/services/analytics.py)
+ALTER TABLE scrape_sessions
+    ADD COLUMN jobs_found INT NOT NULL DEFAULT 0,
+    ADD COLUMN jobs_inserted INT NOT NULL DEFAULT 0,
+    ADD COLUMN jobs_duplicates INT NOT NULL DEFAULT 0,
+    ADD COLUMN duration_seconds FLOAT NULL;
+
+CREATE TABLE IF NOT EXISTS daily_query_stats (
+    user_email VARCHAR(255) NOT NULL,
+    day DATE NOT NULL,
+    query_key VARCHAR(255) NOT NULL,
+    sessions INT NOT NULL DEFAULT 0,
+    jobs_found INT NOT NULL DEFAULT 0,
+    jobs_inserted INT NOT NULL DEFAULT 0,
+    jobs_duplicates INT NOT NULL DEFAULT 0,
+    duration_seconds FLOAT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_email, day, query_key)
+);
+
+CREATE TABLE IF NOT EXISTS daily_source_stats (
+    day DATE NOT NULL,
+    source VARCHAR(50) NOT NULL,
+    runs INT NOT NULL DEFAULT 0,
+    failures INT NOT NULL DEFAULT 0,
+    jobs_found INT NOT NULL DEFAULT 0,
+    duration_seconds FLOAT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, source)
+);
+
+CREATE TABLE IF NOT EXISTS title_score_buckets (
+    user_email VARCHAR(255) NOT NULL,
+    title_key VARCHAR(255) NOT NULL,
+    bucket INT NOT NULL,
+    jobs INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_email, title_key, bucket)
+);
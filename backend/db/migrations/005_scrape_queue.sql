@@ -0,0 +1,6 @@
+-- Scrape sessions as a work queue for standalone scrape workers (see backend/services/scrape_worker.py)
+ALTER TABLE scrape_sessions
+    ADD COLUMN lease_owner VARCHAR(100) NULL,
+    ADD COLUMN lease_expires_at DATETIME NULL,
+    ADD COLUMN attempts INT NOT NULL DEFAULT 0,
+    ADD KEY idx_scrape_sessions_queue (status, lease_expires_at);
@@ -0,0 +1,50 @@
+-- Scraped posting data is stored once per URL in postings; jobs keeps only the
+-- per-user fields (status, score, scrape session) and points at its posting.
+
+CREATE TABLE IF NOT EXISTS postings (
+    posting_id INT NOT NULL AUTO_INCREMENT,
+    URL VARCHAR(500) NOT NULL,
+    JobTitle VARCHAR(255) NOT NULL,
+    Company VARCHAR(255) NOT NULL,
+    Location VARCHAR(255) NOT NULL,
+    Salary VARCHAR(255) NULL,
+    salary_min FLOAT NULL,
+    salary_max FLOAT NULL,
+    salary_period VARCHAR(10) NULL,
+    salary_currency VARCHAR(3) NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (posting_id),
+    UNIQUE KEY uq_postings_url (URL),
+    KEY idx_postings_salary_max (salary_max) -- minSalary filter / salary sort on /refresh_jobs
+);
+
+-- One posting per URL, taking the most recently inserted copy's fields
+INSERT INTO postings (URL, JobTitle, Company, Location, Salary,
+                      salary_min, salary_max, salary_period, salary_currency, created_at)
+SELECT j.URL, j.JobTitle, j.Company, j.Location, j.Salary,
+       j.salary_min, j.salary_max, j.salary_period, j.salary_currency, j.created_at
+FROM jobs j
+JOIN (SELECT MAX(job_id) AS job_id FROM jobs GROUP BY URL) latest ON latest.job_id = j.job_id;
+
+ALTER TABLE jobs ADD COLUMN posting_id INT NULL AFTER job_id;
+
+UPDATE jobs j JOIN postings p ON p.URL = j.URL SET j.posting_id = p.posting_id;
+
+ALTER TABLE jobs
+    MODIFY posting_id INT NOT NULL,
+    ADD CONSTRAINT fk_jobs_posting FOREIGN KEY (posting_id) REFERENCES postings (posting_id) ON DELETE CASCADE,
+    ADD UNIQUE KEY uq_job_user_posting (posting_id, user_email),
+    ADD INDEX idx_jobs_user_status (user_email, Status),
+    DROP INDEX uq_job_user_url,
+    DROP INDEX idx_jobs_user_salary,
+    DROP INDEX ix_jobs_URL,
+    DROP COLUMN URL,
+    DROP COLUMN JobTitle,
+    DROP COLUMN Company,
+    DROP COLUMN Location,
+    DROP COLUMN Salary,
+    DROP COLUMN salary_min,
+    DROP COLUMN salary_max,
+    DROP COLUMN salary_period,
+    DROP COLUMN salary_currency;
@@ -0,0 +1,31 @@
+-- Retention (backend/services/retention.py): expired Ignored/New jobs move to
+-- jobs_archive, and seen_urls remembers them so scrapes don't re-insert them.
+
+CREATE TABLE IF NOT EXISTS seen_urls (
+    user_email VARCHAR(255) NOT NULL,
+    url_hash BIGINT NOT NULL,
+    expires_on DATE NOT NULL,
+    PRIMARY KEY (user_email, url_hash),
+    INDEX ix_seen_urls_expires_on (expires_on)
+);
+
+-- No foreign keys and DateFound in the primary key, as range partitioning requires.
+-- Old history lands in p_history; the retention pass splits monthly partitions off
+-- pmax ahead of time and drops whole partitions once RETENTION_ARCHIVE_DAYS passes.
+CREATE TABLE IF NOT EXISTS jobs_archive (
+    job_id INT NOT NULL,
+    DateFound DATE NOT NULL,
+    posting_id INT NOT NULL,
+    scrape_session_id INT NULL,
+    user_email VARCHAR(255) NULL,
+    Status VARCHAR(7) NOT NULL,
+    job_score FLOAT NULL,
+    archived_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, DateFound),
+    INDEX idx_jobs_archive_user (user_email),
+    INDEX idx_jobs_archive_posting (posting_id)
+)
+PARTITION BY RANGE (TO_DAYS(DateFound)) (
+    PARTITION p_history VALUES LESS THAN (TO_DAYS('2026-11-01')),
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
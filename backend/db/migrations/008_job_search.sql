@@ -0,0 +1,8 @@
+-- Full-text search over postings for /search_jobs. Skills holds the short
+-- skills line from the listing card; existing postings pick it up when next scraped.
+
+ALTER TABLE postings ADD COLUMN Skills VARCHAR(500) NULL AFTER Salary;
+
+-- InnoDB builds one FULLTEXT index per ALTER
+ALTER TABLE postings ADD FULLTEXT INDEX ft_postings_text (JobTitle, Company, Location, Skills);
+ALTER TABLE postings ADD FULLTEXT INDEX ft_postings_title (JobTitle);
@@ -0,0 +1,11 @@
+-- Rebuild the /search_jobs FULLTEXT indexes after the server starts with
+-- innodb_ft_min_token_size=2 and innodb_ft_enable_stopword=OFF
+-- (docker-compose.yml), so two-letter words such as "go", "qa" and "it" are
+-- indexed. Both settings only apply to indexes built after the restart.
+
+ALTER TABLE postings DROP INDEX ft_postings_text;
+ALTER TABLE postings DROP INDEX ft_postings_title;
+
+-- InnoDB builds one FULLTEXT index per ALTER
+ALTER TABLE postings ADD FULLTEXT INDEX ft_postings_text (JobTitle, Company, Location, Skills);
+ALTER TABLE postings ADD FULLTEXT INDEX ft_postings_title (JobTitle);
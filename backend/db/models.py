@@ -1,5 +1,7 @@
 from datetime import datetime
 from sqlalchemy import (
+    BigInteger,
+    Boolean,
     String,
     Integer,
     DateTime,
@@ -25,6 +27,7 @@ class Source (str, enum.Enum):
     Indeed = "Indeed"
     
 class ScrapeStatus(str, enum.Enum):
+    Pending = "Pending"  # queued for a scrape worker
     Running = "Running"
     Complete = "Complete"
     Failed = "Failed"
@@ -43,6 +46,13 @@ class JobStatus(str, enum.Enum):
     New = "New"
     Applied = "Applied"
     Ignored = "Ignored"
+
+class FilterRuleType(str, enum.Enum):
+    BlockCompany = "Block Company"
+    AllowCompany = "Allow Company"
+    BlockKeyword = "Block Keyword"
+    AllowKeyword = "Allow Keyword"
+    SalaryFloor = "Salary Floor"
     
 # =======================================
 #               Tables
@@ -103,6 +113,18 @@ class Scrape_Session(Base):
     )
     log: Mapped[str] = mapped_column(String(1000), default="Scrape started.")
 
+    # Structured counters, filled in by finalize_scrape_session
+    jobs_found: Mapped[int] = mapped_column(Integer, default=0)
+    jobs_inserted: Mapped[int] = mapped_column(Integer, default=0)
+    jobs_duplicates: Mapped[int] = mapped_column(Integer, default=0)
+    duration_seconds: Mapped[float] = mapped_column(Float, nullable=True, default=None)
+
+    # Lease held by a scrape worker (backend/services/scrape_worker.py); an expired
+    # lease on a Running session means its worker died and the session is re-queued
+    lease_owner: Mapped[str] = mapped_column(String(100), nullable=True, default=None)
+    lease_expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True, default=None)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+
     query = relationship("Job_Query", back_populates="scrape_sessions")
     jobs = relationship("Job", back_populates="scrape_session", cascade="all, delete")
     user = relationship("User", back_populates="scrape_sessions", foreign_keys=[user_email])
@@ -110,23 +132,58 @@ class Scrape_Session(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-class Job(Base):
-    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("idx_scrape_sessions_queue", "status", "lease_expires_at"),
+    )
 
-    job_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    scrape_session_id: Mapped[int] = mapped_column(ForeignKey("scrape_sessions.scrape_session_id", ondelete="CASCADE"))
+class Posting(Base):
+    __tablename__ = "postings"
+
+    # One row per scraped posting, shared by every user whose searches found it
+    posting_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    URL: Mapped[str] = mapped_column(String(500), unique=True)
 
     JobTitle: Mapped[str] = mapped_column(String(255))
     Company: Mapped[str] = mapped_column(String(255))
     Location: Mapped[str] = mapped_column(String(255))
-    URL: Mapped[str] = mapped_column(String(500), index=True)
+    Salary: Mapped[str] = mapped_column(String(255), nullable=True)
+    Skills: Mapped[str] = mapped_column(String(500), nullable=True)  # skills line from the listing card
+
+    # Parsed from Salary at insert (backend/services/salary.py); min/max are yearly figures
+    salary_min: Mapped[float] = mapped_column(Float, nullable=True, default=None)
+    salary_max: Mapped[float] = mapped_column(Float, nullable=True, default=None)
+    salary_period: Mapped[str] = mapped_column(String(10), nullable=True, default=None)
+    salary_currency: Mapped[str] = mapped_column(String(3), nullable=True, default=None)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+    DateTime(timezone=True),
+    server_default=func.now(),
+    onupdate=func.now()
+    )
+
+    jobs = relationship("Job", back_populates="posting")
+
+    # salary_max backs /refresh_jobs' minSalary filter and salary sort (replaces jobs' idx_jobs_user_salary).
+    # The FULLTEXT ones back /search_jobs (backend/services/search.py); the title-only index weights title hits
+    __table_args__ = (
+        Index("idx_postings_salary_max", "salary_max"),
+        Index("ft_postings_text", "JobTitle", "Company", "Location", "Skills", mysql_prefix="FULLTEXT"),
+        Index("ft_postings_title", "JobTitle", mysql_prefix="FULLTEXT"),
+    )
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    # A user's copy of a posting: only what differs per user
+    job_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    posting_id: Mapped[int] = mapped_column(ForeignKey("postings.posting_id", ondelete="CASCADE"))
+    scrape_session_id: Mapped[int] = mapped_column(ForeignKey("scrape_sessions.scrape_session_id", ondelete="CASCADE"))
 
     Status: Mapped[JobStatus] = mapped_column(
         SAEnum(JobStatus, values_callable=lambda e: [x.value for x in e], native_enum=False),
         default=JobStatus.New,
     )
-    
-    Salary: Mapped[str] = mapped_column(String(255))
 
     DateFound: Mapped[datetime] = mapped_column(Date)
     
@@ -142,8 +199,122 @@ class Job(Base):
     user_email = Column(String(255), ForeignKey("users.email"), nullable=True)
 
     scrape_session = relationship("Scrape_Session", back_populates="jobs")
+    posting = relationship("Posting", back_populates="jobs", lazy="joined", innerjoin=True)
 
     __table_args__ = (
         Index("idx_jobs_status_date", "Status", "DateFound"),
-        UniqueConstraint("URL", "user_email", name="uq_job_user_url"),
+        Index("idx_jobs_user_status", "user_email", "Status"),
+        UniqueConstraint("posting_id", "user_email", name="uq_job_user_posting"),
     )
+
+class Job_Archive(Base):
+    __tablename__ = "jobs_archive"
+
+    # Jobs moved out of the hot table by backend/services/retention.py. No foreign
+    # keys and DateFound in the primary key, so MySQL can range-partition it by month.
+    job_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    DateFound: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    posting_id: Mapped[int] = mapped_column(Integer)
+    scrape_session_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    user_email: Mapped[str] = mapped_column(String(255), nullable=True)
+
+    Status: Mapped[JobStatus] = mapped_column(
+        SAEnum(JobStatus, values_callable=lambda e: [x.value for x in e], native_enum=False),
+    )
+    job_score: Mapped[float] = mapped_column(Float, nullable=True, default=None)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_jobs_archive_user", "user_email"),
+        Index("idx_jobs_archive_posting", "posting_id"),
+    )
+
+class Seen_Url(Base):
+    __tablename__ = "seen_urls"
+
+    # Tombstone for a job retention removed: a 64-bit hash of the canonical URL is
+    # enough to keep the next scrape from inserting it again
+    user_email: Mapped[str] = mapped_column(String(255), primary_key=True)
+    url_hash: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    expires_on: Mapped[datetime] = mapped_column(Date, index=True)
+
+class Filter_Rule(Base):
+    __tablename__ = "filter_rules"
+
+    rule_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_email: Mapped[str] = mapped_column(ForeignKey("users.email", ondelete="CASCADE"), index=True)
+
+    rule_type: Mapped[FilterRuleType] = mapped_column(
+        SAEnum(FilterRuleType, values_callable=lambda e: [x.value for x in e], native_enum=False),
+    )
+    value: Mapped[str] = mapped_column(String(255))
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("user_email", "rule_type", "value", name="uq_filter_rule"),
+    )
+
+class Saved_Search(Base):
+    __tablename__ = "saved_searches"
+
+    search_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_email: Mapped[str] = mapped_column(ForeignKey("users.email", ondelete="CASCADE"), index=True)
+    query_id: Mapped[int] = mapped_column(ForeignKey("job_query.query_id", ondelete="CASCADE"))
+
+    # Normalized query parameters; identical keys are scraped once for all subscribers
+    query_key: Mapped[str] = mapped_column(String(600), index=True)
+
+    interval_minutes: Mapped[int] = mapped_column(Integer, default=1440)
+    next_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    last_run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    query = relationship("Job_Query")
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_saved_searches_due", "active", "next_run_at"),
+    )
+
+# =======================================
+#         Analytics rollup tables
+# =======================================
+# Maintained incrementally by backend/services/analytics.py, one upsert per
+# scrape, so reports read a bounded number of rows regardless of history.
+
+class Daily_Query_Stats(Base):
+    __tablename__ = "daily_query_stats"
+
+    # user first so per-user day-range reports use the primary key
+    user_email: Mapped[str] = mapped_column(String(255), primary_key=True)
+    day: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    query_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    sessions: Mapped[int] = mapped_column(Integer, default=0)
+    jobs_found: Mapped[int] = mapped_column(Integer, default=0)
+    jobs_inserted: Mapped[int] = mapped_column(Integer, default=0)
+    jobs_duplicates: Mapped[int] = mapped_column(Integer, default=0)
+    duration_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+
+class Daily_Source_Stats(Base):
+    __tablename__ = "daily_source_stats"
+
+    day: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    source: Mapped[str] = mapped_column(String(50), primary_key=True)
+
+    runs: Mapped[int] = mapped_column(Integer, default=0)
+    failures: Mapped[int] = mapped_column(Integer, default=0)
+    jobs_found: Mapped[int] = mapped_column(Integer, default=0)
+    duration_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+
+class Title_Score_Bucket(Base):
+    __tablename__ = "title_score_buckets"
+
+    # Histogram of job scores (1-point buckets 0-100) per searched title
+    user_email: Mapped[str] = mapped_column(String(255), primary_key=True)
+    title_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    bucket: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+
+    jobs: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,127 @@
+# backend/db/query_stats.py
+# Per-request SQL accounting. Cursor events on the engine add every
+# statement's count, time and rowcount to the tracker of the request that
+# ran it (a context variable, so concurrent requests don't mix). app.py
+# starts a tracker per request, reports it in a Server-Timing header and
+# folds it into per-endpoint totals for /metrics. A request that runs more
+# than QUERY_BUDGET statements, or one statement shape more than
+# REPEAT_LIMIT times (the N+1 signature), is logged.
+#
+# Statements outside a request (scheduler, scrape worker) are not counted.
+import os
+import re
+import time
+import threading
+import contextvars
+from collections import Counter
+from sqlalchemy import event
+
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "50"))  # statements per request before warning
+REPEAT_LIMIT = int(os.getenv("QUERY_REPEAT_LIMIT", "10"))  # runs of one statement shape before warning
+
+_PARAM_LIST_RE = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))*\s*\)")
+_WS_RE = re.compile(r"\s+")
+
+_current = contextvars.ContextVar("query_stats", default=None)
+
+
+def statement_shape(statement):
+    """The statement with whitespace and IN-list lengths normalized, so repeats compare equal."""
+    return _PARAM_LIST_RE.sub("(?)", _WS_RE.sub(" ", statement).strip())
+
+
+class RequestQueries:
+    __slots__ = ("queries", "seconds", "rows", "shapes")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.shapes = Counter()
+
+    def repeated(self):
+        """(shape, count) of the most repeated statement if it went over REPEAT_LIMIT, else None."""
+        if not self.shapes:
+            return None
+        shape, count = self.shapes.most_common(1)[0]
+        return (shape, count) if count > REPEAT_LIMIT else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None or not conn.info.get("query_started"):
+        return
+    stats.seconds += time.perf_counter() - conn.info["query_started"].pop()
+    stats.queries += 1
+    stats.shapes[statement_shape(statement)] += 1
+    if cursor.rowcount and cursor.rowcount > 0:  # -1 where the driver doesn't report it (SQLite SELECTs)
+        stats.rows += cursor.rowcount
+
+
+def install(engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class EndpointTotals:
+    """Running per-endpoint totals for /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def add(self, endpoint, stats, over_budget, repeated):
+        with self._lock:
+            t = self._totals.setdefault(endpoint, {
+                "requests": 0, "queries": 0, "seconds": 0.0, "rows": 0,
+                "max_queries": 0, "budget_warnings": 0, "repeat_warnings": 0,
+            })
+            t["requests"] += 1
+            t["queries"] += stats.queries
+            t["seconds"] += stats.seconds
+            t["rows"] += stats.rows
+            t["max_queries"] = max(t["max_queries"], stats.queries)
+            t["budget_warnings"] += over_budget
+            t["repeat_warnings"] += repeated
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    **t,
+                    "seconds": round(t["seconds"], 4),
+                    "avg_queries": round(t["queries"] / t["requests"], 2),
+                }
+                for endpoint, t in self._totals.items()
+            }
+
+
+totals = EndpointTotals()
+
+
+def begin():
+    """Start counting for the current request; returns the token for finish()."""
+    return _current.set(RequestQueries())
+
+
+def finish(token, endpoint):
+    """Stop counting, log budget/N+1 warnings, add to the totals. Returns the request's stats."""
+    stats = _current.get()
+    _current.reset(token)
+    if stats is None:
+        return None
+
+    over_budget = stats.queries > QUERY_BUDGET
+    repeated = stats.repeated()
+    if over_budget:
+        print(f"[Queries] {endpoint}: {stats.queries} statements (budget {QUERY_BUDGET}), {stats.seconds * 1e3:.1f}ms")
+    if repeated:
+        shape, count = repeated
+        print(f"[Queries] {endpoint}: possible N+1, {count}x {shape[:200]}")
+    totals.add(endpoint, stats, over_budget, repeated is not None)
+    return stats
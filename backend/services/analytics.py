@@ -0,0 +1,146 @@
+# backend/services/analytics.py
+# Incrementally maintained rollups behind the /analytics endpoint. Each
+# scrape adds its counters to a handful of rollup rows with an upsert, so
+# reports read at most days x keys rows instead of scanning scrape_sessions
+# and jobs.
+import re
+from datetime import date, timedelta
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from backend.db.models import Daily_Query_Stats, Daily_Source_Stats, Title_Score_Bucket
+
+_WS_RE = re.compile(r"\s+")
+
+
+def rollup_key(text):
+    return _WS_RE.sub(" ", (text or "").strip().lower())[:255]
+
+
+def upsert_increment(db, model, keys, increments):
+    """INSERT the row or add `increments` to the existing one, in a single statement."""
+    values = {**keys, **increments}
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(model).values(**values)
+        stmt = stmt.on_duplicate_key_update(
+            {col: getattr(model, col) + stmt.inserted[col] for col in increments}
+        )
+    elif dialect == "sqlite":  # local runs and load tests
+        stmt = sqlite_insert(model).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={col: getattr(model, col) + stmt.excluded[col] for col in increments},
+        )
+    else:
+        raise NotImplementedError(f"upsert not supported on {dialect}")
+    db.execute(stmt)
+
+
+def record_session(db, user_email, query_title, location, found, inserted, duplicates, duration, scores):
+    """Add one finished scrape session to the per-query and per-title rollups."""
+    query_key = rollup_key(f"{query_title} | {location}")
+    upsert_increment(
+        db,
+        Daily_Query_Stats,
+        {"user_email": user_email, "day": date.today(), "query_key": query_key},
+        {
+            "sessions": 1,
+            "jobs_found": found,
+            "jobs_inserted": inserted,
+            "jobs_duplicates": duplicates,
+            "duration_seconds": duration or 0.0,
+        },
+    )
+
+    buckets = {}
+    for score in scores:
+        if score is not None:
+            bucket = min(max(int(score), 0), 100)
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+    title_key = rollup_key(query_title)
+    for bucket, count in buckets.items():
+        upsert_increment(
+            db,
+            Title_Score_Bucket,
+            {"user_email": user_email, "title_key": title_key, "bucket": bucket},
+            {"jobs": count},
+        )
+
+
+def record_sources(db, source_stats):
+    """Add per-source scrape outcomes ({"source", "ok", "found", "duration"} dicts)."""
+    for stat in source_stats:
+        upsert_increment(
+            db,
+            Daily_Source_Stats,
+            {"day": date.today(), "source": stat["source"]},
+            {
+                "runs": 1,
+                "failures": 0 if stat["ok"] else 1,
+                "jobs_found": stat["found"],
+                "duration_seconds": stat["duration"],
+            },
+        )
+
+
+def query_report(db, user_email, days):
+    since = date.today() - timedelta(days=days - 1)
+    rows = (
+        db.query(Daily_Query_Stats)
+        .filter(Daily_Query_Stats.user_email == user_email, Daily_Query_Stats.day >= since)
+        .order_by(Daily_Query_Stats.day.desc(), Daily_Query_Stats.query_key)
+        .all()
+    )
+    return [
+        {
+            "Day": str(r.day),
+            "Query": r.query_key,
+            "Sessions": r.sessions,
+            "JobsFound": r.jobs_found,
+            "JobsInserted": r.jobs_inserted,
+            "Duplicates": r.jobs_duplicates,
+            "AvgDurationSeconds": round(r.duration_seconds / r.sessions, 2) if r.sessions else None,
+        }
+        for r in rows
+    ]
+
+
+def source_report(db, days):
+    since = date.today() - timedelta(days=days - 1)
+    totals = {}
+    for r in db.query(Daily_Source_Stats).filter(Daily_Source_Stats.day >= since).all():
+        t = totals.setdefault(r.source, {"runs": 0, "failures": 0, "found": 0, "duration": 0.0})
+        t["runs"] += r.runs
+        t["failures"] += r.failures
+        t["found"] += r.jobs_found
+        t["duration"] += r.duration_seconds
+    return [
+        {
+            "Source": source,
+            "Runs": t["runs"],
+            "Failures": t["failures"],
+            "FailureRate": round(t["failures"] / t["runs"], 4) if t["runs"] else None,
+            "JobsFound": t["found"],
+            "AvgDurationSeconds": round(t["duration"] / t["runs"], 2) if t["runs"] else None,
+        }
+        for source, t in sorted(totals.items())
+    ]
+
+
+def title_report(db, user_email):
+    histograms = {}
+    for r in db.query(Title_Score_Bucket).filter(Title_Score_Bucket.user_email == user_email).all():
+        histograms.setdefault(r.title_key, {})[r.bucket] = r.jobs
+
+    report = []
+    for title, histogram in sorted(histograms.items()):
+        total = sum(histogram.values())
+        # Walk the <=101 buckets to the middle job
+        seen, median = 0, None
+        for bucket in sorted(histogram):
+            seen += histogram[bucket]
+            if seen * 2 >= total:
+                median = bucket
+                break
+        report.append({"Title": title, "ScoredJobs": total, "MedianScore": median})
+    return report
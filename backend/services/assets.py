@@ -0,0 +1,116 @@
+# backend/services/assets.py
+# Build step for the frontend. Every local file index.html references
+# (script.js, styles.css, the favicon) is copied to frontend/dist under a
+# content-hashed name with .gz/.br siblings, and a rewritten index.html
+# points at the hashed names. A hashed file never changes, so app.py serves
+# it with a one-year immutable Cache-Control; only the HTML shell
+# revalidates. Without a build, or with FLASK_ENV=development (docker-compose
+# bind-mounts ./frontend, so edits must show up without a rebuild), app.py
+# serves the source files.
+#
+# The Dockerfile runs it at image build time:  python -m backend.services.assets
+import os
+import re
+import sys
+import json
+import gzip
+import shutil
+import hashlib
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+FRONTEND_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "frontend"))
+DIST_DIR = os.path.join(FRONTEND_DIR, "dist")
+MANIFEST = "manifest.json"
+HASH_LENGTH = 12
+MIN_SAVING = 0.9  # keep a compressed copy only if it is at most 90% of the original
+
+_REF_RE = re.compile(r'\b(?P<attr>href|src)="(?P<path>[^"]+)"')
+
+
+def fingerprint(path, data):
+    base, ext = os.path.splitext(path)
+    return f"{base}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def _is_local(path, frontend_dir):
+    if path.startswith(("/", "#")) or ":" in path or "?" in path:
+        return False  # absolute, external (https:, data:), anchors, query strings
+    return os.path.isfile(os.path.join(frontend_dir, path))
+
+
+def _write(dist_dir, path, data):
+    # Write the file and whichever compressed copies pay off; returns their encodings
+    target = os.path.join(dist_dir, path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(data)
+
+    encodings = []
+    variants = [("gzip", ".gz", lambda d: gzip.compress(d, 9, mtime=0))]
+    if brotli is not None:
+        variants.insert(0, ("br", ".br", lambda d: brotli.compress(d, quality=11)))
+    for encoding, suffix, compress in variants:
+        packed = compress(data)
+        if len(packed) <= len(data) * MIN_SAVING:
+            with open(target + suffix, "wb") as f:
+                f.write(packed)
+            encodings.append(encoding)
+    return encodings
+
+
+def build(frontend_dir=FRONTEND_DIR, dist_dir=DIST_DIR):
+    """Fingerprint and precompress the assets into dist_dir. Returns the manifest."""
+    staging = dist_dir + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    hashed = {}  # source path -> hashed path
+    encodings = {}  # served path -> precompressed encodings, best first
+
+    def rewrite(m):
+        path = m["path"]
+        if not _is_local(path, frontend_dir):
+            return m.group(0)
+        if path not in hashed:
+            with open(os.path.join(frontend_dir, path), "rb") as f:
+                data = f.read()
+            hashed[path] = fingerprint(path, data)
+            encodings[hashed[path]] = _write(staging, hashed[path], data)
+        return f'{m["attr"]}="{hashed[path]}"'
+
+    with open(os.path.join(frontend_dir, "index.html"), encoding="utf-8") as f:
+        html = _REF_RE.sub(rewrite, f.read())
+    encodings["index.html"] = _write(staging, "index.html", html.encode("utf-8"))
+
+    manifest = {"assets": hashed, "encodings": encodings}
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    os.replace(staging, dist_dir)
+    return manifest
+
+
+def load_manifest(dist_dir=DIST_DIR):
+    """{served path: [encodings]} for a built dist_dir, or {} if there is no build."""
+    try:
+        with open(os.path.join(dist_dir, MANIFEST)) as f:
+            return json.load(f)["encodings"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def main():
+    manifest = build()
+    for source, target in manifest["assets"].items():
+        print(f"[Assets] {source} -> {target} ({', '.join(manifest['encodings'][target]) or 'uncompressed'})")
+    if brotli is None:
+        print("[Assets] brotli not installed; wrote gzip only")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
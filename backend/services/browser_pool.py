@@ -0,0 +1,212 @@
+# backend/services/browser_pool.py
+# Several scrapers sharing one Chrome, each in its own tab. With
+# TABS_PER_BROWSER > 1, BaseScraper gets a TabDriver instead of a browser
+# of its own: a stand-in for the WebDriver that switches the shared session
+# to its tab before every command, under the browser's lock. Scrapers spend
+# most of their time sleeping between scrolls and polling for elements, so
+# commands from several tabs interleave well; a page load holds the browser
+# only for its own duration.
+#
+# Each tab is opened in its own browser context (CDP
+# Target.createBrowserContext), so cookies and storage are per tab and one
+# scraper's delete_all_cookies can't log another out. Request blocking is
+# per target, so lean mode re-applies it to every tab. A browser is quit
+# once its last tab closes.
+import os
+import threading
+from selenium.webdriver.remote.webelement import WebElement
+from backend.services import utils
+
+TABS_PER_BROWSER = int(os.getenv("TABS_PER_BROWSER", "1"))  # 1 keeps one Chrome per scraper
+
+# Plain attributes the watchdog reads; no browser round trip, so no lock
+_PASSTHROUGH = frozenset({"service", "browser_pid", "session_id"})
+
+
+class SharedBrowser:
+    """One Chrome session and the lock that serializes its tabs."""
+
+    def __init__(self, pool, headless=False):
+        self.pool = pool
+        self.headless = headless
+        self.driver = None  # set by launch()
+        self.lock = threading.RLock()
+        self.current = None
+        self.tabs = 0  # open or being opened; maintained by BrowserPool
+        self.retired = False  # killed or broken: no new tabs
+        self.ready = threading.Event()  # set once launch() finished, whether or not it worked
+        self.error = None
+
+    def launch(self):
+        try:
+            self.driver = utils.create_driver(headless=self.headless)
+            self.current = self.driver.current_window_handle
+        except Exception as e:
+            self.error = e
+            self.retired = True
+            raise
+        finally:
+            self.ready.set()
+
+    def switch(self, handle):
+        if self.current != handle:
+            self.driver.switch_to.window(handle)
+            self.current = handle
+
+    def open_tab(self):
+        with self.lock:
+            context = None
+            try:
+                context = self.driver.execute_cdp_cmd(
+                    "Target.createBrowserContext", {"disposeOnDetach": False}
+                )["browserContextId"]
+                target = self.driver.execute_cdp_cmd(
+                    "Target.createTarget", {"url": "about:blank", "browserContextId": context}
+                )["targetId"]
+                # chromedriver names windows after their target id (older builds add a prefix)
+                handle = next(h for h in self.driver.window_handles if h.endswith(target))
+            except Exception as e:
+                print(f"[BrowserPool] Isolated tab unavailable, opening a plain tab: {e}")
+                self._dispose(context)
+                context = None
+                self.driver.switch_to.new_window("tab")
+                handle = self.driver.current_window_handle
+            self.current = None
+            self.switch(handle)
+            if utils.LEAN_BROWSER:
+                utils.block_resources(self.driver)
+            return TabDriver(self, handle, context)
+
+    def close_tab(self, tab):
+        with self.lock:
+            try:
+                self.switch(tab.handle)
+                self.driver.close()
+                self._dispose(tab.context)
+            except Exception as e:
+                print(f"[BrowserPool] Failed to close tab: {e}")
+                self.retired = True  # most likely killed by the watchdog
+            finally:
+                self.current = None  # the session now points at a closed window
+
+    def _dispose(self, context):
+        if context is None:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context})
+        except Exception:
+            pass
+
+
+class _TabProxy:
+    """Runs every attribute access and call on `target` with the tab selected."""
+
+    def __init__(self, target, tab):
+        self._target = target
+        self._tab = tab
+
+    def __getattr__(self, name):
+        # Properties such as .text and .current_url are remote calls too
+        value = self._tab.run(getattr, self._target, name)
+        if callable(value):
+            return lambda *args, **kwargs: self._tab.run(value, *args, **kwargs)
+        return value
+
+
+class TabDriver(_TabProxy):
+    """WebDriver stand-in bound to one tab of a SharedBrowser."""
+
+    def __init__(self, browser, handle, context):
+        super().__init__(browser.driver, self)
+        self.browser = browser
+        self.handle = handle
+        self.context = context
+
+    def __getattr__(self, name):
+        if name in _PASSTHROUGH:
+            return getattr(self.browser.driver, name)
+        return super().__getattr__(name)
+
+    def run(self, func, *args, **kwargs):
+        args = [a._target if isinstance(a, _TabProxy) else a for a in args]
+        with self.browser.lock:
+            self.browser.switch(self.handle)
+            return self._wrap(func(*args, **kwargs))
+
+    def _wrap(self, value):
+        # Elements belong to this tab's document, so they switch back to it too
+        if isinstance(value, WebElement):
+            return _TabProxy(value, self)
+        if isinstance(value, list) and value and isinstance(value[0], WebElement):
+            return [_TabProxy(v, self) for v in value]
+        return value
+
+    def quit(self):
+        self.browser.pool.close_tab(self)
+
+    close = quit
+
+
+class BrowserPool:
+    def __init__(self, tabs_per_browser=TABS_PER_BROWSER):
+        self.tabs_per_browser = tabs_per_browser
+        self._browsers = []
+        self._lock = threading.Lock()
+
+    def open_tab(self, headless=False):
+        with self._lock:
+            browser = next(
+                (
+                    b for b in self._browsers
+                    if not b.retired and b.headless == headless and b.tabs < self.tabs_per_browser
+                ),
+                None,
+            )
+            launch = browser is None
+            if launch:
+                browser = SharedBrowser(self, headless)
+                self._browsers.append(browser)
+            browser.tabs += 1  # reserve the slot before the (slower) launch and tab setup
+        try:
+            # Chrome starts outside the pool lock, so tabs on other browsers open and close meanwhile
+            if launch:
+                browser.launch()
+            else:
+                browser.ready.wait()
+                if browser.error is not None:
+                    raise RuntimeError(f"Shared browser failed to start: {browser.error}")
+            return browser.open_tab()
+        except Exception:
+            self._release(browser)
+            raise
+
+    def close_tab(self, tab):
+        tab.browser.close_tab(tab)
+        self._release(tab.browser)
+
+    def _release(self, browser):
+        with self._lock:
+            browser.tabs -= 1
+            if browser.tabs > 0:
+                return
+            self._browsers.remove(browser)
+        if browser.driver is None:
+            return  # never started
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+
+    def snapshot(self):
+        with self._lock:
+            return [{"tabs": b.tabs, "headless": b.headless, "retired": b.retired} for b in self._browsers]
+
+
+pool = BrowserPool()
+
+
+def new_driver(headless=False):
+    """A tab in a shared browser when TABS_PER_BROWSER > 1, else a browser of its own."""
+    if pool.tabs_per_browser > 1:
+        return pool.open_tab(headless)
+    return utils.create_driver(headless=headless)
@@ -0,0 +1,165 @@
+# backend/services/dedup.py
+# Near-duplicate detection across sources. The same posting often appears
+# on hiring.cafe and LinkedIn under different URLs, which uq_job_user_url
+# cannot catch. Each job is reduced to a MinHash signature over shingles of
+# its normalized title + company + location, and signatures are bucketed
+# with LSH so a lookup only compares against a handful of candidates.
+import os
+import re
+import time
+import zlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+BANDS = 20
+ROWS = 8  # LSH S-curve midpoint ~ (1/BANDS) ** (1/ROWS) = 0.69
+NUM_PERM = BANDS * ROWS
+SHINGLE_SIZE = 3
+DUPLICATE_THRESHOLD = 0.8  # estimated Jaccard similarity
+# Other processes (scrape worker, scheduler, sibling gunicorn workers) write jobs
+# without invalidating this process's indexes: the TTL bounds how stale they get
+USER_INDEX_TTL = int(os.getenv("USER_INDEX_TTL", "300"))  # seconds
+USER_INDEX_MAX_USERS = int(os.getenv("USER_INDEX_MAX_USERS", "256"))  # least recently used dropped first
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed so signatures are stable across processes and restarts
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "corp", "corporation", "co", "company", "plc", "gmbh"}
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_field(text, drop=()):
+    """Lower-case, strip punctuation (and any words in `drop`), collapse spaces."""
+    words = _NON_ALNUM_RE.sub(" ", (text or "").lower()).split()
+    return " ".join(w for w in words if w not in drop)
+
+
+def shingles(text, k=SHINGLE_SIZE, tag=""):
+    if len(text) <= k:
+        return {tag + text}
+    return {tag + text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def job_shingles(title, company, location):
+    """
+    Tagged shingles of each normalized field. Company shingles are counted
+    twice so two different employers posting the same title in the same
+    location stay well below the duplicate threshold.
+    """
+    company = normalize_field(company, _COMPANY_SUFFIXES)
+    return (
+        shingles(normalize_field(title), tag="t:")
+        | shingles(company, tag="c:")
+        | shingles(company, tag="C:")
+        | shingles(normalize_field(location), tag="l:")
+    )
+
+
+def minhash(shingle_set):
+    """Return a NUM_PERM-long MinHash signature for a set of string shingles."""
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingle_set),
+        dtype=np.uint64,
+        count=len(shingle_set),
+    )
+    # (a * h + b) mod p, truncated to 32 bits; a < 2^31 and h < 2^32 so nothing overflows
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return (permuted & _MAX_HASH).min(axis=1)
+
+
+def job_signature(job):
+    return minhash(job_shingles(job.JobTitle, job.Company, job.Location))
+
+
+class NearDuplicateIndex:
+    """LSH index of MinHash signatures keyed by job URL."""
+
+    def __init__(self, threshold=DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.signatures = {}
+        self.buckets = [dict() for _ in range(BANDS)]
+
+    def _band_keys(self, signature):
+        for band in range(BANDS):
+            yield band, signature[band * ROWS:(band + 1) * ROWS].tobytes()
+
+    def add(self, key, job):
+        if key in self.signatures:
+            return
+        signature = job_signature(job)
+        self.signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self.buckets[band].setdefault(band_key, []).append(key)
+
+    def find_duplicate(self, job):
+        """Return the key of the most similar indexed job above the threshold, or None."""
+        signature = job_signature(job)
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self.buckets[band].get(band_key, ()))
+
+        if not candidates:
+            return None
+
+        # Estimated Jaccard = fraction of matching signature slots
+        keys = list(candidates)
+        scores = (np.stack([self.signatures[k] for k in keys]) == signature).mean(axis=1)
+        best = int(scores.argmax())
+        return keys[best] if scores[best] >= self.threshold else None
+
+    def __len__(self):
+        return len(self.signatures)
+
+
+class UserIndexCache:
+    """
+    One NearDuplicateIndex per user, built lazily from the user's existing
+    jobs via `loader(user_email)` (JobRecords, or rows with the same
+    URL/JobTitle/Company/Location attributes) and kept warm for `ttl`
+    seconds. At most `max_users` indexes are held, least recently used
+    evicted first.
+    """
+
+    def __init__(self, ttl=USER_INDEX_TTL, max_users=USER_INDEX_MAX_USERS):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._indexes = OrderedDict()  # user_email -> (built_at, index), oldest use first
+        self._lock = threading.Lock()
+
+    def get(self, user_email, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._indexes.get(user_email)
+            if entry and now - entry[0] < self.ttl:
+                self._indexes.move_to_end(user_email)
+                return entry[1]
+
+        index = NearDuplicateIndex()
+        for job in loader(user_email):
+            index.add(job.URL, job)
+        with self._lock:
+            entry = self._indexes.get(user_email)
+            if entry and now < entry[0]:
+                index = entry[1]  # another thread rebuilt it meanwhile
+            else:
+                self._indexes[user_email] = (now, index)
+            self._indexes.move_to_end(user_email)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        return index
+
+    def invalidate(self, user_email=None):
+        with self._lock:
+            if user_email is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(user_email, None)
+
+
+user_indexes = UserIndexCache()
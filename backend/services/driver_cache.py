@@ -0,0 +1,120 @@
+# backend/services/driver_cache.py
+# Startup cache for Chrome drivers. undetected_chromedriver normally
+# downloads and re-patches chromedriver on every launch, and Chrome builds a
+# fresh user-data-dir each time. Here the patched binary is kept once per
+# Chrome major version, and a profile initialised once is copied into a
+# throwaway dir for each launch. The cache is shared by every process on
+# the host (gunicorn workers, the scheduler) behind a file lock.
+import os
+import re
+import time
+import fcntl
+import shutil
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from undetected_chromedriver.patcher import Patcher
+
+CHROME_PATH = "/usr/bin/google-chrome"
+DRIVER_CACHE = os.getenv("DRIVER_CACHE", "1") == "1"
+CACHE_DIR = os.getenv("DRIVER_CACHE_DIR", os.path.join(tempfile.gettempdir(), "jobscraper-chrome"))
+TEMPLATE_BUILD_TIMEOUT = 60  # seconds
+
+# Locks, crash dumps and caches that must not be shared between copies
+PROFILE_SKIP = shutil.ignore_patterns(
+    "Singleton*", "Crashpad", "*Cache", "GrShaderCache", "ShaderCache", "lockfile"
+)
+
+_chrome_major = None
+
+
+def chrome_major(browser_path=CHROME_PATH):
+    """Major version of the installed Chrome, e.g. 131. Read once per process."""
+    global _chrome_major
+    if _chrome_major is None:
+        output = subprocess.run(
+            [browser_path, "--version"], capture_output=True, text=True, timeout=15
+        ).stdout
+        match = re.search(r"(\d+)\.\d+\.\d+", output)
+        if not match:
+            raise RuntimeError(f"Unrecognised Chrome version output: {output!r}")
+        _chrome_major = int(match.group(1))
+    return _chrome_major
+
+
+@contextmanager
+def _cache_lock():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def patched_driver(version):
+    """Path to a patched chromedriver for this Chrome major version, built on first use."""
+    path = os.path.join(CACHE_DIR, f"chromedriver-{version}")
+    if os.path.exists(path):
+        return path
+    with _cache_lock():
+        if not os.path.exists(path):
+            start = time.perf_counter()
+            patcher = Patcher(version_main=version)
+            patcher.auto()
+            # Copy out of uc's data dir, which it unlinks on the next uncached launch
+            tmp = f"{path}.{os.getpid()}.tmp"
+            shutil.copy2(patcher.executable_path, tmp)
+            os.replace(tmp, path)
+            print(f"[DriverCache] Patched chromedriver {version} in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def profile_template(version, browser_path=CHROME_PATH):
+    """Path to a profile Chrome has already initialised, built on first use."""
+    path = os.path.join(CACHE_DIR, f"profile-{version}")
+    if os.path.isdir(path):
+        return path
+    with _cache_lock():
+        if not os.path.isdir(path):
+            start = time.perf_counter()
+            build_dir = tempfile.mkdtemp(dir=CACHE_DIR, prefix="profile-build-")
+            try:
+                # --dump-dom loads the page and exits, leaving a first-run profile behind
+                subprocess.run(
+                    [
+                        browser_path, "--headless=new", "--no-sandbox", "--disable-gpu",
+                        "--no-first-run", "--no-default-browser-check",
+                        f"--user-data-dir={build_dir}", "--dump-dom", "about:blank",
+                    ],
+                    capture_output=True,
+                    timeout=TEMPLATE_BUILD_TIMEOUT,
+                )
+                staged = f"{path}.{os.getpid()}.tmp"
+                shutil.copytree(build_dir, staged, ignore=PROFILE_SKIP)
+                os.replace(staged, path)
+            finally:
+                shutil.rmtree(build_dir, ignore_errors=True)
+            print(f"[DriverCache] Built profile template {version} in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def launch_profile(version):
+    """A private copy of the profile template for one driver. The driver removes it on quit."""
+    profile = tempfile.mkdtemp(prefix="jobscraper-profile-")
+    shutil.copytree(profile_template(version), profile, ignore=PROFILE_SKIP, dirs_exist_ok=True)
+    return profile
+
+
+def clear():
+    """Drop every cached driver and profile, so the next launch is a cold one."""
+    with _cache_lock():
+        for entry in os.listdir(CACHE_DIR):
+            if entry == ".lock":
+                continue
+            target = os.path.join(CACHE_DIR, entry)
+            if os.path.isdir(target):
+                shutil.rmtree(target, ignore_errors=True)
+            else:
+                os.remove(target)
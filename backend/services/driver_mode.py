@@ -0,0 +1,107 @@
+# backend/services/driver_mode.py
+# Headless or headful Chrome, and the numbers to choose between them.
+# Headful Chrome renders into the Xvfb display entrypoint.sh starts, which
+# costs CPU and memory on every scrape; headless skips that, but some boards
+# serve headless browsers a challenge page or nothing at all.
+#
+# DRIVER_MODE picks the strategy:
+#   headful         every scrape headful (the old behaviour)
+#   headless        every scrape headless; entrypoint.sh skips Xvfb
+#   headless_first  start headless; if the page looks like a challenge, or
+#                   the scrape times out or the board shows no cards at all,
+#                   run it again headful under Xvfb
+#
+# Each run, failed ones included, is recorded per source and mode (success,
+# seconds, driver CPU, and driver RSS sampled as the run ends) and shown on
+# /metrics.
+import os
+import threading
+from selenium.webdriver.common.by import By
+
+HEADFUL = "headful"
+HEADLESS = "headless"
+HEADLESS_FIRST = "headless_first"
+
+DRIVER_MODE = os.getenv("DRIVER_MODE", HEADFUL)
+if DRIVER_MODE not in (HEADFUL, HEADLESS, HEADLESS_FIRST):
+    print(f"[DriverMode] Unknown DRIVER_MODE {DRIVER_MODE!r}, using {HEADFUL}")
+    DRIVER_MODE = HEADFUL
+
+# Lower-cased page title/body fragments of bot checks (Cloudflare, LinkedIn's authwall, captchas)
+CHALLENGE_MARKERS = (
+    "just a moment",
+    "verify you are human",
+    "checking your browser",
+    "are you a robot",
+    "captcha",
+    "access denied",
+    "unusual activity",
+    "authwall",
+)
+CHALLENGE_SCAN_CHARS = 5000  # of body text; challenge pages are short
+
+
+def start_headless(mode=DRIVER_MODE):
+    """Whether a scrape's first driver should be headless."""
+    return mode != HEADFUL
+
+
+def can_fall_back(mode=DRIVER_MODE):
+    return mode == HEADLESS_FIRST
+
+
+def is_challenge_page(driver):
+    """True if the current page looks like a bot check rather than the board."""
+    try:
+        text = " ".join((
+            driver.title or "",
+            driver.current_url or "",
+            driver.find_element(By.TAG_NAME, "body").text[:CHALLENGE_SCAN_CHARS],
+        )).lower()
+    except Exception:
+        return False
+    return any(marker in text for marker in CHALLENGE_MARKERS)
+
+
+class ModeStats:
+    """Running totals per (source, mode) for /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def record(self, source, headless, ok, seconds, rss_bytes, cpu_seconds, fell_back=False):
+        mode = HEADLESS if headless else HEADFUL
+        with self._lock:
+            t = self._totals.setdefault((source, mode), {
+                "runs": 0, "ok": 0, "fallbacks": 0, "seconds": 0.0,
+                "max_end_rss_mb": 0.0, "end_rss_mb_total": 0.0, "cpu_seconds": 0.0,
+            })
+            t["runs"] += 1
+            t["ok"] += ok
+            t["fallbacks"] += fell_back
+            t["seconds"] += seconds
+            # One sample as the run ends, not a peak over the run
+            t["end_rss_mb_total"] += rss_bytes / 1e6
+            t["max_end_rss_mb"] = max(t["max_end_rss_mb"], rss_bytes / 1e6)
+            t["cpu_seconds"] += cpu_seconds
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {
+                    "source": source,
+                    "mode": mode,
+                    "runs": t["runs"],
+                    "success_rate": round(t["ok"] / t["runs"], 3),
+                    "fallbacks": t["fallbacks"],
+                    "avg_seconds": round(t["seconds"] / t["runs"], 2),
+                    "avg_end_rss_mb": round(t["end_rss_mb_total"] / t["runs"], 1),
+                    "max_end_rss_mb": round(t["max_end_rss_mb"], 1),
+                    "avg_cpu_seconds": round(t["cpu_seconds"] / t["runs"], 2),
+                }
+                for (source, mode), t in sorted(self._totals.items())
+            ]
+
+
+stats = ModeStats()
@@ -0,0 +1,214 @@
+# backend/services/driver_watchdog.py
+# Background watchdog for Chrome drivers. Every tracked scraper's
+# chromedriver + Chrome process tree is sampled for RSS, age and
+# responsiveness; a driver over budget (or hung, e.g. a renderer stuck
+# after a _wait_for_elements timeout) is killed and the scraper swaps in a
+# fresh one at its next navigation. Browsers this process launched
+# (utils.register_launch) that no tracked scraper owns any more, e.g. after
+# a crashed scrape skipped quit(), are reaped as well.
+import os
+import time
+import signal
+import threading
+from backend.services import utils, browser_pool
+
+WATCHDOG_INTERVAL = int(os.getenv("WATCHDOG_INTERVAL", "15"))  # seconds between sweeps
+MAX_DRIVER_RSS_MB = int(os.getenv("MAX_DRIVER_RSS_MB", "1500"))
+MAX_DRIVER_AGE = int(os.getenv("MAX_DRIVER_AGE", "900"))  # seconds
+PING_TIMEOUT = 45  # a page load can legitimately block the driver for a while
+PING_FAILURES_TO_KILL = 2
+ORPHAN_GRACE = 120  # seconds a launched, unowned browser may live before it is reaped
+
+
+class DriverWatchdog:
+    def __init__(self):
+        self._tracked = {}  # id(scraper) -> {"scraper", "started"}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pings = {}  # id(target) -> Ping; at most one outstanding per target
+        self._ping_failures = {}  # id(target) -> consecutive failed pings
+        self.killed = 0
+        self.reaped = 0
+
+    def register(self, scraper):
+        with self._lock:
+            self._tracked[id(scraper)] = {
+                "scraper": scraper,
+                "started": time.monotonic(),
+            }
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="driver-watchdog", daemon=True)
+                self._thread.start()
+
+    def unregister(self, scraper):
+        with self._lock:
+            self._tracked.pop(id(scraper), None)
+
+    def driver_replaced(self, scraper):
+        # Reset the budget clock for a scraper that just got a new driver; the
+        # new driver is a new ping target, so its failure count starts at 0
+        with self._lock:
+            entry = self._tracked.get(id(scraper))
+            if entry:
+                entry["started"] = time.monotonic()
+
+    def _run(self):
+        while True:
+            time.sleep(WATCHDOG_INTERVAL)
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"[Watchdog] Sweep failed: {e}")
+
+    def sweep(self):
+        with self._lock:
+            entries = list(self._tracked.values())
+
+        trees = [(entry, utils.process_tree_pids(*utils.driver_pids(entry["scraper"].driver))) for entry in entries]
+        owned = set().union(*(tree for _, tree in trees))
+
+        # Scrapers on tabs of one shared browser have the same tree: the RSS
+        # budget is the browser's, it is pinged once and killed at most once per sweep
+        failures = self._poll_pings([_ping_target(entry["scraper"].driver) for entry in entries])
+        killed = set()
+        for entry, tree in trees:
+            if tree & killed:
+                continue
+            scraper = entry["scraper"]
+            reason = self._check(entry, tree, failures.get(id(_ping_target(scraper.driver)), 0))
+            if reason:
+                print(f"[Watchdog] Killing driver of {type(scraper).__name__}: {reason}")
+                self._kill(tree)
+                killed |= tree
+                self.killed += 1
+
+        for entry, tree in trees:
+            if tree & killed:
+                driver = entry["scraper"].driver
+                if isinstance(driver, browser_pool.TabDriver):
+                    driver.browser.retired = True  # no new tabs on a dead browser
+                entry["scraper"].needs_new_driver = True
+
+        self.reap_orphans(owned)
+
+    def _poll_pings(self, targets):
+        """id(target) -> consecutive failed (or overdue) pings.
+        Never blocks: each target has one ping in flight, checked on the next sweep."""
+        now = time.monotonic()
+        live = set()
+        for target in targets:
+            key = id(target)
+            if key in live:
+                continue
+            live.add(key)
+            ping = self._pings.get(key)
+            if ping is None or ping.driver is not target:
+                self._pings[key] = Ping(target)
+                self._ping_failures[key] = 0
+            elif ping.ok is None:
+                # Still waiting; a hung one counts every sweep but is not restarted
+                if now - ping.started > PING_TIMEOUT:
+                    self._ping_failures[key] += 1
+            else:
+                self._ping_failures[key] = 0 if ping.ok else self._ping_failures[key] + 1
+                self._pings[key] = Ping(target)
+        for key in set(self._pings) - live:
+            del self._pings[key]  # untracked or replaced drivers
+            del self._ping_failures[key]
+        return dict(self._ping_failures)
+
+    def _check(self, entry, tree, ping_failures):
+        scraper = entry["scraper"]
+        if getattr(scraper, "needs_new_driver", False):
+            return None  # already killed, waiting for the scraper to replace it
+
+        rss_mb = sum(utils.process_rss(pid) for pid in tree) / 1e6
+        if rss_mb > MAX_DRIVER_RSS_MB:
+            return f"RSS {rss_mb:.0f} MB over {MAX_DRIVER_RSS_MB} MB"
+
+        age = time.monotonic() - entry["started"]
+        if age > MAX_DRIVER_AGE:
+            return f"age {age:.0f}s over {MAX_DRIVER_AGE}s"
+
+        if ping_failures >= PING_FAILURES_TO_KILL:
+            return f"no response to {ping_failures} pings"
+        return None
+
+    def _kill(self, pids):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+    def reap_orphans(self, owned=()):
+        """Kill browsers this process launched that no tracked scraper owns any more."""
+        now = time.time()
+        boot_time = _boot_time()
+        ticks_per_second = os.sysconf("SC_CLK_TCK")
+
+        for browser_pid, (start_ticks, chromedriver_pid) in utils.launched_browsers().items():
+            if utils.process_start_ticks(browser_pid) != start_ticks:
+                utils.forget_launch(browser_pid)  # exited (quit() or killed); the pid may be reused
+                continue
+            if browser_pid in owned:
+                continue
+            if now - (boot_time + start_ticks / ticks_per_second) < ORPHAN_GRACE:
+                continue  # may still be on its way to a scraper
+
+            print(f"[Watchdog] Reaping orphaned Chrome (pid {browser_pid})")
+            self._kill(utils.process_tree_pids(browser_pid, chromedriver_pid))
+            utils.forget_launch(browser_pid)
+            self.reaped += 1
+
+    def snapshot(self):
+        with self._lock:
+            entries = list(self._tracked.values())
+        return {
+            "tracked_drivers": len(entries),
+            "killed": self.killed,
+            "reaped": self.reaped,
+            "drivers": [
+                {
+                    "scraper": type(e["scraper"]).__name__,
+                    "age_seconds": round(time.monotonic() - e["started"], 1),
+                    "rss_mb": round(utils.process_tree_rss(*utils.driver_pids(e["scraper"].driver)) / 1e6, 1),
+                }
+                for e in entries
+            ],
+        }
+
+
+def _ping_target(driver):
+    # A TabDriver's commands take its browser's tab lock and switch tabs, so a
+    # slow load in one tab would stall every other tab's ping; ping the shared
+    # session itself instead (once per browser, whichever window is current)
+    # isinstance, not hasattr: Selenium's own WebDriver.browser (BiDi) raises on other sessions
+    return driver.browser.driver if isinstance(driver, browser_pool.TabDriver) else driver
+
+
+class Ping:
+    """A trivial script run on a daemon thread; ok is None until it answers."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.started = time.monotonic()
+        self.ok = None
+        threading.Thread(target=self._run, name="driver-ping", daemon=True).start()
+
+    def _run(self):
+        try:
+            self.ok = self.driver.execute_script("return 1") == 1
+        except Exception:
+            self.ok = False
+
+
+def _boot_time():
+    with open("/proc/stat") as f:
+        for line in f:
+            if line.startswith("btime"):
+                return int(line.split()[1])
+    return 0
+
+
+watchdog = DriverWatchdog()
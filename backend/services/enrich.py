@@ -0,0 +1,209 @@
+# backend/services/enrich.py
+# Enrichment stage run after run_scraper: fetches each job's detail page
+# (the 'viewjob' link) and fills in job.Description so scoring has more
+# than the short skills snippet to work with.
+import os
+import re
+import json
+import time
+import threading
+from collections import OrderedDict
+from html import unescape
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+from requests.adapters import HTTPAdapter
+from backend.services.utils import USER_AGENTS
+
+ENRICH_MAX_WORKERS = int(os.getenv("ENRICH_MAX_WORKERS", "8"))
+ENRICH_TIME_BUDGET = float(os.getenv("ENRICH_TIME_BUDGET", "20"))  # seconds, 0 disables
+ENRICH_REQUEST_TIMEOUT = float(os.getenv("ENRICH_REQUEST_TIMEOUT", "10"))
+ENRICH_CACHE_SIZE = int(os.getenv("ENRICH_CACHE_SIZE", "5000"))
+MAX_DESCRIPTION_CHARS = 20000
+
+_JSON_LD_RE = re.compile(
+    r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>', re.S | re.I
+)
+_NEXT_DATA_RE = re.compile(
+    r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S | re.I
+)
+_META_DESC_RE = re.compile(
+    r'<meta[^>]+(?:name|property)="(?:og:)?description"[^>]+content="([^"]*)"', re.I
+)
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style|noscript)[^>]*>.*?</\1>", re.S | re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+
+class DescriptionCache:
+    """Thread-safe LRU of URL -> description, shared by every request in the process."""
+
+    def __init__(self, max_size=ENRICH_CACHE_SIZE):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            if url not in self._data:
+                return None
+            self._data.move_to_end(url)
+            return self._data[url]
+
+    def set(self, url, description):
+        with self._lock:
+            self._data[url] = description
+            self._data.move_to_end(url)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+description_cache = DescriptionCache()
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    # One pooled HTTP session per process, sized to the worker count
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=ENRICH_MAX_WORKERS, pool_maxsize=ENRICH_MAX_WORKERS
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session.headers["User-Agent"] = USER_AGENTS[0].format(ver=140)
+        return _session
+
+
+def _clean_text(html_fragment):
+    text = _SCRIPT_STYLE_RE.sub(" ", html_fragment)
+    text = _TAG_RE.sub(" ", text)
+    return _WS_RE.sub(" ", unescape(text)).strip()
+
+
+def _find_key(obj, key):
+    # Depth-first search for the first non-empty string under `key`
+    if isinstance(obj, dict):
+        value = obj.get(key)
+        if isinstance(value, str) and value.strip():
+            return value
+        children = obj.values()
+    elif isinstance(obj, list):
+        children = obj
+    else:
+        return None
+    for child in children:
+        found = _find_key(child, key)
+        if found:
+            return found
+    return None
+
+
+def extract_description(html):
+    """Pull the posting text out of a detail page, best source first."""
+    # 1. schema.org JobPosting (LinkedIn public pages and most ATSs)
+    for block in _JSON_LD_RE.findall(html):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        found = _find_key(data, "description")
+        if found:
+            return _clean_text(found)
+
+    # 2. Next.js page state (hiring.cafe)
+    match = _NEXT_DATA_RE.search(html)
+    if match:
+        try:
+            found = _find_key(json.loads(match.group(1)), "description")
+        except ValueError:
+            found = None
+        if found:
+            return _clean_text(found)
+
+    # 3. Meta description, then the whole visible body
+    match = _META_DESC_RE.search(html)
+    if match and len(match.group(1)) > 200:
+        return _clean_text(match.group(1))
+    return _clean_text(html)
+
+
+def fetch_description(url):
+    """Fetch a single detail page and return its description (cached by URL)."""
+    cached = description_cache.get(url)
+    if cached is not None:
+        return cached
+
+    resp = _get_session().get(url, timeout=ENRICH_REQUEST_TIMEOUT)
+    resp.raise_for_status()
+    description = extract_description(resp.text)[:MAX_DESCRIPTION_CHARS]
+    description_cache.set(url, description)
+    return description
+
+
+def enrich_jobs(jobs, time_budget=ENRICH_TIME_BUDGET, max_workers=ENRICH_MAX_WORKERS):
+    """
+    Fill job.Description for each JobRecord, fetching detail pages concurrently.
+    Jobs still pending when the time budget runs out are left as they are;
+    a budget of 0 skips the stage entirely. Returns the same list.
+    """
+    if not jobs or time_budget <= 0:
+        return jobs
+
+    start = time.monotonic()
+    deadline = start + time_budget
+
+    # Group by URL so a posting seen twice in one scrape is fetched once
+    pending = {}
+    hits = 0
+    for job in jobs:
+        url = job.URL
+        if job.Description:
+            continue
+        cached = description_cache.get(url)
+        if cached is not None:
+            job.Description = cached
+            hits += 1
+            continue
+        pending.setdefault(url, []).append(job)
+
+    fetched = failed = 0
+    if pending:
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))))
+        futures = {executor.submit(fetch_description, url): url for url in pending}
+        not_done = set(futures)
+        try:
+            while not_done:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, not_done = wait(not_done, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = futures[future]
+                    try:
+                        description = future.result()
+                    except Exception as e:
+                        failed += 1
+                        print(f"[Enrich] Failed to fetch {url}: {e}")
+                        continue
+                    fetched += 1
+                    for job in pending[url]:
+                        job.Description = description
+        finally:
+            # Don't block the request on stragglers; they still land in the cache
+            for future in not_done:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    skipped = len(pending) - fetched - failed
+    print(
+        f"[Enrich] {hits} cached, {fetched} fetched, {failed} failed, "
+        f"{skipped} skipped in {time.monotonic() - start:.2f}s"
+    )
+    return jobs
@@ -0,0 +1,167 @@
+# backend/services/filters.py
+# Per-user job filter rules (company block/allow lists, title keywords and a
+# salary floor) compiled once into a JobFilter and cached per user. Scrapers
+# call the reject_* checks as soon as the fields are read from a card, so a job
+# the user never wants is dropped before any further WebDriver calls.
+import re
+import time
+import threading
+from collections import deque
+from backend.services.salary import parse_salary, annualize
+
+# Companies skipped for everyone, in addition to each user's own blocklist
+DEFAULT_BLOCKED_COMPANIES = {
+    "Jobs via Dice",
+    "Mindrift",
+    "DataAnnotation",
+    "CyberCoders",
+    "Twine",
+    "Talentrift",
+    "TALi Technologies",
+    "New York Technology Partners",
+}
+
+FILTER_CACHE_TTL = 300  # seconds, bounds staleness across gunicorn workers
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize(text):
+    return _WS_RE.sub(" ", (text or "").strip().lower())
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of lower-case keywords. A single
+    pass over the text finds whether any keyword occurs as a whole word.
+    """
+
+    def __init__(self, keywords):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [0]  # length of the longest keyword ending at each state
+
+        for keyword in {normalize(k) for k in keywords if k and k.strip()}:
+            state = 0
+            for ch in keyword:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(0)
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.out[state] = max(self.out[state], len(keyword))
+
+        # Breadth-first fail links
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] or self.out[self.fail[nxt]]
+
+    def __bool__(self):
+        return len(self.goto) > 1
+
+    def search(self, text):
+        """Return True if any keyword occurs in `text` on word boundaries."""
+        if len(self.goto) == 1:
+            return False
+        text = normalize(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+
+            # Walk the output chain; a shorter keyword may sit on word bounds
+            s = state
+            while s:
+                length = self.out[s]
+                if not length:
+                    break
+                start = i - length + 1
+                before_ok = start == 0 or not text[start - 1].isalnum()
+                after_ok = i + 1 == len(text) or not text[i + 1].isalnum()
+                if before_ok and after_ok:
+                    return True
+                s = self.fail[s]
+        return False
+
+
+class JobFilter:
+    """Compiled filter rules for one user."""
+
+    def __init__(
+        self,
+        blocked_companies=(),
+        allowed_companies=(),
+        blocked_keywords=(),
+        allowed_keywords=(),
+        salary_floor=None,
+    ):
+        self.blocked_companies = {normalize(c) for c in DEFAULT_BLOCKED_COMPANIES}
+        self.blocked_companies.update(normalize(c) for c in blocked_companies)
+        self.allowed_companies = {normalize(c) for c in allowed_companies}
+        self.blocked_keywords = KeywordMatcher(blocked_keywords)
+        self.allowed_keywords = KeywordMatcher(allowed_keywords)
+        self.salary_floor = salary_floor
+
+    def reject_listing(self, title, company):
+        """Title/company rules; an allowlisted company overrides the rest."""
+        company = normalize(company)
+        if company in self.allowed_companies:
+            return False
+        if company in self.blocked_companies:
+            return True
+        if self.blocked_keywords.search(title):
+            return True
+        return bool(self.allowed_keywords) and not self.allowed_keywords.search(title)
+
+    def reject_salary(self, salary_text):
+        # Missing or unparseable salaries are kept; only a stated range below the floor is dropped
+        if not self.salary_floor or not salary_text:
+            return False
+        parsed = parse_salary(salary_text)
+        if not parsed:
+            return False
+        return annualize(parsed["max"], parsed["period"]) < self.salary_floor
+
+    def reject(self, job):
+        """Check a fully extracted JobRecord against every rule."""
+        return self.reject_listing(job.JobTitle, job.Company) or self.reject_salary(job.Salary)
+
+
+DEFAULT_FILTER = JobFilter()
+
+
+class FilterCache:
+    """JobFilter per user, compiled from the DB on first use and refreshed after a TTL."""
+
+    def __init__(self, ttl=FILTER_CACHE_TTL):
+        self.ttl = ttl
+        self._filters = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_email, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._filters.get(user_email)
+        if entry and now - entry[0] < self.ttl:
+            return entry[1]
+
+        job_filter = loader(user_email)
+        with self._lock:
+            self._filters[user_email] = (now, job_filter)
+        return job_filter
+
+    def invalidate(self, user_email):
+        with self._lock:
+            self._filters.pop(user_email, None)
+
+
+filter_cache = FilterCache()
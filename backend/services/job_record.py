@@ -0,0 +1,43 @@
+# backend/services/job_record.py
+# The one shape a scraped job has on its way from a scraper to
+# insert_scraped_jobs. Scrapers used to build loose dicts with whatever keys
+# they had; a JobRecord is slotted (no per-instance __dict__), checks its
+# required fields when the scraper builds it rather than at insert, and
+# interns the strings that repeat across a scrape (location, company,
+# status, dates) so a batch holds one copy of each. Field names match the
+# Posting columns they end up in.
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+
+REQUIRED = ("JobTitle", "Company", "Location", "URL")
+MISSING = ("", "N/A")  # what scrapers fall back to when an element isn't on the card
+INTERNED = ("Company", "Location", "Status", "DateFound", "DatePosted")
+
+
+def _today():
+    return date.today().isoformat()
+
+
+@dataclass(slots=True)
+class JobRecord:
+    JobTitle: str
+    Company: str
+    Location: str
+    URL: str
+    Salary: str | None = None
+    Skills: str | None = None  # skills line from the card, where the source shows one
+    DatePosted: str | None = None  # ISO date from the listing, where the source shows one
+    Description: str | None = None  # filled in by enrich_jobs
+    Status: str = "New"
+    DateFound: str = field(default_factory=_today)
+
+    def __post_init__(self):
+        for name in REQUIRED:
+            value = getattr(self, name)
+            if not isinstance(value, str) or value.strip() in MISSING:
+                raise ValueError(f"JobRecord.{name} is missing (got {value!r})")
+        for name in INTERNED:
+            value = getattr(self, name)
+            if value is not None:
+                setattr(self, name, sys.intern(value))
@@ -0,0 +1,353 @@
+# backend/services/pipeline.py
+# Scrape-to-database pipeline shared by the web request path (app.py), the
+# scheduler and the scrape worker: run the scrapers, score and dedup the
+# jobs, upsert the shared postings, insert the user's rows and keep the
+# scrape session's counters current. Nothing here depends on Flask.
+import os
+import time
+from datetime import datetime
+from contextlib import closing
+from sqlalchemy import insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from backend.db.db_config import SessionLocal
+from backend.db.models import (
+    Job_Query,
+    Scrape_Session,
+    Job,
+    Posting,
+    ScrapeStatus,
+    JobStatus,
+    User,
+    Filter_Rule,
+    FilterRuleType,
+)
+from backend.services.scrape import stream_scraper, SCRAPE_DEADLINE, SCRAPE_DEADLINE_GRACE
+from backend.services.enrich import enrich_jobs, ENRICH_TIME_BUDGET
+from backend.services.dedup import user_indexes
+from backend.services.filters import JobFilter, filter_cache
+from backend.services.utils import canonical_url
+from backend.services.salary import normalize_salary
+from backend.services.scoring import resume_parse, calculate_job_score
+from backend.services import analytics, retention
+
+# Pass the user's known URLs to the scrapers: LinkedIn (sorted newest first) stops scrolling
+# after a run of known postings; Hiring Cafe has no date order, so it only skips known cards
+INCREMENTAL_SCRAPE = os.getenv("INCREMENTAL_SCRAPE", "1") == "1"
+
+
+def stream_scrape_for_user(db, query, user_email, scrape_params, session_entry, checkpoint=None,
+                           deadline=SCRAPE_DEADLINE):
+    # Scrape, score and insert jobs in small committed batches as the scrapers yield them,
+    # keeping the session's counters current so partial progress survives a crash.
+    # checkpoint(), if given, runs before every commit and may raise to abandon the scrape.
+    # deadline (seconds from now, 0 for none) bounds the scrape and the enrichment; after
+    # it only the abandon grace and the last batch's insert remain.
+    started = time.monotonic()
+    ends_at = started + deadline + SCRAPE_DEADLINE_GRACE if deadline else None
+    parsed_resume = get_user_parsed_resume(db, user_email)
+    job_filter = get_user_filter(db, user_email)
+    known_urls = load_known_urls(db, user_email) if INCREMENTAL_SCRAPE else None
+    db.commit()  # don't hold a transaction open while the browsers start
+
+    found = inserted = duplicates = 0
+    scores = []
+    enrich_spent = 0.0
+    source_stats = []
+    batches = stream_scraper(
+        **scrape_params, job_filter=job_filter, known_urls=known_urls, source_stats=source_stats,
+        deadline=max(1.0, deadline - (time.monotonic() - started)) if deadline else 0,
+    )
+    try:
+        with closing(batches):  # stops the browsers right away if a batch fails
+            for batch in batches:
+                if parsed_resume is not None: # descriptions only feed the score
+                    enrich_started = time.monotonic()
+                    budget = ENRICH_TIME_BUDGET - enrich_spent
+                    if ends_at is not None:
+                        budget = min(budget, ends_at - enrich_started)
+                    enrich_jobs(batch, time_budget=max(0.0, budget))
+                    enrich_spent += time.monotonic() - enrich_started
+
+                counts = insert_scraped_jobs(
+                    db, batch, session_entry.scrape_session_id, user_email, parsed_resume
+                )
+                update_scrape_progress(
+                    session_entry, found + len(batch), inserted + counts["inserted"],
+                    duplicates + counts["duplicates"], time.monotonic() - started,
+                )
+                if checkpoint:
+                    checkpoint()
+                db.commit()
+
+                found += len(batch)
+                inserted += counts["inserted"]
+                duplicates += counts["duplicates"]
+                scores.extend(counts["scores"])
+    finally:
+        record_source_stats(source_stats)
+
+    duration = time.monotonic() - started
+    finalize_scrape_session(
+        db, session_entry, ScrapeStatus.Complete, found,
+        inserted=inserted, duplicates=duplicates, duration=duration,
+    )
+    analytics.record_session(
+        db, user_email, query.job_title, query.location,
+        found=found, inserted=inserted, duplicates=duplicates, duration=duration, scores=scores,
+    )
+    if checkpoint:
+        checkpoint()
+    db.commit()
+    return session_entry
+
+def get_user_parsed_resume(db, email):
+    # Retrieve and parse the user's resume file.
+    user = db.query(User).filter_by(email=email).first()
+
+    if not user or not user.resume_path: 
+        return None
+    
+    try:
+        return resume_parse(user.resume_path, user.resume_name)
+    except Exception as e:
+        print(f"Error parsing resume for {email}: {e}")
+        return None
+
+def get_user_filter(db, email):
+    # Compiled filter rules for the user, cached across requests
+    return filter_cache.get(email, lambda e: load_user_filter(db, e))
+
+def load_user_filter(db, email):
+    rules = db.query(Filter_Rule).filter(Filter_Rule.user_email == email).all()
+    values = {rule_type: [] for rule_type in FilterRuleType}
+    for rule in rules:
+        values[rule.rule_type].append(rule.value)
+
+    floors = [float(v) for v in values[FilterRuleType.SalaryFloor] if v.replace(".", "", 1).isdigit()]
+    return JobFilter(
+        blocked_companies=values[FilterRuleType.BlockCompany],
+        allowed_companies=values[FilterRuleType.AllowCompany],
+        blocked_keywords=values[FilterRuleType.BlockKeyword],
+        allowed_keywords=values[FilterRuleType.AllowKeyword],
+        salary_floor=max(floors) if floors else None,
+    )
+
+def create_job_query(db, data):
+    # Create and store a Job_Query entry.
+    query = Job_Query(
+        date_posted=data.get("datePosted"),
+        experience_level=data.get("experienceLevel"),
+        job_title=data.get("jobTitle"),
+        location=data.get("location"),
+    )
+    db.add(query)
+    return query
+
+def create_scrape_session(db, query_id, keywords, email, status=ScrapeStatus.Running):
+    # Start a new scrape session entry.
+    session_entry = Scrape_Session(
+        query_id=query_id,
+        keywords=keywords,
+        timestamp=datetime.now(),
+        status=status,
+        log="Scrape queued." if status == ScrapeStatus.Pending else "Scrape started.",
+        user_email=email,
+    )
+    db.add(session_entry) 
+    return session_entry
+
+def store_scrape_for_user(db, query, user_email, scraped_jobs, parsed_resume, duration=None):
+    # Record a scrape session for the user and insert an already-scraped job list (caller commits)
+    session_entry = create_scrape_session(db, query.query_id, query.job_title, user_email)
+    db.flush()
+
+    counts = insert_scraped_jobs(
+        db, scraped_jobs, session_entry.scrape_session_id, user_email, parsed_resume
+    )
+
+    finalize_scrape_session(
+        db, session_entry, ScrapeStatus.Complete, len(scraped_jobs),
+        inserted=counts["inserted"], duplicates=counts["duplicates"], duration=duration,
+    )
+    analytics.record_session(
+        db, user_email, query.job_title, query.location,
+        found=len(scraped_jobs), inserted=counts["inserted"], duplicates=counts["duplicates"],
+        duration=duration, scores=counts["scores"],
+    )
+    return session_entry
+
+def record_source_stats(source_stats):
+    # Own transaction, so source failures are counted even if the request later fails
+    db = SessionLocal()
+    try:
+        analytics.record_sources(db, source_stats)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print("Error recording source stats:", e)
+    finally:
+        db.close()
+
+def extract_scrape_params(data):
+    # Extract scraper parameters from request data.
+    return {
+        "date_posted": data.get("datePosted"),
+        "experience_level": data.get("experienceLevel"),
+        "job_title": data.get("jobTitle"),
+        "location": data.get("location"),
+    }
+
+def insert_scraped_jobs(db, scraped_jobs, session_id, user_email, parsed_resume):
+    # Insert the scraped jobs for the user with calculated job scores. The posting itself is
+    # stored once in the shared postings table; the user's row only points at it.
+    # Returns {"inserted", "duplicates", "scores"} for the session counters.
+    
+    has_resume = parsed_resume is not None
+    inserted = duplicates = 0
+    scores = []
+    dedup_index = user_indexes.get(user_email, lambda email: load_user_jobs_for_dedup(db, email))
+
+    postings = upsert_postings(db, scraped_jobs)
+    owned = {
+        posting_id for (posting_id,) in (
+            db.query(Job.posting_id)
+            .filter(
+                Job.user_email == user_email,
+                Job.posting_id.in_([p.posting_id for p in postings.values()]),
+            )
+            .all()
+        )
+    }
+    # Jobs retention already archived for this user count as duplicates too
+    retired = retention.tombstoned(db, user_email, postings)
+
+    rows = []
+    date_found = datetime.now().date()
+    for job in scraped_jobs:
+        posting = postings[job.URL]
+
+        # Skip duplicates
+        if posting.posting_id in owned or job.URL in retired:
+            duplicates += 1
+            continue
+
+        # Skip near-duplicates of a job the user already has under another URL
+        duplicate_url = dedup_index.find_duplicate(job)
+        if duplicate_url:
+            print(f"Near-duplicate: {job.JobTitle} at {job.Company} ~ {duplicate_url}")
+            duplicates += 1
+            continue
+        dedup_index.add(job.URL, job)
+        owned.add(posting.posting_id)
+
+        # Compute resume-based score
+        if has_resume:
+            job_score = calculate_job_score(parsed_resume, job)
+        else:
+            job_score = None
+
+        rows.append({
+            "posting_id": posting.posting_id,
+            "Status": JobStatus.New,
+            "DateFound": date_found,
+            "scrape_session_id": session_id,
+            "user_email": user_email,
+            "job_score": job_score,
+        })
+        inserted += 1
+        scores.append(job_score)
+
+    if rows:
+        db.execute(insert(Job), rows)  # one multi-row INSERT per batch, not one per job
+
+    return {"inserted": inserted, "duplicates": duplicates, "scores": scores}
+
+def upsert_postings(db, scraped_jobs):
+    # URL -> Posting for every scraped job: one lookup for the batch, then create
+    # the missing postings and refresh the ones whose scraped fields changed
+    scraped = {}
+    for job in scraped_jobs:
+        fields = {
+            "JobTitle": job.JobTitle,
+            "Company": job.Company,
+            "Location": job.Location,
+            "Salary": job.Salary,
+            **normalize_salary(job.Salary),
+        }
+        if job.Skills:  # not every source has them; keep what's stored
+            fields["Skills"] = job.Skills[:500]
+        scraped[job.URL] = fields
+
+    postings = {p.URL: p for p in db.query(Posting).filter(Posting.URL.in_(scraped)).all()} if scraped else {}
+
+    missing = [url for url in scraped if url not in postings]
+    if missing:
+        # Another user's scrape may insert the same URL concurrently; its row wins
+        _insert_new_postings(db, [{"URL": url, "Skills": None, **scraped[url]} for url in missing])
+        # Locking read: on MySQL a plain SELECT would use the transaction's REPEATABLE READ
+        # snapshot and miss a row another transaction committed after it started
+        for posting in (
+            db.query(Posting).filter(Posting.URL.in_(missing)).with_for_update().populate_existing().all()
+        ):
+            postings[posting.URL] = posting
+
+    for url, fields in scraped.items():
+        posting = postings[url]
+        for key, value in fields.items():
+            if getattr(posting, key) != value:
+                setattr(posting, key, value)
+    return postings
+
+def _insert_new_postings(db, rows):
+    # INSERT that leaves an existing URL alone (a no-op update, so MySQL doesn't downgrade other errors the way IGNORE does)
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(Posting)
+        stmt = stmt.on_duplicate_key_update(URL=stmt.inserted.URL)
+    elif dialect == "sqlite":  # local runs and load tests
+        stmt = sqlite_insert(Posting).on_conflict_do_nothing(index_elements=["URL"])
+    else:
+        raise NotImplementedError(f"insert-ignore not supported on {dialect}")
+    db.execute(stmt, rows)
+
+def load_known_urls(db, user_email):
+    # Canonical URLs of every job the user already has, for incremental scraping
+    rows = db.query(Posting.URL).join(Job.posting).filter(Job.user_email == user_email).all()
+    return {canonical_url(url) for (url,) in rows if url}
+
+def load_user_jobs_for_dedup(db, user_email):
+    # Only the columns the near-duplicate index shingles on; rows read like JobRecords
+    return (
+        db.query(Posting.URL, Posting.JobTitle, Posting.Company, Posting.Location)
+        .join(Job.posting)
+        .filter(Job.user_email == user_email)
+        .all()
+    )
+
+def finalize_scrape_session(db, session_entry, status, total, inserted=0, duplicates=0, duration=None):
+    # Finalize the scrape session with status and job counts.
+    session_entry.status = status
+    session_entry.log = f"Scrape completed. Found {total} job listings."
+    session_entry.jobs_found = total
+    session_entry.jobs_inserted = inserted
+    session_entry.jobs_duplicates = duplicates
+    session_entry.duration_seconds = duration
+
+def update_scrape_progress(session_entry, found, inserted, duplicates, duration):
+    # Running counters, committed with each batch
+    session_entry.log = f"Scraping. Found {found} job listings so far."
+    session_entry.jobs_found = found
+    session_entry.jobs_inserted = inserted
+    session_entry.jobs_duplicates = duplicates
+    session_entry.duration_seconds = duration
+
+def fail_scrape_session(db, session_entry, error):
+    # Close out a failed session; batches committed before the failure are kept
+    try:
+        session_entry.status = ScrapeStatus.Failed
+        session_entry.log = f"Scrape failed after {session_entry.jobs_found} job listings: {error}"[:1000]
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print("Error marking scrape session failed:", e)
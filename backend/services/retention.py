@@ -0,0 +1,242 @@
+# backend/services/retention.py
+# Keeps the jobs table down to the working set. Ignored jobs and New jobs
+# nobody acted on are moved to jobs_archive (or deleted, RETENTION_MODE=purge)
+# once they pass a configurable age, RETENTION_BATCH_SIZE rows per
+# transaction so locks stay short. Applied jobs are never touched. Every
+# removed job leaves a seen_urls tombstone so the next scrape doesn't
+# insert it again as new; tombstones and archived rows expire in turn.
+#
+# The scheduler runs a pass every RETENTION_INTERVAL_HOURS. By hand:
+#   python -m backend.services.retention [--dry-run]
+import os
+import sys
+import hashlib
+import argparse
+from datetime import date, timedelta
+from sqlalchemy import and_, or_, text, delete, exists, select, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from backend.db.db_config import SessionLocal
+from backend.db.models import Job, Job_Archive, JobStatus, Posting, Seen_Url
+from backend.services.utils import canonical_url
+
+IGNORED_DAYS = int(os.getenv("RETENTION_IGNORED_DAYS", "30"))
+NEW_DAYS = int(os.getenv("RETENTION_NEW_DAYS", "90"))
+TOMBSTONE_DAYS = int(os.getenv("RETENTION_TOMBSTONE_DAYS", "180"))  # past this, postings are long delisted
+ARCHIVE_DAYS = int(os.getenv("RETENTION_ARCHIVE_DAYS", "0"))  # 0 keeps archived jobs forever
+RETENTION_MODE = os.getenv("RETENTION_MODE", "archive")  # "archive" or "purge"
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+RETENTION_INTERVAL_HOURS = float(os.getenv("RETENTION_INTERVAL_HOURS", "24"))
+PARTITION_MONTHS_AHEAD = 2
+
+
+def url_hash(url):
+    """Signed 64-bit hash of the canonical URL, as stored in seen_urls."""
+    digest = hashlib.blake2b(canonical_url(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def tombstoned(db, user_email, urls):
+    """The subset of `urls` retention has already removed for this user."""
+    hashes = {url_hash(url): url for url in urls}
+    if not hashes:
+        return set()
+    rows = (
+        db.query(Seen_Url.url_hash)
+        .filter(Seen_Url.user_email == user_email, Seen_Url.url_hash.in_(list(hashes)))
+        .all()
+    )
+    return {hashes[h] for (h,) in rows}
+
+
+def _insert_ignore(db, model, rows):
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(model).prefix_with("IGNORE")
+    elif dialect == "sqlite":  # local runs and load tests
+        stmt = sqlite_insert(model).on_conflict_do_nothing()
+    else:
+        raise NotImplementedError(f"insert-ignore not supported on {dialect}")
+    db.execute(stmt, rows)
+
+
+def expired_jobs(today):
+    return or_(
+        and_(Job.Status == JobStatus.Ignored, Job.DateFound < today - timedelta(days=IGNORED_DAYS)),
+        and_(Job.Status == JobStatus.New, Job.DateFound < today - timedelta(days=NEW_DAYS)),
+    )
+
+
+def retire_batch(db, today, archive=True, limit=RETENTION_BATCH_SIZE):
+    """Tombstone, archive and delete up to `limit` expired jobs in one transaction. Returns the count."""
+    rows = (
+        db.query(Job.job_id, Job.user_email, Posting.URL)
+        .join(Job.posting)
+        .filter(expired_jobs(today))
+        .limit(limit)
+        .all()
+    )
+    if not rows:
+        return 0
+    job_ids = [job_id for job_id, _, _ in rows]
+
+    expires_on = today + timedelta(days=TOMBSTONE_DAYS)
+    _insert_ignore(db, Seen_Url, [
+        {"user_email": user_email, "url_hash": url_hash(url), "expires_on": expires_on}
+        for _, user_email, url in rows if user_email
+    ])
+    if archive:
+        columns = ["job_id", "DateFound", "posting_id", "scrape_session_id", "user_email", "Status", "job_score"]
+        db.execute(
+            Job_Archive.__table__.insert().from_select(
+                columns,
+                select(*(Job.__table__.c[c] for c in columns)).where(Job.__table__.c.job_id.in_(job_ids)),
+            )
+        )
+    db.execute(delete(Job).where(Job.job_id.in_(job_ids)))
+    db.commit()
+    return len(rows)
+
+
+def purge_orphan_postings(db, limit=RETENTION_BATCH_SIZE):
+    """Delete postings no user's current or archived job points at, in batches."""
+    total = 0
+    while True:
+        ids = [
+            posting_id for (posting_id,) in (
+                db.query(Posting.posting_id)
+                .filter(
+                    ~exists().where(Job.posting_id == Posting.posting_id),
+                    ~exists().where(Job_Archive.posting_id == Posting.posting_id),
+                )
+                .limit(limit)
+                .all()
+            )
+        ]
+        if not ids:
+            return total
+        db.execute(delete(Posting).where(Posting.posting_id.in_(ids)))
+        db.commit()
+        total += len(ids)
+
+
+def _delete_batched(db, model, key, condition, limit=RETENTION_BATCH_SIZE):
+    # Select a batch of keys, then delete by key; SQLite has no DELETE ... LIMIT
+    total = 0
+    while True:
+        keys = db.query(*key).filter(condition).limit(limit).all()
+        if not keys:
+            return total
+        db.execute(delete(model).where(tuple_(*key).in_([tuple(k) for k in keys])))
+        db.commit()
+        total += len(keys)
+
+
+def expire_tombstones(db, today):
+    return _delete_batched(db, Seen_Url, (Seen_Url.user_email, Seen_Url.url_hash), Seen_Url.expires_on < today)
+
+
+# ----- jobs_archive partitions (MySQL) -----
+# jobs itself can't be partitioned: MySQL doesn't allow foreign keys on
+# partitioned tables, and uq_job_user_posting would have to include DateFound.
+# The archive, which is where history piles up, has neither constraint.
+
+def archive_partitions(db):
+    """{partition name: TO_DAYS upper bound} for jobs_archive, empty if not partitioned."""
+    if db.get_bind().dialect.name != "mysql":
+        return {}
+    rows = db.execute(text(
+        "SELECT partition_name, partition_description FROM information_schema.partitions "
+        "WHERE table_schema = DATABASE() AND table_name = 'jobs_archive' AND partition_name IS NOT NULL"
+    )).all()
+    return {name: (None if bound == "MAXVALUE" else int(bound)) for name, bound in rows}
+
+
+def _month_start(day, months=0):
+    month = day.year * 12 + day.month - 1 + months
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def ensure_archive_partitions(db, today):
+    """Split monthly partitions off pmax for the coming months. Returns the names added."""
+    partitions = archive_partitions(db)
+    if "pmax" not in partitions:
+        return []
+    added = []
+    for ahead in range(PARTITION_MONTHS_AHEAD + 1):
+        start = _month_start(today, ahead)
+        name = f"p{start:%Y%m}"
+        if name in partitions:
+            continue
+        upper = _month_start(today, ahead + 1)
+        (bound,) = db.execute(text("SELECT TO_DAYS(:d)"), {"d": upper}).one()
+        if any(b is not None and b >= bound for b in partitions.values()):
+            continue  # already covered by a wider partition (p_history)
+        db.execute(text(
+            "ALTER TABLE jobs_archive REORGANIZE PARTITION pmax INTO ("
+            f"PARTITION {name} VALUES LESS THAN ({bound}), PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        ))
+        partitions[name] = bound
+        added.append(name)
+    return added
+
+
+def expire_archive(db, today):
+    """Drop archived jobs older than ARCHIVE_DAYS: whole partitions where possible, else in batches."""
+    if ARCHIVE_DAYS <= 0:
+        return 0
+    cutoff = today - timedelta(days=ARCHIVE_DAYS)
+    partitions = archive_partitions(db)
+    if partitions:
+        (cutoff_days,) = db.execute(text("SELECT TO_DAYS(:d)"), {"d": cutoff}).one()
+        # Partitions wholly before the cutoff go in one metadata operation
+        old = [name for name, bound in partitions.items() if bound is not None and bound <= cutoff_days]
+        if old:
+            db.execute(text(f"ALTER TABLE jobs_archive DROP PARTITION {', '.join(old)}"))
+        # The partition straddling the cutoff (or an unpartitioned table) goes in batches
+    return _delete_batched(
+        db, Job_Archive, (Job_Archive.job_id, Job_Archive.DateFound), Job_Archive.DateFound < cutoff,
+    )
+
+
+def run_once(today=None, dry_run=False):
+    """One full retention pass. Returns the counts for logging."""
+    today = today or date.today()
+    archive = RETENTION_MODE != "purge"
+    db = SessionLocal()
+    try:
+        if dry_run:
+            return {"expired": db.query(Job.job_id).filter(expired_jobs(today)).count()}
+
+        stats = {"retired": 0}
+        while True:
+            n = retire_batch(db, today, archive=archive)
+            stats["retired"] += n
+            if n < RETENTION_BATCH_SIZE:
+                break
+        stats["tombstones_expired"] = expire_tombstones(db, today)
+        stats["partitions_added"] = len(ensure_archive_partitions(db, today))
+        stats["archive_expired"] = expire_archive(db, today)
+        stats["postings_purged"] = purge_orphan_postings(db)
+        if stats["retired"]:
+            # Retired jobs should stop counting as near-duplicates in this process
+            from backend.services.dedup import user_indexes
+            user_indexes.invalidate()
+        return stats
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive or purge old Ignored/New jobs.")
+    parser.add_argument("--dry-run", action="store_true", help="only count the jobs a pass would retire")
+    args = parser.parse_args(argv)
+    stats = run_once(dry_run=args.dry_run)
+    print(f"[Retention] {stats}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
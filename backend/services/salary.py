@@ -0,0 +1,91 @@
+# backend/services/salary.py
+# Parses the free-text salary spans scrapers pick up ("$120k-$150k/yr",
+# "$45/hr", "$90,000 - $110,000 a year") into numbers.
+import re
+
+HOURS_PER_YEAR = 2080
+
+PERIOD_MULTIPLIERS = {
+    "hour": HOURS_PER_YEAR,
+    "week": 52,
+    "month": 12,
+    "year": 1,
+}
+
+_PERIOD_PATTERNS = [
+    ("hour", re.compile(r"/\s*h(?:ou)?r|\bhour(?:ly)?\b|\ban? hour\b", re.I)),
+    ("week", re.compile(r"/\s*w(?:ee)?k|\bweek(?:ly)?\b", re.I)),
+    ("month", re.compile(r"/\s*mo(?:nth)?|\bmonth(?:ly)?\b", re.I)),
+    ("year", re.compile(r"/\s*y(?:ea)?r|\byear(?:ly)?\b|\bannual(?:ly)?\b|\ba year\b", re.I)),
+]
+
+_CURRENCIES = [
+    ("CAD", re.compile(r"CA\$|C\$|\bCAD\b")),
+    ("AUD", re.compile(r"A\$|\bAUD\b")),
+    ("GBP", re.compile(r"£|\bGBP\b")),
+    ("EUR", re.compile(r"€|\bEUR\b")),
+    ("USD", re.compile(r"\$|\bUSD\b")),
+]
+
+_AMOUNT_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kKmM])?")
+
+
+def parse_salary(text):
+    """
+    Return {"min", "max", "period", "currency"} with amounts as stated, or None
+    if no amount is found. Period defaults to "year" for amounts over 1,000
+    and to "hour" below that.
+    """
+    if not text:
+        return None
+
+    amounts = []
+    for number, suffix in _AMOUNT_RE.findall(text):
+        try:
+            value = float(number.replace(",", ""))
+        except ValueError:
+            continue
+        if suffix in ("k", "K"):
+            value *= 1_000
+        elif suffix in ("m", "M"):
+            value *= 1_000_000
+        amounts.append(value)
+        if len(amounts) == 2:
+            break
+
+    if not amounts:
+        return None
+
+    period = next((name for name, pattern in _PERIOD_PATTERNS if pattern.search(text)), None)
+    if period is None:
+        period = "year" if amounts[0] >= 1_000 else "hour"
+
+    currency = next((code for code, pattern in _CURRENCIES if pattern.search(text)), None)
+
+    low, high = amounts[0], amounts[-1]
+    if high < low:
+        low, high = high, low
+    return {"min": low, "max": high, "period": period, "currency": currency}
+
+
+def annualize(amount, period):
+    """Convert an amount for `period` into a yearly figure."""
+    if amount is None:
+        return None
+    return amount * PERIOD_MULTIPLIERS.get(period, 1)
+
+
+def normalize_salary(text):
+    """
+    Column values for a salary string: yearly min/max plus the stated period
+    and currency. Every value is None when the text has no amount.
+    """
+    parsed = parse_salary(text)
+    if not parsed:
+        return {"salary_min": None, "salary_max": None, "salary_period": None, "salary_currency": None}
+    return {
+        "salary_min": round(annualize(parsed["min"], parsed["period"]), 2),
+        "salary_max": round(annualize(parsed["max"], parsed["period"]), 2),
+        "salary_period": parsed["period"],
+        "salary_currency": parsed["currency"],
+    }
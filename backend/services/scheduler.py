@@ -0,0 +1,193 @@
+# backend/services/scheduler.py
+# Runs saved searches on their schedule. Due searches with the same
+# normalized query are coalesced across users into a single scrape, and the
+# results fan out to every subscriber's jobs. Start times get random jitter
+# and at most MAX_BROWSERS scrapes run at once, so load stays a steady
+# background rate instead of a morning spike.
+#
+# Run as its own process (one per deployment):  python -m backend.services.scheduler
+import os
+import re
+import time
+import random
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from backend.db.db_config import SessionLocal
+from backend.db.models import Saved_Search
+from backend.services import retention
+from backend.services.scrape import run_scraper
+from backend.services.enrich import enrich_jobs
+from backend.services.dedup import user_indexes
+from backend.services.pipeline import (
+    store_scrape_for_user,
+    get_user_parsed_resume,
+    get_user_filter,
+    load_known_urls,
+    record_source_stats,
+    INCREMENTAL_SCRAPE,
+)
+
+MAX_BROWSERS = int(os.getenv("SCHEDULER_MAX_BROWSERS", "2"))
+POLL_SECONDS = int(os.getenv("SCHEDULER_POLL_SECONDS", "30"))
+JITTER_FRACTION = 0.1  # next run lands within +/-10% of the interval
+MIN_INTERVAL_MINUTES = 60
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_query_key(date_posted, experience_level, job_title, location):
+    """Identical searches (modulo case/whitespace) share a key."""
+    parts = (date_posted, experience_level, job_title, location)
+    return "|".join(_WS_RE.sub(" ", (p or "").strip().lower()) for p in parts)
+
+
+def jittered(interval_minutes):
+    spread = interval_minutes * JITTER_FRACTION
+    return timedelta(minutes=interval_minutes + random.uniform(-spread, spread))
+
+
+def first_run_at(interval_minutes, now=None):
+    # New searches start anywhere within their first interval, not all at once
+    now = now or datetime.now()
+    return now + timedelta(minutes=random.uniform(0, interval_minutes))
+
+
+def claim_due_groups(db, now, limit, skip_keys=()):
+    """
+    Return {query_key: [search_id, ...]} for up to `limit` keys with a due search.
+    Other subscribers of the same key due within half their interval ride
+    along, so identical queries stay aligned on one scrape. Claimed rows get
+    their next_run_at pushed forward before the scrape starts. Keys in
+    skip_keys (still running) are left unclaimed, so they stay due.
+    """
+    due = db.query(Saved_Search.query_key).filter(
+        Saved_Search.active.is_(True), Saved_Search.next_run_at <= now
+    )
+    if skip_keys:
+        due = due.filter(Saved_Search.query_key.notin_(list(skip_keys)))
+    due_keys = [
+        key for (key,) in (
+            due
+            .distinct()
+            .limit(limit)
+            .all()
+        )
+    ]
+    if not due_keys:
+        return {}
+
+    candidates = (
+        db.query(Saved_Search)
+        .filter(Saved_Search.active.is_(True), Saved_Search.query_key.in_(due_keys))
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    groups = {}
+    for search in candidates:
+        window = timedelta(minutes=search.interval_minutes / 2)
+        if search.next_run_at > now + window:
+            continue
+        search.next_run_at = now + jittered(search.interval_minutes)
+        groups.setdefault(search.query_key, []).append(search.search_id)
+    db.commit()
+    return groups
+
+
+def run_group(query_key, search_ids):
+    """Scrape one coalesced query and store the results for each subscriber."""
+    db = SessionLocal()
+    try:
+        searches = db.query(Saved_Search).filter(Saved_Search.search_id.in_(search_ids)).all()
+        if not searches:
+            return
+        query = searches[0].query
+        print(f"[Scheduler] Running '{query_key}' for {len(searches)} subscriber(s)")
+
+        # A posting can only be skipped if every subscriber already has it
+        known_urls = None
+        if INCREMENTAL_SCRAPE:
+            known_urls = set.intersection(*(load_known_urls(db, s.user_email) for s in searches))
+
+        started = time.monotonic()
+        source_stats = []
+        try:
+            scraped_jobs = run_scraper(
+                date_posted=query.date_posted.value if query.date_posted else None,
+                experience_level=query.experience_level.value if query.experience_level else None,
+                job_title=query.job_title,
+                location=query.location,
+                known_urls=known_urls,
+                source_stats=source_stats,
+            )
+        except Exception as e:
+            print(f"[Scheduler] Scrape failed for '{query_key}': {e}")
+            return
+        finally:
+            record_source_stats(source_stats)
+
+        resumes = {s.user_email: get_user_parsed_resume(db, s.user_email) for s in searches}
+        if any(r is not None for r in resumes.values()):
+            scraped_jobs = enrich_jobs(scraped_jobs)
+
+        for search in searches:
+            try:
+                # Each subscriber's own rules apply to the shared result set
+                job_filter = get_user_filter(db, search.user_email)
+                user_jobs = [job for job in scraped_jobs if not job_filter.reject(job)]
+                store_scrape_for_user(
+                    db, search.query, search.user_email, user_jobs, resumes[search.user_email],
+                    time.monotonic() - started,
+                )
+                search.last_run_at = datetime.now()
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                user_indexes.invalidate(search.user_email)  # drop index entries for rolled-back inserts
+                print(f"[Scheduler] Failed to store results for {search.user_email}: {e}")
+    finally:
+        db.close()
+
+
+def run_forever(stop_event=None):
+    stop_event = stop_event or threading.Event()
+    executor = ThreadPoolExecutor(max_workers=MAX_BROWSERS)
+    in_flight = {}  # query_key -> future, so a slow scrape is never doubled up
+
+    retention_due = time.monotonic()
+
+    print(f"[Scheduler] Started (max {MAX_BROWSERS} concurrent scrapes)")
+    while not stop_event.is_set():
+        in_flight = {k: f for k, f in in_flight.items() if not f.done()}
+
+        # Retention runs in small committed batches, so it can share the poll loop
+        if retention.RETENTION_INTERVAL_HOURS > 0 and time.monotonic() >= retention_due:
+            retention_due = time.monotonic() + retention.RETENTION_INTERVAL_HOURS * 3600
+            try:
+                print(f"[Scheduler] Retention: {retention.run_once()}")
+            except Exception as e:
+                print(f"[Scheduler] Retention pass failed: {e}")
+        free_slots = MAX_BROWSERS - len(in_flight)
+
+        if free_slots > 0:
+            db = SessionLocal()
+            try:
+                groups = claim_due_groups(db, datetime.now(), free_slots, skip_keys=in_flight.keys())
+            except Exception as e:
+                db.rollback()
+                print(f"[Scheduler] Failed to claim due searches: {e}")
+                groups = {}
+            finally:
+                db.close()
+
+            for query_key, search_ids in groups.items():
+                in_flight[query_key] = executor.submit(run_group, query_key, search_ids)
+
+        stop_event.wait(POLL_SECONDS + random.uniform(0, POLL_SECONDS / 4))
+
+    executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    run_forever()
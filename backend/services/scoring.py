@@ -0,0 +1,97 @@
+# backend/services/scoring.py
+# Resume parsing and the resume-vs-job fit score. Used when a resume is
+# uploaded (app.py) and when scraped jobs are inserted (pipeline.py).
+import re
+from pdfminer.high_level import extract_text
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+# Resume parsing function
+def resume_parse(file_path, filename):
+    """Extract and structure key resume sections."""
+    text = extract_text(file_path)
+
+    # Split sections by flexible headings (case-insensitive)
+    sections = re.split(
+        r"(?i)(?:Professional Summary:?|Summary:?|Technical Skills:?|Skills:?|Experience:?|"
+        r"Academic & Independent Projects:?|Projects:?|Education:?)",
+        text,
+    )
+
+    # Pad for safety
+    while len(sections) < 6:
+        sections.append("")
+
+    data = {
+        "summary": sections[1].strip(),
+        "skills": sections[2].strip(),
+        "experience": sections[3].strip(),
+        "projects": sections[4].strip(),
+        "education": sections[5].strip(),
+    }
+
+    # Parse "Technical Skills" section into dict
+    skills = {}
+    for line in data["skills"].splitlines():
+        if ":" in line:
+            key, value = line.split(":", 1)
+            skills[key.strip()] = [s.strip() for s in value.split(",") if s.strip()]
+
+    return {
+        "status": "ok",
+        "filename": filename,
+        "summary": data["summary"],
+        "skills": skills,
+        "experience": data["experience"],
+        "projects": data["projects"],
+        "education": data["education"],
+    }
+
+# Job score calculation function, using TF-IDF and keyword overlap
+def calculate_job_score(parsed_resume, job):
+    """Compute job fit score using TF-IDF + keyword overlap."""
+    
+    if not parsed_resume:
+        return 0.0
+
+    skills_dict = parsed_resume.get("skills") or {}
+    job_title = job.JobTitle
+    job_text_raw = f"{job.Skills or ''} {job.Description or ''}"
+
+    # Combine resume text sections for stronger context, lowercased
+    resume_text = (
+        " ".join(
+            f"{category} {' '.join(skills)}"
+            for category, skills in skills_dict.items()
+        )
+        + " "
+        + parsed_resume.get("summary", "")
+        + " "
+        + parsed_resume.get("experience", "")
+        + " "
+        + parsed_resume.get("projects", "")
+    ).lower()
+
+    job_text = f"{job_title} {job_text_raw}".lower() # combined job text
+
+    def clean(s): # remove non-letters
+        return re.sub(r"[^a-z\s]", " ", s)
+
+    resume_text, job_text = clean(resume_text), clean(job_text) # clean texts
+
+    if not resume_text.strip() or not job_text.strip(): # empty check
+        return 0.0
+
+    # TF-IDF cosine similarity
+    vectorizer = TfidfVectorizer(stop_words="english") # init vectorizer
+    tfidf = vectorizer.fit_transform([resume_text, job_text]) # fit + transform
+    cosine_score = float(cosine_similarity(tfidf)[0, 1]) # get cosine sim
+
+    # Keyword overlap
+    resume_words = set(resume_text.split()) # unique words in resume
+    job_words = set(job_text.split()) # unique words in job
+    overlap_ratio = len(resume_words & job_words) / (len(job_words) or 1) # overlap ratio
+
+    # Blend + scale
+    blended = (cosine_score * 0.7) + (overlap_ratio * 0.3) # weighted blend
+    return round(min(blended * 200, 100), 2) # scale to 0-100
@@ -1,49 +1,325 @@
 # backend/services/scrape.py
 
+import os
+import time
+import queue
+import threading
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from backend.services.scrapers.linkedin_scraper import LinkedInScraper
 from backend.services.scrapers.hiring_cafe import HiringCafeScraper
+from backend.services import source_guard, driver_mode
+
+SCRAPERS = [
+    ("Hiring Cafe", HiringCafeScraper),
+    #("LinkedIn", LinkedInScraper),
+]
+
+SCRAPE_BATCH_SIZE = int(os.getenv("SCRAPE_BATCH_SIZE", "20"))  # jobs per committed batch
+SCRAPE_BATCH_MAX_WAIT = float(os.getenv("SCRAPE_BATCH_MAX_WAIT", "10"))  # seconds before a partial batch is flushed
+SCRAPE_DEADLINE = float(os.getenv("SCRAPE_DEADLINE", "180"))  # seconds a whole scrape may take; 0 disables
+# (worker and scheduler scrapes; one inside a web request is bounded by gunicorn's timeout, see app.py)
+SCRAPE_DEADLINE_GRACE = 10  # seconds past the deadline a scraper gets to hand over what it has
+SCRAPE_HEDGE = os.getenv("SCRAPE_HEDGE", "0") == "1"  # second attempt for a source running past its p95
+
+class SourceUnavailable(Exception):
+    """Raised when a source's guard refuses the scrape (breaker open or rate limited)."""
 
 def run_scraper(date_posted: str, 
                 experience_level: str, 
                 job_title: str, 
-                location: str):
+                location: str,
+                job_filter=None,
+                known_urls=None,
+                source_stats=None,
+                deadline=SCRAPE_DEADLINE):
     """
     Entry point to run the appropriate scraper based on the platform.
-    Returns a list of job dicts formatted to match the 'jobs' table.
+    Returns a list of JobRecords (backend/services/job_record.py).
+    job_filter (a compiled JobFilter) drops unwanted cards during extraction.
+    known_urls (canonical URLs already stored) lets scrapers stop early on repeat searches.
+    source_stats, if a list, receives one {"source", "ok", "found", "duration"} dict per scraper.
+    deadline (seconds, 0 for none) bounds the whole scrape; sources still running then return
+    what they have, and any that don't are abandoned.
+    Sources whose circuit breaker is open are skipped without starting a browser.
+    """
+    results = []
+    for batch in stream_scraper(
+        date_posted, experience_level, job_title, location,
+        job_filter=job_filter, known_urls=known_urls, source_stats=source_stats, deadline=deadline,
+    ):
+        results.extend(batch)
+    return results
+
+
+class _Attempt:
+    """One run of a source's scraper. A hedged source has two, and the first to finish wins."""
+
+    def __init__(self, source, scraper_cls, hedge=False):
+        self.source = source
+        self.scraper_cls = scraper_cls
+        self.hedge = hedge
+        self.label = f"{source} (hedge)" if hedge else source
+        self.stop = threading.Event()
+        self.lost = False  # stopped because the other attempt finished first
+        self.started = None  # set once the guard lets it run
+
+    def lose(self):
+        self.lost = True
+        self.stop.set()
+
+
+def stream_scraper(date_posted: str,
+                   experience_level: str,
+                   job_title: str,
+                   location: str,
+                   job_filter=None,
+                   known_urls=None,
+                   source_stats=None,
+                   batch_size=SCRAPE_BATCH_SIZE,
+                   max_wait=SCRAPE_BATCH_MAX_WAIT,
+                   deadline=SCRAPE_DEADLINE,
+                   hedge=SCRAPE_HEDGE):
+    """
+    Same as run_scraper, but yields lists of jobs as the scrapers produce them:
+    a batch is handed over once it holds batch_size jobs or its first job is
+    max_wait seconds old. Closing the generator early stops the scrapers.
+    With hedge, a source running past its p95 scrape time gets a second
+    attempt on a fresh driver; whichever finishes first stops the other, and
+    the response doesn't wait for the loser to wind down.
     """
 
     print(f"[{datetime.now()}] Starting scrape for ...")
 
-    scrapers = [
-        ("Hiring Cafe", HiringCafeScraper()),
-        #("LinkedIn", LinkedInScraper())
-    ]
-    
-    results = []
+    scrapers = []
+    for name, scraper_cls in SCRAPERS:
+        if source_guard.get_guard(name).is_available():
+            scrapers.append((name, scraper_cls))
+        else:
+            print(f"[{name}] Skipped: circuit breaker open.")
+
+    if not scrapers:
+        return
+
     start = datetime.now()
+    deadline_at = time.monotonic() + deadline if deadline else None
+    total = 0
+    # Bounded, so a slow consumer pauses the browsers instead of buffering everything
+    jobs = queue.Queue(maxsize=batch_size * 4)
+    emitted = set()  # URLs handed over; both attempts of a hedged source find the same jobs
+    attempts = {}  # future -> _Attempt
+    hedged = set()  # sources that already got their second attempt
+    detached = False  # attempts left running (abandoned or lost); don't wait for them on shutdown
     # Run each scraper in its own thread
-    with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
-        futures = { # expected items
-            executor.submit(scraper.scrape, date_posted, experience_level, job_title, location): (name, scraper)
-            for name, scraper in scrapers
-        }
-        
-        for future in as_completed(futures): # fill the results dictionary
-            name, scraper = futures[future]
+    executor = ThreadPoolExecutor(max_workers=len(scrapers) * (2 if hedge else 1))
+
+    def launch(attempt):
+        future = executor.submit(
+            _guarded_scrape, attempt, job_filter, known_urls, jobs, deadline_at,
+            date_posted, experience_level, job_title, location,
+        )
+        attempts[future] = attempt
+        return future
+
+    def take(job):
+        nonlocal batch_started
+        if job.URL not in emitted:
+            emitted.add(job.URL)
+            batch.append(job)
+            batch_started = batch_started or time.monotonic()
+
+    try:
+        batch, batch_started = [], None
+        pending = {launch(_Attempt(name, scraper_cls)) for name, scraper_cls in scrapers}
+        # Producers put before they finish, so once all are done the queue holds the rest
+        while pending or not jobs.empty():
             try:
-                data = future.result()
-                results.extend(data)
-                print(f"[{name}] Completed with {len(data)} results.")
-            except Exception as e:
-                print(f"[{name}] Failed: {e}")
-            finally:
-                try:
-                    scraper.close()
-                except Exception as e:
-                    print(f"[{name}] Failed: {e}")
+                take(jobs.get(timeout=0.5))
+            except queue.Empty:
+                pass
+
+            if batch and (len(batch) >= batch_size or time.monotonic() - batch_started >= max_wait):
+                total += len(batch)
+                yield batch
+                batch, batch_started = [], None
+
+            for future in [f for f in pending if f.done()]:
+                if future not in pending:
+                    continue  # a loser dropped by its source's winner just above
+                pending.discard(future)
+                attempt = attempts[future]
+                stat = _collect(attempt, future)
+                if stat is not None and source_stats is not None:
+                    source_stats.append(stat)
+                if future.exception() is None and not attempt.lost:
+                    # The loser may be mid page load or wait; stop it, but don't wait for it
+                    for other in [f for f in pending if attempts[f].source == attempt.source]:
+                        attempts[other].lose()
+                        pending.discard(other)
+                        detached = True
+                        print(f"[{attempts[other].label}] Stopped: the other attempt finished first.")
+
+            now = time.monotonic()
+            if hedge:
+                for future in list(pending):
+                    attempt = attempts[future]
+                    if attempt.source in hedged or attempt.started is None:
+                        continue
+                    p95 = source_guard.get_guard(attempt.source).p95()
+                    if p95 is None or now - attempt.started <= p95:
+                        continue
+                    if deadline_at is not None and now >= deadline_at:
+                        continue
+                    print(f"[{attempt.source}] Past its p95 ({p95:.1f}s), starting a hedged attempt.")
+                    hedged.add(attempt.source)
+                    pending.add(launch(_Attempt(attempt.source, attempt.scraper_cls, hedge=True)))
+
+            if pending and deadline_at is not None and now >= deadline_at + SCRAPE_DEADLINE_GRACE:
+                # Stuck in a page load or a wait: keep what they produced and stop waiting
+                for future in pending:
+                    attempt = attempts[future]
+                    print(f"[{attempt.label}] Abandoned at the deadline.")
+                    if source_stats is not None and not attempt.hedge:
+                        source_stats.append({
+                            "source": attempt.source, "ok": False, "found": 0,
+                            "duration": now - (attempt.started or now),
+                        })
+                detached = True
+                while not jobs.empty():
+                    take(jobs.get_nowait())
+                break
+
+        if batch:
+            total += len(batch)
+            yield batch
+    finally:
+        for attempt in attempts.values():
+            attempt.stop.set()  # no-op after a full run; stops the browsers if the consumer bailed
+        # Abandoned and lost attempts close their drivers when they come unstuck (or the watchdog kills them)
+        executor.shutdown(wait=not detached, cancel_futures=True)
 
     print(f"Total scrape time: {(datetime.now() - start).total_seconds():.2f}s")
-    print(f"[{datetime.now()}] All scrapers completed. Total: {len(results)} jobs.")
-    return results 
\ No newline at end of file
+    print(f"[{datetime.now()}] All scrapers completed. Total: {total} jobs.")
+
+
+def _collect(attempt, future):
+    # Log one finished attempt and turn it into a source_stats entry (None if skipped or cancelled)
+    name = attempt.label
+    if attempt.lost:
+        print(f"[{name}] Stopped: the other attempt finished first.")
+        return None
+    try:
+        found, elapsed, outcome = future.result()
+    except SourceUnavailable as e:
+        print(f"[{name}] Skipped: {e}")
+        return None
+    except Exception as e:
+        print(f"[{name}] Failed: {e}")
+        return {"source": attempt.source, "ok": False, "found": 0, "duration": getattr(e, "elapsed", 0.0)}
+    print(f"[{name}] Completed with {found} results ({outcome}).")
+    return {
+        "source": attempt.source,
+        "ok": outcome != source_guard.TIMEOUT,
+        "found": found,
+        "duration": elapsed,
+    }
+
+
+def _guarded_scrape(attempt, job_filter, known_urls, jobs, deadline, *args):
+    # Acquire the source's guard, run one scraper into the `jobs` queue, report the outcome back.
+    # Returns (jobs found, seconds, outcome); failures carry .elapsed for stats.
+    name = attempt.label
+    guard = source_guard.get_guard(attempt.source)
+    # A hedge only runs if the source has a token and browser slot free right now
+    if not guard.acquire(timeout=0 if attempt.hedge else source_guard.ACQUIRE_TIMEOUT):
+        raise SourceUnavailable("rate limited or circuit open")
+
+    start = attempt.started = time.monotonic()
+    outcome = source_guard.ERROR
+    scraper = None
+    headless = driver_mode.start_headless()
+    run_started = time.monotonic()
+    try:
+        scraper = attempt.scraper_cls(
+            job_filter, known_urls, deadline=deadline, headless=headless, stop=attempt.stop,
+        )
+        found = _feed(attempt, scraper, jobs, args)
+        blocked = _blocked(scraper) if scraper.headless and driver_mode.can_fall_back() else None
+        if blocked and not attempt.stop.is_set() and not scraper.past_deadline():
+            print(f"[{name}] Headless run {blocked}, retrying headful.")
+            _record_mode(attempt.source, scraper, run_started, fell_back=True)
+            run_started = time.monotonic()  # timed from the driver launch, like the first run
+            scraper.use_headful()
+            found += _feed(attempt, scraper, jobs, args)
+        if not attempt.lost:  # a stopped loser says nothing about the mode
+            _record_mode(attempt.source, scraper, run_started)
+
+        if attempt.lost:
+            outcome = source_guard.CANCELLED
+        elif scraper.last_wait_status == "timeout":
+            outcome = source_guard.TIMEOUT
+        elif scraper.last_wait_status == "caught_up" or not scraper.cards_seen:
+            # From the page, not `found`: the user's filters or known URLs can leave
+            # nothing from a source that answered normally
+            outcome = source_guard.EMPTY
+        else:
+            outcome = source_guard.OK
+        return found, time.monotonic() - start, outcome
+    except Exception as e:
+        e.elapsed = time.monotonic() - start
+        if attempt.lost:
+            outcome = source_guard.CANCELLED  # killed mid-command by the winner closing up
+        elif scraper is None:  # the driver didn't start
+            driver_mode.stats.record(attempt.source, headless, False, time.monotonic() - run_started, 0, 0.0)
+        else:
+            _record_mode(attempt.source, scraper, run_started, failed=True)
+        raise
+    finally:
+        guard.release(outcome, time.monotonic() - start)
+        if scraper is not None:
+            try:
+                scraper.close()
+            except Exception as e:
+                print(f"[{name}] Failed to close: {e}")
+
+
+def _feed(attempt, scraper, jobs, args):
+    # Run the scraper into the queue until it finishes, the attempt is stopped or time is up
+    found = 0
+    for job in scraper.iter_jobs(*args):
+        while not attempt.stop.is_set():
+            try:
+                jobs.put(job, timeout=1)
+                break
+            except queue.Full:
+                continue
+        if attempt.stop.is_set():
+            print(f"[{attempt.label}] Stopped early: {'lost to the other attempt' if attempt.lost else 'consumer went away'}.")
+            break
+        found += 1
+        if scraper.past_deadline():
+            print(f"[{attempt.label}] Deadline reached after {found} results.")
+            break
+    return found
+
+
+def _blocked(scraper):
+    # Why the last run looks blocked rather than genuinely empty, or None
+    if scraper.challenged:
+        return "hit a bot check"
+    if scraper.last_wait_status == "timeout":
+        return "timed out waiting for results"
+    if scraper.last_wait_status not in ("caught_up", "stopped") and not scraper.cards_seen:
+        return "came back empty"  # served a page without any cards, not "all caught up"
+    return None
+
+
+def _record_mode(source, scraper, run_started, fell_back=False, failed=False):
+    ok = not failed and scraper.last_wait_status in ("ok", "caught_up") and _blocked(scraper) is None
+    try:
+        rss, cpu = scraper.resource_usage()
+    except Exception:
+        rss, cpu = 0, 0.0  # the driver is gone, e.g. what made the run fail
+    driver_mode.stats.record(
+        source, scraper.headless, ok, time.monotonic() - run_started, rss, cpu, fell_back=fell_back,
+    )
@@ -0,0 +1,249 @@
+# backend/services/scrape_worker.py
+# Standalone scrape worker. With SCRAPE_QUEUE=1 the web tier only queues a
+# Pending Scrape_Session; workers on any machine claim sessions with
+# SELECT ... FOR UPDATE SKIP LOCKED, hold them under a lease they renew by
+# heartbeat, and run the scrape. A session whose lease runs out (its worker
+# died or hung) becomes claimable again, up to MAX_ATTEMPTS.
+#
+# Run one or more per deployment:  python -m backend.services.scrape_worker
+import os
+import random
+import signal
+import socket
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from backend.db.db_config import SessionLocal
+from backend.db.models import Scrape_Session, ScrapeStatus
+from backend.services.dedup import user_indexes
+from backend.services.pipeline import stream_scrape_for_user
+
+WORKER_CONCURRENCY = int(os.getenv("SCRAPE_WORKER_CONCURRENCY", "1"))  # browsers per worker process
+VISIBILITY_TIMEOUT = int(os.getenv("SCRAPE_VISIBILITY_TIMEOUT", "300"))  # seconds a lease lasts unrenewed
+HEARTBEAT_SECONDS = int(os.getenv("SCRAPE_HEARTBEAT_SECONDS", "30"))
+POLL_SECONDS = int(os.getenv("SCRAPE_WORKER_POLL_SECONDS", "5"))
+MAX_ATTEMPTS = 3
+
+
+def lease_deadline(now=None):
+    return (now or datetime.now()) + timedelta(seconds=VISIBILITY_TIMEOUT)
+
+
+def claim_next(db, owner, now):
+    """
+    Lease the oldest claimable session to `owner` and return its id, or None.
+    Claimable: Pending, or Running under a lease that has expired. Sessions
+    run in-process by the web tier never hold a lease and are never claimed.
+    """
+    expired = and_(
+        Scrape_Session.status == ScrapeStatus.Running,
+        Scrape_Session.lease_owner.isnot(None),
+        Scrape_Session.lease_expires_at < now,
+    )
+    while True:
+        entry = (
+            db.query(Scrape_Session)
+            .filter(or_(Scrape_Session.status == ScrapeStatus.Pending, expired))
+            .order_by(Scrape_Session.scrape_session_id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if entry is None:
+            db.rollback()
+            return None
+
+        if entry.attempts >= MAX_ATTEMPTS:
+            entry.status = ScrapeStatus.Failed
+            entry.log = f"Scrape abandoned after {entry.attempts} attempts."
+            entry.lease_owner = entry.lease_expires_at = None
+            db.commit()
+            continue
+
+        if entry.status == ScrapeStatus.Running:
+            print(f"[Worker {owner}] Re-queuing session {entry.scrape_session_id} from {entry.lease_owner}")
+
+        # attempts doubles as a version number, so two claimers can't both win
+        # where the database ignores FOR UPDATE (SQLite in local runs)
+        claimed = (
+            db.query(Scrape_Session)
+            .filter(
+                Scrape_Session.scrape_session_id == entry.scrape_session_id,
+                Scrape_Session.attempts == entry.attempts,
+            )
+            .update(
+                {
+                    Scrape_Session.status: ScrapeStatus.Running,
+                    Scrape_Session.lease_owner: owner,
+                    Scrape_Session.lease_expires_at: lease_deadline(now),
+                    Scrape_Session.attempts: entry.attempts + 1,
+                    Scrape_Session.log: "Scrape started.",
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if claimed:
+            return entry.scrape_session_id
+
+
+def renew_lease(session_id, owner):
+    """Push the lease deadline out. False once another worker has taken the session."""
+    db = SessionLocal()
+    try:
+        renewed = (
+            db.query(Scrape_Session)
+            .filter(Scrape_Session.scrape_session_id == session_id, Scrape_Session.lease_owner == owner)
+            .update({Scrape_Session.lease_expires_at: lease_deadline()}, synchronize_session=False)
+        )
+        db.commit()
+        return renewed == 1
+    except Exception as e:
+        # A transient DB error isn't a lost lease; if it persists the lease simply expires
+        db.rollback()
+        print(f"[Worker {owner}] Heartbeat failed for session {session_id}: {e}")
+        return True
+    finally:
+        db.close()
+
+
+class Heartbeat:
+    """Renews a lease every HEARTBEAT_SECONDS while the scrape runs."""
+
+    def __init__(self, session_id, owner):
+        self.session_id = session_id
+        self.owner = owner
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{session_id}", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            if not renew_lease(self.session_id, self.owner):
+                self.lost.set()
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class LeaseLost(Exception):
+    """Another worker took the session over; this worker's results are abandoned."""
+
+
+def process(session_id, owner):
+    """Scrape one leased session, committing batches only while the lease is still ours."""
+    db = SessionLocal()
+    user_email = None
+    try:
+        with Heartbeat(session_id, owner) as heartbeat:
+            entry = db.get(Scrape_Session, session_id)
+            query, user_email = entry.query, entry.user_email
+            params = {
+                "date_posted": query.date_posted.value if query.date_posted else None,
+                "experience_level": query.experience_level.value if query.experience_level else None,
+                "job_title": query.job_title,
+                "location": query.location,
+            }
+            print(f"[Worker {owner}] Session {session_id}: '{query.job_title}' for {user_email}")
+
+            def checkpoint():
+                # Lock the row until the batch commits and confirm nobody took the session over
+                current = (
+                    db.query(Scrape_Session.lease_owner)
+                    .filter(Scrape_Session.scrape_session_id == session_id)
+                    .with_for_update()
+                    .scalar()
+                )
+                if current != owner or heartbeat.lost.is_set():
+                    raise LeaseLost(f"session {session_id} now held by {current}")
+
+            stream_scrape_for_user(db, query, user_email, params, entry, checkpoint=checkpoint)
+
+            entry.lease_owner = entry.lease_expires_at = None
+            db.commit()
+    except LeaseLost as e:
+        db.rollback()
+        user_indexes.invalidate(user_email)
+        print(f"[Worker {owner}] Lost the lease ({e}); stopping")
+    except Exception as e:
+        db.rollback()
+        user_indexes.invalidate(user_email)  # drop index entries for rolled-back inserts
+        print(f"[Worker {owner}] Session {session_id} failed: {e}")
+        release_failed(session_id, owner, e)
+    finally:
+        db.close()
+
+
+def release_failed(session_id, owner, error):
+    # Back to Pending for another try, or Failed once attempts run out
+    db = SessionLocal()
+    try:
+        entry = (
+            db.query(Scrape_Session)
+            .filter(Scrape_Session.scrape_session_id == session_id, Scrape_Session.lease_owner == owner)
+            .with_for_update()
+            .first()
+        )
+        if entry is None:
+            return
+        retry = entry.attempts < MAX_ATTEMPTS
+        entry.status = ScrapeStatus.Pending if retry else ScrapeStatus.Failed
+        entry.log = f"{'Retrying' if retry else 'Failed'} after error: {error}"[:1000]
+        entry.lease_owner = entry.lease_expires_at = None
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"[Worker {owner}] Could not release session {session_id}: {e}")
+    finally:
+        db.close()
+
+
+def run_slot(slot, stop_event):
+    owner = f"{socket.gethostname()}:{os.getpid()}:{slot}"
+    while not stop_event.is_set():
+        db = SessionLocal()
+        try:
+            session_id = claim_next(db, owner, datetime.now())
+        except Exception as e:
+            db.rollback()
+            print(f"[Worker {owner}] Failed to claim a session: {e}")
+            session_id = None
+        finally:
+            db.close()
+
+        if session_id is None:
+            stop_event.wait(POLL_SECONDS + random.uniform(0, POLL_SECONDS / 4))
+            continue
+        process(session_id, owner)
+
+
+def run_forever(stop_event=None):
+    stop_event = stop_event or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        # Finish the scrapes in hand on SIGTERM (docker stop) instead of dropping them
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+    print(f"[Worker] Started ({WORKER_CONCURRENCY} slot(s), lease {VISIBILITY_TIMEOUT}s)")
+    slots = [
+        threading.Thread(target=run_slot, args=(slot, stop_event), name=f"scrape-slot-{slot}")
+        for slot in range(WORKER_CONCURRENCY)
+    ]
+    for thread in slots:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in slots):
+            for thread in slots:
+                thread.join(timeout=1)
+    except KeyboardInterrupt:
+        stop_event.set()
+        for thread in slots:
+            thread.join()
+
+
+if __name__ == "__main__":
+    run_forever()
@@ -3,56 +3,158 @@
 # the create driver method, wait method, and close method
 import time
 import random
-from backend.services import utils
+import threading
+from abc import ABC, abstractmethod
+from backend.services import utils, browser_pool, driver_mode
+from backend.services.filters import DEFAULT_FILTER
+from backend.services.driver_watchdog import watchdog
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
 
 CAUGHT_UP = "__CAUGHT_UP__"
+DEFAULT_PAGE_LOAD_TIMEOUT = 300  # chromedriver's own default, restored after a deadline-bounded load
 
-class BaseScraper:
-    def __init__(self):
-        self.driver = utils.create_driver()
+class BaseScraper(ABC):
+    def __init__(self, job_filter=None, known_urls=None, deadline=None, headless=False, stop=None):
+        self.headless = headless
+        self.driver = browser_pool.new_driver(headless)
+        self.job_filter = job_filter or DEFAULT_FILTER
+        # Canonical URLs the user already has; enables incremental scraping where supported
+        self.known_urls = known_urls
+        # time.monotonic() by which the scrape should wrap up and return what it has
+        self.deadline = deadline
+        # Set from outside (e.g. a hedged attempt that lost) to wrap up as at the deadline
+        self.stop = stop or threading.Event()
+        # Status of the last _wait_for_elements call, read by run_scraper's source guard
+        self.last_wait_status = None
+        # Result cards on the pages scraped, before user filters and known-URL skips;
+        # zero means the source itself came back empty
+        self.cards_seen = 0
+        # Set when a wait timed out on what looks like a bot check (driver_mode.is_challenge_page)
+        self.challenged = False
         env_vars = utils.load_env_variables()
         self.email_address = env_vars["EMAIL_ADDRESS"]
         self.email_password = env_vars["EMAIL_PASSWORD"]
+        # Set by the watchdog after it kills an over-budget or hung driver
+        self.needs_new_driver = False
+        watchdog.register(self)
+
+    def _replace_driver(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = browser_pool.new_driver(self.headless)
+        self.needs_new_driver = False
+        watchdog.driver_replaced(self)
+
+    def use_headful(self):
+        """Swap a headless driver for a headful one before scraping again."""
+        self.headless = False
+        self.last_wait_status = None
+        self.cards_seen = 0
+        self.challenged = False
+        self._replace_driver()
+
+    def resource_usage(self):
+        """(RSS bytes, CPU seconds so far) of the driver's process tree."""
+        pids = utils.driver_pids(self.driver)
+        return utils.process_tree_rss(*pids), utils.process_tree_cpu_seconds(*pids)
+
+    def time_left(self):
+        """Seconds until the deadline (never negative, 0 once stopped), or None without one."""
+        if self.stop.is_set():
+            return 0.0
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def past_deadline(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def should_stop(self):
+        """True once the scrape should return what it has: past the deadline or stopped."""
+        return self.stop.is_set() or self.past_deadline()
 
     def _go_to_url(self, url):
+        if self.needs_new_driver:
+            print(f"[{type(self).__name__}] Replacing driver recycled by the watchdog")
+            self._replace_driver()
         self.driver.delete_all_cookies()
         self.driver.get("about:blank")
         time.sleep(random.uniform(1, 2))
-        self.driver.get(url)
+        if self.deadline is None:
+            self.driver.get(url)
+        elif isinstance(self.driver, browser_pool.TabDriver):
+            # One hold of the browser lock, so the other tabs never see this tab's timeout
+            self.driver.run(self._load_by_deadline, self.driver, url)
+        else:
+            self._load_by_deadline(self.driver, url)
         time.sleep(random.uniform(1, 2))
 
+    def _load_by_deadline(self, driver, url):
+        # A hung load stops at the deadline; whatever rendered by then is still scraped.
+        # The page-load timeout is session-wide, so it is put back right after.
+        driver.set_page_load_timeout(max(1, self.time_left()))
+        try:
+            driver.get(url)
+        except TimeoutException:
+            print(f"[{type(self).__name__}] Page load hit the deadline, stopping it")
+            driver.execute_script("window.stop();")
+        finally:
+            driver.set_page_load_timeout(DEFAULT_PAGE_LOAD_TIMEOUT)
+
+    @abstractmethod
+    def iter_jobs(self, date_posted, experience_level, job_title, location):
+        """Yield JobRecords as they are extracted."""
+
+    def scrape(self, date_posted, experience_level, job_title, location):
+        return list(self.iter_jobs(date_posted, experience_level, job_title, location))
+
     def _wait_for_elements(self, selector, timeout=30):
+        if self.deadline is not None:
+            timeout = min(timeout, max(1, self.time_left()))
         try:
             
             self.driver.save_screenshot("/app/debug_wait.png")  # Debug screenshot
             
-            WebDriverWait(self.driver, timeout).until(
-                EC.any_of(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)),
-                    EC.presence_of_all_elements_located((By.XPATH, "//*[contains(text(), \"You're all caught up!\")]"))
-                )
+            loaded = EC.any_of(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)),
+                EC.presence_of_all_elements_located((By.XPATH, "//*[contains(text(), \"You're all caught up!\")]"))
             )
+            # Checked on every poll, so a stopped scraper doesn't sit out the timeout
+            WebDriverWait(self.driver, timeout).until(lambda driver: self.stop.is_set() or loaded(driver))
+
+            if self.stop.is_set():
+                self.last_wait_status = "stopped"
+                return {"status": "stopped", "elements": []}
 
             caught_up = self.driver.find_elements(
                 By.XPATH, "//*[contains(text(), \"You're all caught up!\")]"
             )
 
             if caught_up:
+                self.last_wait_status = "caught_up"
                 return {"status": "caught_up", "elements": []}
 
             elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            self.last_wait_status = "ok"
             return {"status": "ok", "elements": elements}
 
         except Exception:
             print(f"Timeout waiting for selector: {selector}")
+            self.last_wait_status = "timeout"
+            self.challenged = driver_mode.is_challenge_page(self.driver)
+            if self.challenged:
+                print(f"[{type(self).__name__}] Page looks like a bot check ({'headless' if self.headless else 'headful'})")
             return {"status": "timeout", "elements": []}
 
 
 
     def close(self):
+        watchdog.unregister(self)
         try:
             self.driver.quit()
         except Exception:
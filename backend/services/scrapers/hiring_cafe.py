@@ -2,9 +2,10 @@
 import json
 import urllib.parse
 import re
-from datetime import datetime
 from selenium.webdriver.common.by import By
 from backend.services.scrapers.base_scraper import BaseScraper
+from backend.services.job_record import JobRecord
+from backend.services.utils import canonical_url
 
 class HiringCafeScraper(BaseScraper):
 
@@ -84,7 +85,7 @@ class HiringCafeScraper(BaseScraper):
 
         return f"{self.BASE_URL}?searchState={encoded_state}"
 
-    def _scrape_logic(self, url, location):  # core scraping logic
+    def _scrape_logic(self, url, location):  # core scraping logic, yields jobs as cards are parsed
         
         print("inner:", self.driver.execute_script("return window.innerWidth"))
         
@@ -111,9 +112,11 @@ class HiringCafeScraper(BaseScraper):
         # Wait for job postings to load
         result = self._wait_for_elements(HiringCafeScraper.JOB_CARD_SELECTOR)
         
-        if result == "__CAUGHT_UP__":
+        if result["status"] == "caught_up":
             print("No new job postings found (caught up).")
-            return []
+            return
+        if result["status"] in ("timeout", "stopped"):
+            return
 
         # Extract job cards using the appropriate selector
         job_cards = self.driver.find_elements(
@@ -121,9 +124,28 @@ class HiringCafeScraper(BaseScraper):
         )
 
         print(f"Found {len(job_cards)} job postings.")
+        self.cards_seen += len(job_cards)
 
-        results = []
+        extracted = 0
+        rejected = 0
+        known = 0
         for card in job_cards:
+            if self.should_stop():
+                print("[Hiring Cafe] Stopping, returning partial results.")
+                break
+            try:
+                link = card.find_element(
+                    By.CSS_SELECTOR, "a[href*='viewjob']"
+                ).get_attribute("href")
+            except:
+                link = "N/A"
+
+            # Results aren't ordered by date, so a known posting doesn't mean we've
+            # caught up; known cards are only skipped before the costlier extraction
+            if self.known_urls is not None and canonical_url(link) in self.known_urls:
+                known += 1
+                continue
+
             try:
                 title = card.find_element(
                     By.CSS_SELECTOR, "span.font-bold.text-start"
@@ -138,12 +160,11 @@ class HiringCafeScraper(BaseScraper):
                 company = company.rstrip(":").strip()
             except:
                 company = "N/A"
-            try:
-                link = card.find_element(
-                    By.CSS_SELECTOR, "a[href*='viewjob']"
-                ).get_attribute("href")
-            except:
-                link = "N/A"
+
+            # Drop blocked companies/titles before any further extraction
+            if self.job_filter.reject_listing(title, company):
+                rejected += 1
+                continue
 
             salary = None
             try:
@@ -159,6 +180,10 @@ class HiringCafeScraper(BaseScraper):
                 print(f"Salary extraction error: {e}")
                 salary = None
 
+            if self.job_filter.reject_salary(salary):
+                rejected += 1
+                continue
+
             try:
                 skills = card.find_element(
                     By.CSS_SELECTOR,
@@ -167,28 +192,31 @@ class HiringCafeScraper(BaseScraper):
             except:
                 skills = "N/A"
 
-            results.append(
-                {
-                    "JobTitle": title,
-                    "Company": company,
-                    "Location": location,
-                    "Salary": salary,
-                    "URL": link,
-                    "Skills": skills,
-                    "Status": "New",
-                    "DateFound": datetime.today().date().isoformat(),
-                }
-            )
+            try:
+                job = JobRecord(
+                    JobTitle=title,
+                    Company=company,
+                    Location=location or "Anywhere",  # cards don't show one; use the searched location
+                    URL=link,
+                    Salary=salary,
+                    Skills=None if skills == "N/A" else skills,
+                )
+            except ValueError as e:
+                print(f"Skipped card: {e}")
+                rejected += 1
+                continue
 
             print(f"Parsed: {title} | {company} | {skills[:60]} | {salary}")
+            extracted += 1
+            yield job
 
-        print(f"\nExtracted {len(results)} jobs:")
+        print(f"\nExtracted {extracted} jobs:")
 
-        print(f"Total jobs before filtering: {len(results)}")
+        print(f"Jobs filtered out by user rules: {rejected}")
+        if known:
+            print(f"Already-known jobs skipped: {known}")
 
-        return results
-
-    def scrape(self, date_posted, experience_level, job_title, location):
+    def iter_jobs(self, date_posted, experience_level, job_title, location):
         print(
             f"[Hiring Cafe] Scraping '{job_title}' in '{location}' "
             f"({experience_level}, {date_posted})"
@@ -197,6 +225,4 @@ class HiringCafeScraper(BaseScraper):
         url = self._build_search_url(date_posted, experience_level, job_title, location)
         print(f"[Hiring Cafe] URL: {url}")
 
-        results = self._scrape_logic(url, location)
-
-        return results
\ No newline at end of file
+        yield from self._scrape_logic(url, location)
\ No newline at end of file
@@ -1,22 +1,19 @@
+import os
 import urllib.parse
 import json
 import time
 from datetime import datetime
 from backend.services.scrapers.base_scraper import BaseScraper
+from backend.services.job_record import JobRecord
+from backend.services.utils import canonical_url
 from selenium.webdriver.common.by import By
 
+# Incremental mode stops scrolling after this many already-known postings in a row
+KNOWN_STREAK_LIMIT = int(os.getenv("INCREMENTAL_STOP_AFTER_KNOWN", "10"))
+
 class LinkedInScraper(BaseScraper):
 
-    COMPANYS_TO_IGNORE = {
-        "Jobs via Dice",
-        "Mindrift",
-        "DataAnnotation",
-        "CyberCoders",
-        "Twine",
-        "Talentrift",
-        "TALi Technologies",
-        "New York Technology Partners",
-    }
+    CARD_SELECTOR = "ul.jobs-search__results-list div.base-card.base-search-card"
 
     BASE_URL = "https://www.linkedin.com/jobs/search/"
     GEO_ID_US = 103644278
@@ -49,115 +46,172 @@ class LinkedInScraper(BaseScraper):
             "origin": "JOB_SEARCH_PAGE_JOB_FILTER",
             "refresh": "true",
         }
+        if self.known_urls is not None:
+            params["sortBy"] = "DD"  # newest first, so known postings mean we've caught up
         query = urllib.parse.urlencode(params)
         return f"{self.BASE_URL}?{query}"
 
     def _get_workplace_type(self, location):
         return self.WORKPLACE_TYPE_MAP["Remote"] if "remote" in location.lower() else self.WORKPLACE_TYPE_MAP["On-site"]
 
-    def scrape(self, date_posted, experience_level, job_title, location):
+    def iter_jobs(self, date_posted, experience_level, job_title, location):
         url = self._build_search_url(date_posted, experience_level, job_title, location)
         print(f"[LinkedIn] URL: {url}")
 
-        results = self._scrape_logic(url, job_title, location, date_posted, experience_level)
-        
-        if not results:
+        found = 0
+        for job in self._scrape_logic(url, job_title, location, date_posted, experience_level):
+            found += 1
+            yield job
+
+        if not found:
             print("[LinkedIn] Found 0 jobs.")
-        return results
 
 
     def _scrape_logic(self, url, job_title, location, date_posted, experience_level):
         
-        printed_ignores = set()
-        
         print("Entered _scrape_logic")
         
         self._go_to_url(url)
         
         self._wait_for_elements("ul.jobs-search__results-list")
+
+        if self.known_urls is not None:
+            yield from self._scrape_incremental(location)
+            return
         
         self.scroll_to_load_all()
         
         print(f"Found Element")
         
             # Then get each job card within it
-        job_cards = self.driver.find_elements( By.CSS_SELECTOR, 
-        "ul.jobs-search__results-list div.base-card.base-search-card" )
+        job_cards = self.driver.find_elements(By.CSS_SELECTOR, self.CARD_SELECTOR)
         
         print(f"Found {len(job_cards)} job postings.")
-        
-        ignore_set = {company.lower() for company in self.COMPANYS_TO_IGNORE}
+        self.cards_seen += len(job_cards)
 
-        results = []
+        extracted = 0
+        rejected = 0
         
         for card in job_cards:
-            try:
-                title = card.find_element(By.CSS_SELECTOR, "h3.base-search-card__title").text.strip()
-            except:
-                title = "N/A"
-            try:
-                company = card.find_element(By.CSS_SELECTOR, "h4.base-search-card__subtitle").text.strip()
-            except:
-                company = "N/A"
-                
-            # Skip bad cards early
-            if not company:
+            if self.should_stop():
+                print("[LinkedIn] Stopping, returning partial results.")
+                break
+            job = self._extract_card(card, location)
+            if job is None:
+                rejected += 1
                 continue
+            print(f"- {job.JobTitle} at {job.Company} ({job.URL})")
+            extracted += 1
+            yield job
 
-            # Ignore unwanted companies
-            if company.lower() in ignore_set:
-                continue
-             
-            try:
-                loc = card.find_element(By.CSS_SELECTOR, "span.job-search-card__location").text.strip()
-            except:
-                loc = location or "N/A"
+        print(f"\nExtracted {extracted} jobs ({rejected} filtered out).")
+
+    def _scrape_incremental(self, location):
+        # Extract cards as they load and stop once a run of known postings shows we've caught up
+        extracted = 0
+        seen = 0
+        known_streak = 0
+        last_height = self.driver.execute_script("return document.body.scrollHeight")
+
+        while True:
+            job_cards = self.driver.find_elements(By.CSS_SELECTOR, self.CARD_SELECTOR)
+
+            self.cards_seen += len(job_cards) - seen
+            for card in job_cards[seen:]:
+                if self.should_stop():
+                    print(f"[LinkedIn] Stopping after {seen} cards.")
+                    print(f"\nExtracted {extracted} new jobs.")
+                    return
+                seen += 1
+                try:
+                    link = card.find_element(By.CSS_SELECTOR, "a.base-card__full-link").get_attribute("href")
+                except:
+                    link = None
+
+                if link and canonical_url(link) in self.known_urls:
+                    known_streak += 1
+                    if known_streak >= KNOWN_STREAK_LIMIT:
+                        print(f"[LinkedIn] {known_streak} known postings in a row, stopping after {seen} cards.")
+                        print(f"\nExtracted {extracted} new jobs.")
+                        return
+                    continue
+
+                known_streak = 0
+                job = self._extract_card(card, location, link)
+                if job is not None:
+                    extracted += 1
+                    yield job
+
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(2)  # Wait for new content to load
+
+            new_height = self.driver.execute_script("return document.body.scrollHeight")
+            if new_height == last_height or self.should_stop():
+                break
+            last_height = new_height
+
+        print(f"\nExtracted {extracted} new jobs from {seen} cards.")
+
+    def _extract_card(self, card, location, link=None):
+        # Returns the JobRecord, or None for an incomplete or filtered-out card
+        try:
+            title = card.find_element(By.CSS_SELECTOR, "h3.base-search-card__title").text.strip()
+        except:
+            title = "N/A"
+        try:
+            company = card.find_element(By.CSS_SELECTOR, "h4.base-search-card__subtitle").text.strip()
+        except:
+            company = "N/A"
+            
+        # Skip bad cards early
+        if not company:
+            return None
+
+        # Drop blocked companies/titles before any further extraction
+        if self.job_filter.reject_listing(title, company):
+            return None
+
+        try:
+            salary = card.find_element(
+                By.CSS_SELECTOR, "ul.job-card-container__metadata-wrapper li span"
+            ).text.strip()
+        except:
+            salary = None
+
+        if self.job_filter.reject_salary(salary):
+            return None
+         
+        try:
+            loc = card.find_element(By.CSS_SELECTOR, "span.job-search-card__location").text.strip()
+        except:
+            loc = location or "N/A"
+        if link is None:
             try:
                 link = card.find_element(By.CSS_SELECTOR, "a.base-card__full-link").get_attribute("href")
             except:
                 link = "N/A"
-            try:
-                posted_date = card.find_element(By.CSS_SELECTOR, "time").get_attribute("datetime")
-            except:
-                posted_date = datetime.today().date().isoformat()
-            try:
-                salary = card.find_element(
-                    By.CSS_SELECTOR, "ul.job-card-container__metadata-wrapper li span"
-                ).text.strip()
-            except:
-                salary = None
-                
-                
-            if company.strip().lower() in ignore_set:
-                if company not in printed_ignores:
-                    print(f"Skipping all jobs from {company}")
-                    printed_ignores.add(company)
-                continue
-
-            
-            results.append(
-                {
-                    "JobTitle": title,
-                    "Company": company,
-                    "Location": loc,
-                    "URL": link,
-                    "Status": "New",
-                    "DateFound": datetime.today().date().isoformat(),
-                    "DatePosted": posted_date,
-                    "Salary": salary,
-                }
-            )
-
-        print(f"\nExtracted {len(results)} jobs:")
-        for job in results:
-            print(f"- {job['JobTitle']} at {job['Company']} ({job['URL']})")
+        try:
+            posted_date = card.find_element(By.CSS_SELECTOR, "time").get_attribute("datetime")
+        except:
+            posted_date = datetime.today().date().isoformat()
         
-        return results
+        try:
+            return JobRecord(
+                JobTitle=title,
+                Company=company,
+                Location=loc,
+                URL=link,
+                DatePosted=posted_date,
+                Salary=salary,
+            )
+        except ValueError as e:
+            print(f"[LinkedIn] Skipped card: {e}")
+            return None
     
     def scroll_to_load_all(self):
         last_height = self.driver.execute_script("return document.body.scrollHeight")
         
-        while True:
+        while not self.should_stop():  # scrape what has loaded once time is up or stopped
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             time.sleep(2)  # Wait for new content to load
             
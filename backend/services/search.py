@@ -0,0 +1,105 @@
+# backend/services/search.py
+# Ranked keyword search over one user's jobs for /search_jobs. On MySQL it
+# runs on the FULLTEXT indexes over postings (migration 008) in boolean
+# mode: every term must match as a word prefix, and relevance counts a
+# title hit on top of the title/company/location/skills hit. Elsewhere
+# (SQLite in local runs) the same query is answered with LIKE predicates and
+# a weighted CASE score, which is unindexed but fine at development sizes.
+#
+# A query needs at least one word the index can answer (MIN_TOKEN
+# characters, matching the server's innodb_ft_min_token_size); shorter
+# words only narrow the rows that word matched, never the user's whole list.
+import os
+import re
+from sqlalchemy import case, or_
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import contains_eager
+from backend.db.models import Job, Posting
+
+MAX_TERMS = 8
+MIN_TOKEN = int(os.getenv("FT_MIN_TOKEN_SIZE", "2"))  # innodb_ft_min_token_size: shorter words aren't in the index
+TITLE_WEIGHT = 2.0
+MAX_LIMIT = 200
+
+_TERM_RE = re.compile(r"\w+")
+
+# LIKE fallback weights per column
+_WEIGHTS = (
+    (Posting.JobTitle, 4),
+    (Posting.Skills, 2),
+    (Posting.Company, 1),
+    (Posting.Location, 1),
+)
+
+
+def parse_terms(q):
+    """Lowercased distinct words of the query, in order; operators and punctuation dropped."""
+    terms = []
+    for term in _TERM_RE.findall((q or "").lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def _word_prefix(column, term):
+    # Term at the start of the column or of any later word
+    return or_(column.startswith(term, autoescape=True), column.contains(" " + term, autoescape=True))
+
+
+def _any_column(term):
+    return or_(*(_word_prefix(column, term) for column, _ in _WEIGHTS))
+
+
+def search_jobs(db, user_email, q, status=None, min_score=None, limit=50, offset=0):
+    """
+    The user's jobs matching every term of `q`, best first, as
+    (jobs, has_more). status and min_score narrow the result; an empty
+    query lists the filtered jobs newest first. Raises ValueError if every
+    term is shorter than MIN_TOKEN, which no index can answer.
+    """
+    terms = parse_terms(q)
+    if terms and all(len(t) < MIN_TOKEN for t in terms):
+        raise ValueError(f"Search for at least one word of {MIN_TOKEN} or more characters")
+    query = (
+        db.query(Job)
+        .join(Job.posting)
+        .options(contains_eager(Job.posting))
+        .filter(Job.user_email == user_email)
+    )
+    if status is not None:
+        query = query.filter(Job.Status == status)
+    if min_score is not None:
+        query = query.filter(Job.job_score >= min_score)
+
+    rank = None
+    if db.get_bind().dialect.name == "mysql":
+        indexed = [t for t in terms if len(t) >= MIN_TOKEN]
+        if indexed:  # always, for a non-empty query
+            against = " ".join(f"+{t}*" for t in indexed)
+            text_match = match(
+                Posting.JobTitle, Posting.Company, Posting.Location, Posting.Skills, against=against,
+            ).in_boolean_mode()
+            query = query.filter(text_match)
+            rank = match(Posting.JobTitle, against=against).in_boolean_mode() * TITLE_WEIGHT + text_match
+        # Too short for the index; checked on the rows the indexed words already narrowed
+        for term in terms:
+            if len(term) < MIN_TOKEN:
+                query = query.filter(_any_column(term))
+    else:
+        for term in terms:
+            query = query.filter(_any_column(term))
+        if terms:
+            rank = sum(
+                case((_word_prefix(column, term), weight), else_=0)
+                for term in terms for column, weight in _WEIGHTS
+            )
+
+    limit = max(1, min(limit, MAX_LIMIT))
+    order = [] if rank is None else [rank.desc()]
+    jobs = (
+        query.order_by(*order, Job.DateFound.desc(), Job.job_id.desc())
+        .offset(max(offset, 0))
+        .limit(limit + 1)
+        .all()
+    )
+    return jobs[:limit], len(jobs) > limit
@@ -0,0 +1,222 @@
+# backend/services/source_guard.py
+# Per-source rate limiting, concurrency caps and circuit breaking. Every
+# scrape of a source goes through its SourceGuard: a token bucket whose rate
+# adapts to how the source is behaving (cut on timeouts and empty "caught
+# up" pages, recovered additively on success), a semaphore capping
+# concurrent browsers, and a circuit breaker that fails fast while the
+# source is unhealthy. State is per process.
+import time
+import threading
+from collections import deque
+
+SOURCE_LIMITS = {
+    # requests per minute (starting and ceiling), burst size, concurrent browsers
+    "Hiring Cafe": {"rate_per_minute": 6, "burst": 3, "max_concurrent": 2},
+    "LinkedIn": {"rate_per_minute": 4, "burst": 2, "max_concurrent": 1},
+}
+DEFAULT_LIMITS = {"rate_per_minute": 4, "burst": 2, "max_concurrent": 1}
+
+MIN_RATE_FRACTION = 0.1  # adaptive rate never drops below 10% of the configured rate
+ACQUIRE_TIMEOUT = 10  # seconds to wait for a token or browser slot before giving up
+
+FAILURE_THRESHOLD = 3  # consecutive failures that open the breaker
+COOLDOWN_SECONDS = 120  # how long the breaker stays open before a trial request
+
+LATENCY_WINDOW = 50  # recent completed scrapes kept per source for the p95
+LATENCY_MIN_SAMPLES = 5  # fewer than this and p95() has no opinion
+
+# Outcomes reported back to the guard
+OK = "ok"
+EMPTY = "empty"  # caught up / no cards on the page, a soft throttling signal
+TIMEOUT = "timeout"
+ERROR = "error"
+CANCELLED = "cancelled"  # stopped by us (a hedged attempt that lost), says nothing about the source
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute, burst):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, timeout):
+        """Take a token, waiting up to `timeout` seconds. Returns False if none came."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def refund(self):
+        """Give back a token taken for a request that never ran."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def set_rate(self, rate_per_minute):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate_per_minute / 60.0
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self):
+        """True if a request may go ahead. Half-open lets a single trial through."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def cancel_trial(self):
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()  # (re)open and restart the cooldown
+            self.trial_in_flight = False
+
+
+class SourceGuard:
+    def __init__(self, source, rate_per_minute, burst, max_concurrent):
+        self.source = source
+        self.max_rate = rate_per_minute
+        self.rate = rate_per_minute
+        self.bucket = TokenBucket(rate_per_minute, burst)
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.breaker = CircuitBreaker()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def is_available(self):
+        # Cheap check run_scraper makes before starting a browser; doesn't claim the trial slot
+        return self.breaker.state != CircuitBreaker.OPEN
+
+    def acquire(self, timeout=ACQUIRE_TIMEOUT):
+        """Claim breaker permission, a rate token and a browser slot, or return False."""
+        if not self.breaker.allow():
+            return False
+        if not self.bucket.acquire(timeout):
+            # Not the source's fault; give back the half-open trial if we held it
+            self.breaker.cancel_trial()
+            return False
+        if not self.slots.acquire(timeout=timeout):
+            self.bucket.refund()  # no request went out
+            self.breaker.cancel_trial()
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self, outcome, elapsed=None):
+        with self._lock:
+            self.in_flight -= 1
+            if outcome == OK and elapsed is not None:
+                self.latencies.append(elapsed)
+        self.slots.release()
+
+        if outcome == CANCELLED:
+            self.breaker.cancel_trial()
+        elif outcome == OK:
+            self.breaker.record_success()
+            self._adjust_rate(self.rate + self.max_rate * 0.1)  # additive increase
+        elif outcome == EMPTY:
+            self.breaker.record_success()
+            self._adjust_rate(self.rate * 0.75)
+        else:
+            self.breaker.record_failure()
+            self._adjust_rate(self.rate * 0.5)  # multiplicative decrease
+
+    def p95(self):
+        """95th percentile of recent successful scrape times, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def _adjust_rate(self, rate):
+        rate = min(self.max_rate, max(self.max_rate * MIN_RATE_FRACTION, rate))
+        with self._lock:
+            self.rate = rate
+        self.bucket.set_rate(rate)
+
+    def snapshot(self):
+        p95 = self.p95()
+        return {
+            "source": self.source,
+            "breaker": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "rate_per_minute": round(self.rate, 2),
+            "max_rate_per_minute": self.max_rate,
+            "in_flight": self.in_flight,
+            "max_concurrent": self.max_concurrent,
+            "p95_seconds": None if p95 is None else round(p95, 2),
+        }
+
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+
+def get_guard(source):
+    with _guards_lock:
+        guard = _guards.get(source)
+        if guard is None:
+            guard = SourceGuard(source, **SOURCE_LIMITS.get(source, DEFAULT_LIMITS))
+            _guards[source] = guard
+        return guard
+
+
+def source_health():
+    """Snapshot of every guard created so far, for the metrics endpoint."""
+    with _guards_lock:
+        guards = list(_guards.values())
+    return [guard.snapshot() for guard in guards]
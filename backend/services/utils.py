@@ -1,15 +1,32 @@
 # backend/services/utils.py
 
-import os, re, random
+import os, re, random, threading
 import undetected_chromedriver as uc
+from backend.services import driver_cache
 from dotenv import load_dotenv
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit, urlunsplit
 
 WINDOW_SIZES = [
     (1920, 1080), (1366, 768), (1536, 864), (1440, 900), (1280, 720),
     (1680, 1050), (1600, 900), (2560, 1440), (1920, 1200)
 ]
 
+# Lean mode (default): block heavy and third-party resources, smaller window
+LEAN_BROWSER = os.getenv("LEAN_BROWSER", "1") == "1"
+LEAN_WINDOW_SIZE = (1280, 800)
+
+BLOCKED_URL_PATTERNS = [
+    # images, fonts, media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg",
+    # analytics and ad hosts
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*segment.io*", "*segment.com*", "*mixpanel.com*",
+    "*intercom.io*", "*clarity.ms*", "*ads.linkedin.com*", "*px.ads.linkedin.com*",
+]
+
 USER_AGENTS = [
     # Chrome 120-140 on Windows 10/11
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{ver}.0.0.0 Safari/537.36",
@@ -39,9 +56,25 @@ def build_url(base_url: str, params: dict) -> str:
     """Build a URL with encoded query parameters."""
     return f"{base_url}?{urlencode(params)}"
 
-def create_driver(headless: bool = False):
+def canonical_url(url: str) -> str:
+    """Strip query string and fragment (tracking ids) so the same posting compares equal."""
+    parts = urlsplit(url)
+    if "linkedin.com" not in parts.netloc:
+        return url  # other boards are compared as-is
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+def create_driver(headless: bool = False, lean: bool = LEAN_BROWSER, cached: bool = driver_cache.DRIVER_CACHE):
     options = uc.ChromeOptions()
 
+    if lean:
+        # Text-only scraping: skip image decoding and use a small viewport
+        options.add_argument(f"--window-size={LEAN_WINDOW_SIZE[0]},{LEAN_WINDOW_SIZE[1]}")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+
     if not headless:
         os.environ["DISPLAY"] = os.environ.get("DISPLAY", ":99")
     else:
@@ -55,12 +88,132 @@ def create_driver(headless: bool = False):
     options.add_argument("--use-gl=swiftshader")
     options.add_argument("--enable-unsafe-swiftshader")
 
+    startup = {}
+    if cached:
+        # Reuse the patched binary and a pre-initialised profile instead of rebuilding both
+        try:
+            version = driver_cache.chrome_major()
+            startup = {
+                "version_main": version,
+                "driver_executable_path": driver_cache.patched_driver(version),
+                "user_data_dir": driver_cache.launch_profile(version),
+            }
+        except Exception as e:
+            print(f"Driver cache unavailable, launching uncached: {e}")
+
     driver = uc.Chrome(options=options,
                        headless=headless, 
                        use_subprocess=False, 
                        enable_logging=True,
-                       browser_executable_path="/usr/bin/google-chrome")
+                       browser_executable_path=driver_cache.CHROME_PATH,
+                       **startup)
+    if "user_data_dir" in startup:
+        driver.keep_user_data_dir = False  # the profile copy is ours; let quit() delete it
     
+    if lean:
+        block_resources(driver)
+    register_launch(driver)
+
     print("navigator.webdriver:", driver.execute_script("return navigator.webdriver"))
 
     return driver
+
+def block_resources(driver, patterns=BLOCKED_URL_PATTERNS):
+    """Drop matching requests at the network layer via CDP (applies to the current tab)."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    except Exception as e:
+        print(f"Resource blocking unavailable: {e}")
+
+def _proc_children():
+    # ppid -> [pid] for every live process (Linux /proc)
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # ppid is the 2nd field after the parenthesised command name
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+def process_tree_pids(*pids: int) -> set:
+    """The given processes and all their descendants."""
+    children = _proc_children()
+    tree, stack = set(), [p for p in pids if p]
+    while stack:
+        current = stack.pop()
+        if current in tree:
+            continue
+        tree.add(current)
+        stack.extend(children.get(current, ()))
+    return tree
+
+def process_rss(pid: int) -> int:
+    """Resident memory of one process in bytes, 0 if it is gone."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def process_tree_rss(*pids: int) -> int:
+    """Resident memory in bytes of the given processes and all their descendants."""
+    return sum(process_rss(pid) for pid in process_tree_pids(*pids))
+
+def process_cpu_seconds(pid: int) -> float:
+    """CPU time (user + system, including reaped children) of one process, 0 if it is gone."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return 0.0
+    # utime, stime, cutime, cstime are fields 14-17; the split starts at field 3
+    return sum(int(v) for v in fields[11:15]) / os.sysconf("SC_CLK_TCK")
+
+def process_tree_cpu_seconds(*pids: int) -> float:
+    """CPU seconds used so far by the given processes and all their descendants."""
+    return sum(process_cpu_seconds(pid) for pid in process_tree_pids(*pids))
+
+def process_start_ticks(pid: int):
+    """Start time of a process in clock ticks since boot, None if it is gone. Tells a reused pid apart."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return int(f.read().rsplit(")", 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+# Chrome browser pid -> (start ticks, chromedriver pid) for every driver this process launched.
+# The watchdog reaps entries no tracked scraper owns any more; other processes' browsers
+# (gunicorn siblings, the scheduler) are never in here, whatever their parent pid.
+_launched = {}
+_launched_lock = threading.Lock()
+
+def register_launch(driver):
+    chromedriver_pid, browser_pid = driver_pids(driver)
+    ticks = process_start_ticks(browser_pid) if browser_pid else None
+    if ticks is None:
+        return
+    with _launched_lock:
+        _launched[browser_pid] = (ticks, chromedriver_pid)
+
+def launched_browsers() -> dict:
+    with _launched_lock:
+        return dict(_launched)
+
+def forget_launch(browser_pid):
+    with _launched_lock:
+        _launched.pop(browser_pid, None)
+
+def driver_pids(driver) -> tuple:
+    """(chromedriver pid, Chrome browser pid) for an undetected_chromedriver instance."""
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return (getattr(process, "pid", None), getattr(driver, "browser_pid", None))
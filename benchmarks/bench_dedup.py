@@ -0,0 +1,72 @@
+# benchmarks/bench_dedup.py
+# Lookup cost of the near-duplicate index as a user's job count grows.
+# Run from the repo root: python -m benchmarks.bench_dedup
+import random
+import time
+from dataclasses import replace
+from backend.services.dedup import NearDuplicateIndex
+from backend.services.job_record import JobRecord
+
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Backend Developer",
+    "Frontend Developer", "Data Analyst", "QA Automation Engineer",
+    "Full Stack Developer", "DevOps Engineer", "Machine Learning Engineer",
+]
+LEVELS = ["", "I", "II", "III", "Lead", "Staff", "Principal"]
+LOCATIONS = ["Remote", "New York, NY", "Austin, TX", "Seattle, WA", "Denver, CO"]
+SUFFIXES = ["Inc.", "LLC", "Labs", "Systems", "Health", "Group", "Technologies"]
+SIZES = [100, 1000, 10000, 50000]
+LOOKUPS = 500
+
+
+def company_name(rng):
+    # Random pronounceable names, so companies don't share most shingles
+    return "".join(rng.choice("bcdfgklmnprstvz") + rng.choice("aeiou") for _ in range(4)).title()
+
+
+def synthetic_job(rng, i):
+    return JobRecord(
+        JobTitle=f"{rng.choice(TITLES)} {rng.choice(LEVELS)}".strip(),
+        Company=f"{company_name(rng)} {rng.choice(SUFFIXES)}",
+        Location=rng.choice(LOCATIONS),
+        URL=f"https://example.com/viewjob/{i}",
+    )
+
+
+def run():
+    rng = random.Random(42)
+    print(f"{'jobs':>8} {'build s':>9} {'lookup us':>10} {'recall %':>9} {'false +%':>9}")
+    for size in SIZES:
+        jobs = [synthetic_job(rng, i) for i in range(size)]
+
+        start = time.perf_counter()
+        index = NearDuplicateIndex()
+        for job in jobs:
+            index.add(job.URL, job)
+        build = time.perf_counter() - start
+
+        # Half the probes are the same posting re-listed by another source,
+        # half are unrelated new postings
+        relisted = []
+        for _ in range(LOOKUPS // 2):
+            job = rng.choice(jobs)
+            relisted.append(replace(
+                job,
+                JobTitle=job.JobTitle + " - Remote",
+                URL=job.URL.replace("example.com", "other.example"),
+            ))
+        fresh = [synthetic_job(rng, size + i) for i in range(LOOKUPS // 2)]
+
+        start = time.perf_counter()
+        hits = sum(1 for job in relisted if index.find_duplicate(job))
+        false_hits = sum(1 for job in fresh if index.find_duplicate(job))
+        lookup = (time.perf_counter() - start) / LOOKUPS
+
+        print(
+            f"{size:>8} {build:>9.2f} {lookup * 1e6:>10.1f} "
+            f"{hits / len(relisted) * 100:>9.1f} {false_hits / len(fresh) * 100:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,138 @@
+# benchmarks/bench_driver.py
+# Page-load time and Chrome process-tree RSS with and without lean mode
+# (resource blocking + small window), headful vs headless, and driver
+# startup time cold, uncached and warm from the driver cache. Needs Chrome
+# and a display (Xvfb in the container). Run from the repo root:
+#   python -m benchmarks.bench_driver [url ...]
+#   python -m benchmarks.bench_driver --startup
+#   python -m benchmarks.bench_driver --tabs 4
+#   python -m benchmarks.bench_driver --modes
+import sys
+import time
+import statistics
+import threading
+from backend.services import driver_cache
+from backend.services.browser_pool import BrowserPool
+from backend.services.utils import create_driver, process_tree_rss, process_tree_cpu_seconds, driver_pids
+
+DEFAULT_URLS = [
+    "https://hiring.cafe/",
+    "https://www.linkedin.com/jobs/search/?keywords=software%20engineer",
+]
+LOADS_PER_URL = 3
+STARTUP_RUNS = 5
+
+
+def measure(lean, urls, headless=False):
+    start = time.perf_counter()
+    driver = create_driver(headless=headless, lean=lean)
+    startup = time.perf_counter() - start
+
+    load_times, peak_rss, cpu = [], 0, 0.0
+    try:
+        for url in urls:
+            for _ in range(LOADS_PER_URL):
+                driver.delete_all_cookies()
+                start = time.perf_counter()
+                driver.get(url)
+                load_times.append(time.perf_counter() - start)
+                peak_rss = max(peak_rss, process_tree_rss(*driver_pids(driver)))
+        cpu = process_tree_cpu_seconds(*driver_pids(driver))
+    finally:
+        driver.quit()
+    return startup, load_times, peak_rss, cpu
+
+
+def run(urls):
+    print(f"{'mode':>6} {'startup s':>10} {'load p50 s':>11} {'load max s':>11} {'peak RSS MB':>12}")
+    for lean in (False, True):
+        startup, loads, rss, _ = measure(lean, urls)
+        print(
+            f"{'lean' if lean else 'full':>6} {startup:>10.2f} {statistics.median(loads):>11.2f} "
+            f"{max(loads):>11.2f} {rss / 1e6:>12.1f}"
+        )
+
+
+def run_modes(urls):
+    # Lean in both, as scrapers run; CPU is the whole tree's, startup included
+    print(f"{'mode':>9} {'startup s':>10} {'load p50 s':>11} {'peak RSS MB':>12} {'CPU s':>7}")
+    for headless in (False, True):
+        startup, loads, rss, cpu = measure(True, urls, headless=headless)
+        print(
+            f"{'headless' if headless else 'headful':>9} {startup:>10.2f} {statistics.median(loads):>11.2f} "
+            f"{rss / 1e6:>12.1f} {cpu:>7.2f}"
+        )
+
+
+def startup_time(cached):
+    start = time.perf_counter()
+    driver = create_driver(cached=cached)
+    elapsed = time.perf_counter() - start
+    driver.quit()
+    return elapsed
+
+
+def run_startup(runs=STARTUP_RUNS):
+    # cold: empty cache, so the launch also patches the driver and builds the template
+    driver_cache.clear()
+    cold = startup_time(cached=True)
+    uncached = [startup_time(cached=False) for _ in range(runs)]
+    warm = [startup_time(cached=True) for _ in range(runs)]
+
+    print(f"{'startup':>9} {'runs':>5} {'p50 s':>7} {'max s':>7}")
+    print(f"{'cold':>9} {1:>5} {cold:>7.2f} {cold:>7.2f}")
+    for label, samples in (("uncached", uncached), ("warm", warm)):
+        print(f"{label:>9} {runs:>5} {statistics.median(samples):>7.2f} {max(samples):>7.2f}")
+
+
+def concurrent_loads(drivers, urls):
+    # One thread per driver, as run_scraper's workers; samples the combined RSS while they load
+    pids = {pid for d in drivers for pid in driver_pids(d) if pid}
+    peak_rss = 0
+
+    def load(driver):
+        for url in urls:
+            driver.delete_all_cookies()
+            driver.get(url)
+
+    threads = [threading.Thread(target=load, args=(d,)) for d in drivers]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    while any(t.is_alive() for t in threads):
+        peak_rss = max(peak_rss, process_tree_rss(*pids))
+        time.sleep(0.2)
+    return time.perf_counter() - start, peak_rss
+
+
+def run_tabs(n, urls=DEFAULT_URLS):
+    print(f"{n} concurrent scrapers, {len(urls)} loads each")
+    print(f"{'layout':>18} {'wall s':>7} {'peak RSS MB':>12}")
+
+    browsers = [create_driver() for _ in range(n)]
+    try:
+        wall, rss = concurrent_loads(browsers, urls)
+    finally:
+        for d in browsers:
+            d.quit()
+    print(f"{f'{n} browsers':>18} {wall:>7.2f} {rss / 1e6:>12.1f}")
+
+    pool = BrowserPool(tabs_per_browser=n)
+    tabs = [pool.open_tab() for _ in range(n)]
+    try:
+        wall, rss = concurrent_loads(tabs, urls)
+    finally:
+        for tab in tabs:
+            pool.close_tab(tab)
+    print(f"{f'{n} tabs, 1 browser':>18} {wall:>7.2f} {rss / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--startup"]:
+        run_startup()
+    elif sys.argv[1:2] == ["--modes"]:
+        run_modes(sys.argv[2:] or DEFAULT_URLS)
+    elif sys.argv[1:2] == ["--tabs"]:
+        run_tabs(int(sys.argv[2]))
+    else:
+        run(sys.argv[1:] or DEFAULT_URLS)
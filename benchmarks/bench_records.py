@@ -0,0 +1,83 @@
+# benchmarks/bench_records.py
+# Memory held by a scrape's worth of jobs: the loose dicts scrapers used to
+# build against slotted JobRecords with interned repeated strings. Every
+# string is a fresh object, as Selenium's element.text returns, so the
+# interning shows up the way it does in a real scrape.
+#
+# Run from the repo root:  python -m benchmarks.bench_records [--jobs 10000]
+import sys
+import random
+import argparse
+import tracemalloc
+from datetime import date
+from backend.services.job_record import JobRecord
+
+LOCATIONS = ["Remote", "New York, NY", "Austin, TX", "Seattle, WA", "Denver, CO", "Chicago, IL"]
+TITLES = ["Software Engineer", "Backend Developer", "Data Analyst", "DevOps Engineer", "QA Engineer"]
+SKILLS = ["python", "sql", "aws", "docker", "react", "java", "kubernetes", "flask", "go", "terraform"]
+
+
+def fresh(text):
+    # A new str object with the same value, like each card's .text
+    return text.encode("utf-8").decode("utf-8")
+
+
+def card_fields(rng, i, companies):
+    return {
+        "JobTitle": fresh(f"{rng.choice(TITLES)} {i % 50}"),
+        "Company": fresh(rng.choice(companies)),
+        "Location": fresh(rng.choice(LOCATIONS)),
+        "URL": fresh(f"https://hiring.cafe/viewjob/{rng.getrandbits(64):016x}"),
+        "Salary": fresh(f"${rng.randint(70, 140)}k-${rng.randint(150, 240)}k/yr"),
+        "Skills": fresh(", ".join(rng.sample(SKILLS, 4))),
+    }
+
+
+def build_dicts(cards):
+    # The pre-JobRecord shape: per-job dict, status and date strings built per job
+    return [
+        {**card, "Status": fresh("New"), "DateFound": date.today().isoformat()}
+        for card in cards
+    ]
+
+
+def build_records(cards):
+    return [JobRecord(**card) for card in cards]
+
+
+def retained(build, cards):
+    """Bytes the built batch holds, strings included. Cards are generated while
+    tracing and dropped as they are consumed, as in a scrape."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    jobs = build(cards)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del jobs
+    return after - before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory per batch: job dicts vs JobRecords.")
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--companies", type=int, default=800, help="distinct companies in the scrape")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    companies = [f"Company {i}" for i in range(args.companies)]
+
+    print(f"{args.jobs} jobs, {args.companies} companies, {len(LOCATIONS)} locations\n")
+    print(f"{'shape':<12} {'MB':>8} {'bytes/job':>10}")
+    results = {}
+    for name, build in (("dict", build_dicts), ("JobRecord", build_records)):
+        # Same cards for both shapes, generated lazily so only what the batch keeps is counted
+        rng = random.Random(args.seed)
+        cards = (card_fields(rng, i, companies) for i in range(args.jobs))
+        size = retained(build, cards)
+        results[name] = size
+        print(f"{name:<12} {size / 1e6:>8.2f} {size / args.jobs:>10.0f}")
+    print(f"\nJobRecord holds {(1 - results['JobRecord'] / results['dict']) * 100:.0f}% less than dicts")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+# benchmarks/bench_scoring.py
+# Micro-benchmarks for the two CPU hot spots in scoring.py: resume_parse
+# (pdfminer + section splitting) over generated PDF resumes of increasing
+# length, and calculate_job_score over synthetic job corpora of 10 to
+# 10,000 postings. Reports per-call latency, throughput and peak
+# allocations, and compares against a stored baseline.
+#
+# Run from the repo root:
+#   python -m benchmarks.bench_scoring                   # compare with baseline
+#   python -m benchmarks.bench_scoring --save-baseline   # record this machine's numbers
+#   python -m benchmarks.bench_scoring --quick           # smaller corpora
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from backend.services.job_record import JobRecord
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "scoring.json")
+DEFAULT_THRESHOLD = 0.20  # fail if a case gets >20% slower than its baseline
+
+RESUME_PAGES = [1, 2, 5]
+CORPUS_SIZES = [10, 100, 1000, 10000]
+QUICK_CORPUS_SIZES = [10, 100, 1000]
+ALLOC_SAMPLE = 100  # jobs traced for allocations per corpus
+
+WORDS = (
+    "python java javascript typescript react flask django sql postgres mysql docker "
+    "kubernetes aws azure gcp terraform linux git ci cd testing pytest selenium api rest "
+    "graphql microservices distributed systems data pipelines spark kafka airflow pandas "
+    "numpy machine learning analytics dashboards agile scrum design review mentoring "
+    "performance optimization caching security authentication frontend backend fullstack"
+).split()
+TITLES = [
+    "Software Engineer", "Backend Developer", "Frontend Developer", "Data Analyst",
+    "QA Automation Engineer", "DevOps Engineer", "Full Stack Developer",
+]
+
+
+def sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def resume_lines(rng, pages):
+    lines = ["Jane Doe - jane@example.com", "Professional Summary:", sentence(rng, 14)]
+    lines += ["Technical Skills:"]
+    lines += [f"{cat}: {', '.join(rng.sample(WORDS, 6))}" for cat in ("Languages", "Frameworks", "Tools")]
+    for section in ("Experience:", "Projects:", "Education:"):
+        lines.append(section)
+        # ~55 lines fit on a page; spread the rest across sections
+        lines += [sentence(rng, 12) for _ in range(max(3, pages * 50 // 3))]
+    return lines
+
+
+def write_pdf(path, lines):
+    """Minimal multi-page PDF with Helvetica text, enough for pdfminer to parse."""
+    per_page = 55
+    pages = [lines[i:i + per_page] for i in range(0, len(lines), per_page)]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        text = "\n".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") '"
+            for line in page
+        )
+        stream = f"BT /F1 10 Tf 12 TL 50 780 Td\n{text}\nET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = ["%PDF-1.4\n"], []
+    size = len(out[0])
+    for i, obj in enumerate(objects, 1):
+        offsets.append(size)
+        chunk = f"{i} 0 obj\n{obj}\nendobj\n"
+        out.append(chunk)
+        size += len(chunk.encode("latin-1"))
+    xref = [f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"]
+    xref += [f"{off:010d} 00000 n \n" for off in offsets]
+    out += xref
+    out.append(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{size}\n%%EOF\n")
+    with open(path, "wb") as f:
+        f.write("".join(out).encode("latin-1"))
+
+
+def synthetic_jobs(rng, n):
+    return [
+        JobRecord(
+            JobTitle=rng.choice(TITLES),
+            Company=f"Company {i}",
+            Location="Remote",
+            URL=f"https://example.com/viewjob/{i}",
+            Skills=sentence(rng, 12),
+            Description=sentence(rng, rng.randint(80, 400)),
+        )
+        for i in range(n)
+    ]
+
+
+def timed(func, calls):
+    """Seconds per call over `calls` invocations."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+
+def peak_allocated(func):
+    """Peak bytes allocated during one call. Traced separately since tracemalloc skews timings."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run(quick=False):
+    from backend.services.scoring import resume_parse, calculate_job_score
+
+    rng = random.Random(7)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parsed = None
+        for pages in RESUME_PAGES:
+            path = os.path.join(tmp, f"resume_{pages}.pdf")
+            write_pdf(path, resume_lines(rng, pages))
+            calls = 3 if quick else 10
+            parse = lambda: resume_parse(path, "resume.pdf")
+            per_call, peak = timed(parse, calls), peak_allocated(parse)
+            results[f"resume_parse/{pages}p"] = {"per_call_ms": per_call * 1e3, "peak_kb": peak / 1024}
+            if pages == 2:
+                parsed = resume_parse(path, "resume.pdf")
+
+    for size in QUICK_CORPUS_SIZES if quick else CORPUS_SIZES:
+        jobs = synthetic_jobs(rng, size)
+        per_corpus = timed(lambda: [calculate_job_score(parsed, job) for job in jobs], 1)
+        # Allocation peak per corpus is bounded by the largest single job, so sample
+        peak = peak_allocated(lambda: [calculate_job_score(parsed, job) for job in jobs[:ALLOC_SAMPLE]])
+        results[f"calculate_job_score/{size}"] = {
+            "per_call_ms": per_corpus / size * 1e3,
+            "jobs_per_s": size / per_corpus,
+            "peak_kb": peak / 1024,
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    # Cases without a baseline (none saved yet, or new since) show "-" and no delta
+    print(f"\n{'case':<28} {'ms/call':>9} {'base':>9} {'delta':>9} {'peak KB':>9} {'jobs/s':>9}")
+    regressions = []
+    for case, r in results.items():
+        base = baseline.get(case, {}).get("per_call_ms")
+        delta = (r["per_call_ms"] / base - 1) if base else None
+        if delta is not None and delta > threshold:
+            regressions.append(case)
+        jobs_per_s = r.get("jobs_per_s")
+        print(
+            f"{case:<28} {r['per_call_ms']:>9.3f} {(f'{base:.3f}' if base else '-'):>9} "
+            f"{(f'{delta * 100:+.1f}%' if delta is not None else 'no base'):>9} "
+            f"{r['peak_kb']:>9.0f} {(f'{jobs_per_s:.0f}' if jobs_per_s is not None else '-'):>9}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark resume parsing and job scoring.")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against / save to")
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("\nNo baseline yet; run with --save-baseline on the reference machine.")
+    elif regressions:
+        print(f"\nRegressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
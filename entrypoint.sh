@@ -3,15 +3,27 @@
 set -e
 export DISPLAY=:99
 
-# Start Xvfb - Sets display :99, and sets screen size to 2560x1440 with 24-bit color depth
-echo "Starting Xvfb..."
-Xvfb :99 -screen 0 2560x1440x24 &
-sleep 1
+# Start Xvfb - Sets display :99; the framebuffer only needs to fit the lean 1280x800 window
+# Not needed when every driver runs headless (backend/services/driver_mode.py)
+if [ "${DRIVER_MODE:-headful}" != "headless" ]; then
+  XVFB_SCREEN="${XVFB_SCREEN:-1366x768x24}"
+  echo "Starting Xvfb ($XVFB_SCREEN)..."
+  Xvfb :99 -screen 0 "$XVFB_SCREEN" &
+  sleep 1
+fi
+
+# Any arguments replace the web server, e.g. the scheduler service in docker-compose.yml
+if [ "$#" -gt 0 ]; then
+  echo "Starting $*..."
+  exec "$@"
+fi
 
 # Run gunicorn - Set binding to all interfaces on port 5000 with a timeout of 60 seconds
+# app.py sizes the in-request scrape deadline from the same GUNICORN_TIMEOUT
+export GUNICORN_TIMEOUT="${GUNICORN_TIMEOUT:-60}"
 echo "Starting Gunicorn..."
 exec gunicorn -b 0.0.0.0:5000 \
-  --timeout 60 \
+  --timeout "$GUNICORN_TIMEOUT" \
   --keyfile /certs/server.key \
   --certfile /certs/server.crt \
   app:app
@@ -6,7 +6,9 @@ class JobApp {
     constructor() {
         this.allJobs = [];
         this.sortState = { key: null, direction: 'asc' };
-        this.filterState = { title: '', company: '', location: '', status: '', salary: '' };
+        this.filterState = { search: '', title: '', company: '', location: '', status: '', salary: '' };
+        this.searchResults = null; // ranked /search_jobs results while a keyword search is active
+        this.maxSearchResults = 1000; // pages fetched per search before the rest is reported as truncated
         this.choices = null;
         this.debounceTimer = null;
         this.loggedIn = false;
@@ -132,13 +134,18 @@ class JobApp {
             input.addEventListener('input', () => {
                 const key = input.id.replace('filter-', '');
                 this.filterState[key] = input.value.trim();
-                this.debounceRender();
+                if (key === 'search' || (key === 'status' && this.filterState.search)) {
+                    this.debounceSearch();
+                } else {
+                    this.debounceRender();
+                }
             });
         });
 
         // Clear filters
         document.querySelector('.clear-filters').addEventListener('click', () => {
-            this.filterState = { title: '', company: '', location: '', status: '' };
+            this.filterState = { search: '', title: '', company: '', location: '', status: '' };
+            this.searchResults = null;
             document.querySelectorAll('.filter-controls input, .filter-controls select').forEach(i => i.value = '');
             this.render();
         });
@@ -337,7 +344,12 @@ class JobApp {
             });
             if (!res.ok) throw new Error('Submission failed');
 
-            const data = await res.json();
+            let data = await res.json();
+            if (data.status === 'queued') {
+                // Scrape runs on a worker; wait for it, then load the results
+                await this.waitForScrape(data.scrapeSessionId);
+                data = await (await fetch('/refresh_jobs', { credentials: 'include' })).json();
+            }
             this.allJobs = data.jobs || [];
 
             // Reset form
@@ -357,6 +369,17 @@ class JobApp {
         }
     }
 
+    async waitForScrape(sessionId, intervalMs = 3000) {
+        while (true) {
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+            const res = await fetch(`/scrape_status?id=${sessionId}`, { credentials: 'include' });
+            if (!res.ok) throw new Error('Scrape status unavailable');
+            const status = await res.json();
+            if (status.status === 'Complete') return status;
+            if (status.status === 'Failed') throw new Error(status.log || 'Scrape failed');
+        }
+    }
+
     async refreshJobs(silent = false) {
         this.setUIBusy(true);
         try {
@@ -365,7 +388,8 @@ class JobApp {
             });
             const data = await res.json();
             this.allJobs = data.jobs || [];
-            this.render();
+            if (this.filterState.search) await this.searchJobs();
+            else this.render();
             if (!silent) this.showToast('Job listings updated.', 'success');
         } catch (err) {
             if (!silent) this.showToast('Failed to load jobs.', 'danger');
@@ -380,6 +404,48 @@ class JobApp {
         this.debounceTimer = setTimeout(() => this.render(), 300);
     }
 
+    debounceSearch() {
+        clearTimeout(this.debounceTimer);
+        this.debounceTimer = setTimeout(() => this.searchJobs(), 300);
+    }
+
+    async searchJobs() {
+        // Keyword search runs server-side on the full-text index; the other filters still apply locally
+        const q = this.filterState.search;
+        if (!q) {
+            this.searchResults = null;
+            this.render();
+            return;
+        }
+        // The server caps a page at 200; fetch pages until the results run out or the cap is hit
+        const params = new URLSearchParams({ q, limit: 200 });
+        if (this.filterState.status) params.set('status', this.filterState.status);
+        const results = [];
+        let hasMore = true;
+        try {
+            while (hasMore && results.length < this.maxSearchResults) {
+                params.set('offset', results.length);
+                const res = await fetch(`/search_jobs?${params}`, { credentials: 'include' });
+                const data = await res.json();
+                if (q !== this.filterState.search) return; // a newer search is in flight
+                if (!res.ok) {
+                    this.showToast(data.message || 'Search failed.', 'danger');
+                    return;
+                }
+                results.push(...(data.jobs || []));
+                hasMore = data.hasMore;
+            }
+            this.searchResults = results;
+            this.render();
+            if (hasMore) {
+                this.showToast(`Showing the top ${results.length} matches; refine the keywords to see the rest.`, 'warning');
+            }
+        } catch (err) {
+            this.showToast('Search failed.', 'danger');
+            console.error(err);
+        }
+    }
+
     handleSort(th) {
         const label = th.textContent.trim();
         const key = this.keyMap[label];
@@ -429,7 +495,8 @@ class JobApp {
     }
 
     getFilteredAndSortedJobs() {
-        let jobs = [...this.allJobs];
+        const searching = this.searchResults !== null;
+        let jobs = [...(searching ? this.searchResults : this.allJobs)];
 
         const salaryFilter = this.filterState.salary
             ? parseInt(this.filterState.salary, 10)
@@ -452,7 +519,10 @@ class JobApp {
 
             // Salary filter
             if (salaryFilter) {
-                const parsed = this.parseSalary(job.Salary);
+                // Prefer the yearly range the server parsed at insert
+                const parsed = job.SalaryMax != null
+                    ? { min: job.SalaryMin, max: job.SalaryMax }
+                    : this.parseSalary(job.Salary);
                 if (!parsed) return false;
 
                 // allow match if salary range reaches user's minimum
@@ -462,8 +532,8 @@ class JobApp {
             return true;
         });
 
-        // Prioritize "New"
-        jobs.sort((a, b) => {
+        // Prioritize "New" (search results keep their relevance order)
+        if (!searching) jobs.sort((a, b) => {
             if (a.Status === 'New' && b.Status !== 'New') return -1;
             if (a.Status !== 'New' && b.Status === 'New') return 1;
             return 0;
@@ -481,6 +551,13 @@ class JobApp {
                     const bVal = order[b[key]] ?? 99;
                     return asc ? aVal - bVal : bVal - aVal;
                 });
+            } else if (key === 'Salary') {
+                // Numeric sort on the parsed yearly max; unparsed salaries go last
+                jobs.sort((a, b) => {
+                    if (a.SalaryMax == null) return b.SalaryMax == null ? 0 : 1;
+                    if (b.SalaryMax == null) return -1;
+                    return asc ? a.SalaryMax - b.SalaryMax : b.SalaryMax - a.SalaryMax;
+                });
             } else {
                 jobs.sort((a, b) => {
                     const aVal = (a[key] ?? '').toString();
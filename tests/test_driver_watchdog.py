@@ -0,0 +1,39 @@
+from selenium.common.exceptions import WebDriverException
+from backend.services import driver_watchdog, utils
+
+
+class PlainDriver:
+    """A one-browser-per-scraper driver; like Selenium's WebDriver, .browser raises off BiDi."""
+
+    @property
+    def browser(self):
+        raise WebDriverException("BiDi is not enabled")
+
+    def execute_script(self, script):
+        return 1
+
+
+class Scraper:
+    def __init__(self, driver):
+        self.driver = driver
+        self.needs_new_driver = False
+
+
+def test_sweep_kills_plain_driver_over_budget(monkeypatch):
+    monkeypatch.setattr(utils, "driver_pids", lambda driver: (101,))
+    monkeypatch.setattr(utils, "process_tree_pids", lambda *pids: {101, 102})
+    monkeypatch.setattr(utils, "process_rss", lambda pid: (driver_watchdog.MAX_DRIVER_RSS_MB + 1) * 1e6)
+    monkeypatch.setattr(utils, "launched_browsers", lambda: {})
+
+    watchdog = driver_watchdog.DriverWatchdog()
+    killed = []
+    monkeypatch.setattr(watchdog, "_kill", killed.append)
+    watchdog._thread = object()  # no background sweeps
+    scraper = Scraper(PlainDriver())
+    watchdog.register(scraper)
+
+    watchdog.sweep()
+
+    assert killed == [{101, 102}]
+    assert watchdog.killed == 1
+    assert scraper.needs_new_driver